@@ -0,0 +1,186 @@
+# ===========================================================================
+#
+# file     : gf_aht2x.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the aht2x humidity and temperature sensor class.
+#
+# Based on the AHT2x driver by Jonathan Fromentin.
+#
+# ===========================================================================
+
+from micropython import const
+import machine
+from godafoss.gf_time import *
+from godafoss.gf_temperature import *
+from godafoss.gf_i2c_device import *
+
+
+# ===========================================================================
+
+class aht2x( i2c_device ):
+    """
+    aht20 / aht21 humidity and temperature sensor
+
+    :param i2c: (machine.I2C, machine.SoftI2C)
+        i2c bus that connects to the chip
+
+    :param address: (int)
+        7-bit i2c slave address of the chip (default: 0x38)
+
+    :param crc: (bool)
+        check the crc of the measurement data (default: False)
+
+    A measurement returns both the relative humidity and the
+    temperature.
+    The humidity() and temperature() methods each do a measurement,
+    the measure() method returns both values from one measurement.
+    A measurement takes ~ 80 ms.
+
+    When the crc check is enabled and the crc of a measurement
+    is wrong, the measurement is retried.
+    """
+
+    # =======================================================================
+
+    class commands:
+        """chip commands"""
+
+        initialize                    = const( 0xBE )
+        trigger_measurement           = const( 0xAC )
+        soft_reset                    = const( 0xBA )
+
+    # =======================================================================
+
+    class status:
+        """status byte bits"""
+
+        busy                          = const( 0x80 )
+        calibrated                    = const( 0x08 )
+
+    # =======================================================================
+
+    def __init__(
+        self,
+        i2c: machine.I2C,
+        address: int = 0x38,
+        crc: bool = False
+    ) -> None:
+        i2c_device.__init__( self, i2c, address, buffer_size = 7 )
+        self._crc = crc
+        self._data = bytearray( 2 )
+
+        # power-up time
+        sleep_us( 40_000 )
+        while not ( self.read_status() & self.status.calibrated ):
+            self._write_command( self.commands.initialize, 0x08 )
+            sleep_us( 10_000 )
+
+    # =======================================================================
+
+    def _write_command(
+        self,
+        command: int,
+        data: int
+    ) -> None:
+        self._data[ 0 ] = data
+        self._data[ 1 ] = 0x00
+        self.write_prefixed( command, self._data )
+
+    # =======================================================================
+
+    def read_status( self ) -> int:
+        """
+        the status byte of the chip
+        """
+
+        return self.read_bytes( 1 )[ 0 ]
+
+    # =======================================================================
+
+    def reset( self ) -> None:
+        """
+        soft reset of the chip
+        """
+
+        self.write_byte( self.commands.soft_reset )
+        sleep_us( 20_000 )
+
+    # =======================================================================
+
+    def measure( self ):
+        """
+        measure the humidity and temperature
+
+        This method returns a (relative humidity in %, temperature) tuple.
+        """
+
+        while True:
+            self._write_command( self.commands.trigger_measurement, 0x33 )
+            sleep_us( 80_000 )
+            while self.read_status() & self.status.busy:
+                sleep_us( 10_000 )
+            d = self.read_bytes( 7 if self._crc else 6 )
+            if ( not self._crc ) or ( _crc8( d, 6 ) == d[ 6 ] ):
+                break
+
+        humidity = ( d[ 1 ] << 12 ) | ( d[ 2 ] << 4 ) | ( d[ 3 ] >> 4 )
+        raw = ( ( d[ 3 ] & 0x0F ) << 16 ) | ( d[ 4 ] << 8 ) | d[ 5 ]
+        return (
+            humidity * 100.0 / 0x10_0000,
+            temperature(
+                raw * 200.0 / 0x10_0000 - 50.0,
+                temperature.scale.celcius
+            )
+        )
+
+    # =======================================================================
+
+    def humidity( self ) -> float:
+        """
+        measure the relative humidity (in %)
+        """
+
+        return self.measure()[ 0 ]
+
+    # =======================================================================
+
+    def temperature( self ) -> temperature:
+        """
+        measure the temperature
+        """
+
+        return self.measure()[ 1 ]
+
+    # =======================================================================
+
+    def demo( self ):
+        print( "AHT2x demo" )
+        while True:
+            humidity, temp = self.measure()
+            print( "humidity %5.1f %%;  temp %s" % ( humidity, temp ) )
+            sleep_us( 1_000_000 )
+
+
+# ===========================================================================
+
+def _crc8( data, n: int ) -> int:
+    """
+    crc8 (polynomial 0x31, initial value 0xFF) of the first n bytes
+    """
+
+    crc = 0xFF
+    for i in range( n ):
+        crc ^= data[ i ]
+        for _ in range( 8 ):
+            crc = ( ( crc << 1 ) ^ 0x31 ) if crc & 0x80 else ( crc << 1 )
+            crc &= 0xFF
+    return crc
+
+
+# ===========================================================================
@@ -0,0 +1,143 @@
+# ===========================================================================
+#
+# file     : gf_arc.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the arc class
+#
+# ===========================================================================
+
+import math
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_shape import *
+from godafoss.gf_circle import _circle_half_widths, _row_runs
+
+             
+# ===========================================================================
+  
+class arc( shape ):   
+    """
+    arc (part of a circle outline) shape
+    
+    :param radius: (int)
+        the radius of the circle   
+        
+    :param start: (int, float)
+        the start angle of the arc, in degrees
+        
+    :param end: (int, float)
+        the end angle of the arc, in degrees
+    
+    Angles are measured clockwise (on the screen: y is down) 
+    from the positive x axis (3 o'clock).
+    The arc runs clockwise from the start angle to the end angle.
+    When the end angle is 360 degrees (or more) beyond the start angle
+    the arc is a full circle.
+
+    Without any offset, an arc has the centre of its circle at the origin 
+    (xy(0,0), the top-left pixel of the sheet).
+    
+    The pixels of an arc are the pixels of the 
+    :class:`~godafoss.circle` outline that are within the angles.
+    Adjacent pixels on the same row are written as one span.
+    
+    $macro_insert shape
+    """    
+
+    def __init__( 
+        self, 
+        radius: int, 
+        start: int | float,
+        end: int | float
+    ):
+        self._radius = radius
+        self._start = start
+        self._end = end
+        shape.__init__( self )
+    
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        # the bounds of the full circle
+        r = self._radius
+        return offset.x - r, offset.y - r, offset.x + r, offset.y + r
+    
+    def write( 
+        self, 
+        sheet: "sheet",
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
+    ):
+        """
+        write the arc to the sheet
+       
+        $macro_insert shape_write 
+        """
+    
+        # don't draw anything when the size would be 0 
+        if ( self._radius < 1 ) or ( self._end <= self._start ):
+            return
+            
+        # a pixel is within the arc when it is clockwise from the 
+        # start direction and counter-clockwise from the end direction
+        # (for an arc of at most 180 degrees, otherwise when either
+        # is the case), which is checked with cross products 
+        # (with a small margin, so pixels exactly on the start or
+        # end direction are within the arc despite rounding)
+        sweep = self._end - self._start
+        full = sweep >= 360
+        wide = sweep > 180
+        sx = math.cos( math.radians( self._start ) )
+        sy = math.sin( math.radians( self._start ) )
+        ex = math.cos( math.radians( self._end ) )
+        ey = math.sin( math.radians( self._end ) )
+        
+        def inside( x, y ):
+            if full:
+                return True
+            after_start = sx * y - sy * x >= -1e-6
+            before_end = ex * y - ey * x <= 1e-6
+            if wide:
+                return after_start or before_end
+            return after_start and before_end
+            
+        x0, y0, x1, y1 = sheet.clip_rectangle()
+        half = _circle_half_widths( self._radius )
+        
+        for dy in range( len( half ) ):
+            first, last = _row_runs( half, dy, False )
+            for y in ( ( dy, -dy ) if dy else ( 0, ) ):
+                if not ( y0 <= offset.y + y <= y1 ):
+                    continue
+                    
+                # the run left of the centre, then the run right of it,
+                # (one run when it crosses the centre)
+                if first == 0:
+                    runs = ( ( - last, last ), )
+                else:
+                    runs = ( ( - last, - first ), ( first, last ) )
+                    
+                for a, b in runs:
+                    span = None
+                    for x in range( a, b + 2 ):
+                        if ( x <= b ) and inside( x, y ):
+                            if span is None:
+                                span = x
+                        elif span is not None:
+                            sheet.write_rect( 
+                                xy( offset.x + span, offset.y + y ), 
+                                xy( x - span, 1 ), 
+                                ink 
+                            )
+                            span = None
+            
+              
+# ===========================================================================
@@ -0,0 +1,127 @@
+# ===========================================================================
+#
+# file     : gf_blend.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# ===========================================================================
+#
+# This file contains a helper class for blending pixels
+# in the raw (encoded) values of a framebuffer.
+#
+# ===========================================================================
+
+from godafoss.gf_color import *
+
+
+# ===========================================================================
+
+class _blend_cache:
+    """
+    blend tables for raw pixel values
+
+    :param encode: (function)
+        color => raw pixel value
+
+    :param decode: (function)
+        raw pixel value => color
+
+    :param limit: (int)
+        maximum number of tables per ink, and of inks (default: 32)
+
+    A blend table has the 16 raw pixel values for blending 
+    an ink with an old pixel value, from level 0 (the old value) 
+    to level 15 (the ink).
+    The tables are made on first use and cached, per ink 
+    (its raw value) and per old value, so blending is a framebuffer
+    read, a table lookup, and a framebuffer write.
+    For anti-aliased shapes on a single-color background
+    only a few tables are needed.
+    When a limit is reached, the cached tables are discarded.
+
+    The ink of the last lookup is remembered (by identity),
+    so the encoding of the ink is done only once
+    for a sequence of writes with the same ink.
+    """
+
+    # =======================================================================
+
+    def __init__(
+        self,
+        encode,
+        decode,
+        limit: int = 32
+    ):
+        self._encode = encode
+        self._decode = decode
+        self._limit = limit
+        self._inks = {}
+        self._ink = None
+        self._ink_tables = None
+
+    # =======================================================================
+
+    def table(
+        self,
+        ink: color,
+        old: int
+    ):
+        """
+        the blend table for ink into the (raw) old pixel value
+        """
+
+        if ink is not self._ink:
+            raw = self._encode( ink )
+            tables = self._inks.get( raw, None )
+            if tables is None:
+                if len( self._inks ) >= self._limit:
+                    self._inks = {}
+                tables = {}
+                self._inks[ raw ] = tables
+            self._ink = ink
+            self._ink_tables = tables
+
+        table = self._ink_tables.get( old, None )
+        if table is None:
+            if len( self._ink_tables ) >= self._limit:
+                self._ink_tables.clear()
+            r0, g0, b0 = self._decode( old ).rgb()
+            r1, g1, b1 = ink.rgb()
+            table = tuple( 
+                self._encode( color(
+                    ( r0 * ( 15 - level ) + r1 * level + 7 ) // 15,
+                    ( g0 * ( 15 - level ) + g1 * level + 7 ) // 15,
+                    ( b0 * ( 15 - level ) + b1 * level + 7 ) // 15
+                ) )
+                for level in range( 16 )
+            )
+            self._ink_tables[ old ] = table
+        return table
+
+    # =======================================================================
+
+# ===========================================================================
+
+
+def _decode_565( 
+    v: int 
+):
+    """
+    ( a, b, c ) 8-bit channel values of an RGB565 value
+    """
+
+    a = ( v >> 11 ) & 0x1F
+    b = ( v >> 5 ) & 0x3F
+    c = v & 0x1F
+    return ( 
+        ( a << 3 ) | ( a >> 2 ), 
+        ( b << 2 ) | ( b >> 4 ), 
+        ( c << 3 ) | ( c >> 2 ) 
+    )
+
+
+# ===========================================================================
@@ -135,26 +135,42 @@ class board_sunton_esp32_2432s028:
         self.sd_miso = 19
         self.sd_cs = 5
         
+        self._tft_spi_bus = None
+        self._touch_spi_bus = None
+        
+    def tft_spi_bus( self ):
+        """
+        the (shared) hard spi bus of the LCD
+        """
+        if self._tft_spi_bus is None:
+            self._tft_spi_bus = gf.spi_bus( machine.SPI(
+                1,
+                sck = machine.Pin( self.tft_sclk ),
+                mosi = machine.Pin( self.tft_mosi ),
+                miso = machine.Pin( self.tft_miso )
+            ) )
+        return self._tft_spi_bus
+        
+    def touch_spi_bus( self ):
+        """
+        the (shared) soft spi bus of the touch chip
+        """
+        if self._touch_spi_bus is None:
+            self._touch_spi_bus = gf.spi_bus( machine.SoftSPI( 
+                sck = machine.Pin( self.touch_sclk ),
+                mosi = machine.Pin( self.touch_mosi ),
+                miso = machine.Pin( self.touch_miso )
+            ) )
+        return self._touch_spi_bus
+        
     def touch( self ):
-        spi = machine.SoftSPI( 
-            baudrate = 10_000,
-            sck = machine.Pin( self.touch_sclk ),
-            mosi = machine.Pin( self.touch_mosi ),
-            miso = machine.Pin( self.touch_miso )
-        )
         return gf.xpt2046(
-            spi = spi,
+            spi = self.touch_spi_bus().device( baudrate = 10_000 ),
             cs = self.touch_cs
         )        
         
     def display_monochrome( self ):
-        spi = machine.SPI(
-            1,
-            baudrate = 30_000,
-            sck = machine.Pin( self.tft_sclk ),
-            mosi = machine.Pin( self.tft_mosi ),
-            miso = machine.Pin( self.tft_miso )
-        )        
+        spi = self.tft_spi_bus().device( baudrate = 30_000 )
         return gf.lcd(
             chip = "ili9341",
             size = gf.xy( 240, 320 ), 
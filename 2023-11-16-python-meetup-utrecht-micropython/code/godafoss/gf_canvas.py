@@ -109,6 +109,26 @@ class canvas( invertible ):
 
     # =======================================================================
     
+    def clip_rectangle( self ):
+        """
+        the rectangle of pixels that can be written
+        
+        This method returns an ( x0, y0, x1, y1 ) tuple: 
+        the top-left and bottom-right (inclusive) pixels of
+        the part of the canvas that writes can have effect on.
+        For most canvases this is the whole canvas, but for instance
+        a part that extends beyond its subject is clipped to 
+        that subject.
+        
+        Shapes use this to skip the parts that would be
+        outside the canvas, so the time it takes to write a shape
+        is proportional to the part that is visible.
+        """
+        
+        return 0, 0, self.size.x - 1, self.size.y - 1
+        
+    # =======================================================================
+    
     def _cure_ink( 
         self, 
         ink: color | bool | None
@@ -182,6 +202,108 @@ class canvas( invertible ):
             )
     
     # =======================================================================
+    
+    def write_rect(
+        self,
+        start: xy,
+        size: xy,
+        ink: color | bool | None = True
+    ) -> None:
+        """
+        write a filled rectangle
+        
+        :param start: :class:`~godafoss.xy`
+            the top-left pixel of the rectangle
+            
+        :param size: :class:`~godafoss.xy`
+            the size of the rectangle
+        
+        :param ink: (:class:`~godafoss.color`, bool, None, default: True)
+            the value to be written to the pixels  
+            
+        This method writes all pixels of the rectangle, 
+        clipped to the canvas, with the same ink.
+        Horizontal and vertical lines (spans) are rectangles 
+        with a height or width of 1.
+        
+        A concrete canvas can implement _write_rect_implementation()
+        to do this faster than by writing the individual pixels.
+        """
+        
+        if ink is None:
+            return
+        x0 = max( 0, start.x )
+        y0 = max( 0, start.y )
+        x1 = min( self.size.x, start.x + size.x )
+        y1 = min( self.size.y, start.y + size.y )
+        if ( x0 < x1 ) and ( y0 < y1 ):
+            ink = self._cure_ink( ink )
+            self._dirty = True
+            self._write_rect_implementation( 
+                x0, y0, x1 - x0, y1 - y0, ink )
+    
+    # =======================================================================
+    
+    def read_pixel(
+        self,
+        location: xy
+    ) -> color | bool | None:
+        """
+        read a pixel
+        
+        :param location: :class:`~godafoss.xy`
+            the location of the pixel that is to be read 
+            
+        This method returns the value of the pixel (as written,
+        but for instance limited to the colors the canvas can store), 
+        or None when the location is outside the canvas, 
+        or the canvas can't read its pixels.
+        Canvases that are backed by a framebuffer can read their pixels.
+        """
+        
+        if self.within( location ):
+            return self._read_pixel_implementation( location )
+        return None
+    
+    # =======================================================================
+    
+    def write_blended(
+        self,
+        location: xy,
+        ink: color | bool | None,
+        level: int
+    ) -> None:
+        """
+        write a pixel that is partly covered
+        
+        :param location: :class:`~godafoss.xy`
+            the location of the pixel that is to be written 
+        
+        :param ink: (:class:`~godafoss.color`, bool, None)
+            the value to be blended into the pixel      
+            
+        :param level: int
+            the coverage of the pixel: 0 (none) .. 15 (full)
+            
+        For a color canvas, the ink is blended with the current 
+        value of the pixel (or with the background when the canvas 
+        can't read its pixels). 
+        This is used for anti-aliased shapes.
+        For a monochrome canvas, the pixel is written
+        when it is (at least) half covered.
+        """
+        
+        if ( ink is None ) or ( level < 1 ) or not self.within( location ):
+            return
+        if ( level >= 15 ) or not self.is_color:
+            if level >= 8:
+                self.write_pixel( location, ink )
+            return
+        self._dirty = True
+        self._write_blended_implementation( 
+            location, self._cure_ink( ink ), level )
+    
+    # =======================================================================
 
     def flush( 
         self, 
@@ -234,11 +356,37 @@ class canvas( invertible ):
         
         When the thing is a string, a :class:`~godafoss.text`
         is constructed from it and that is written.
+        
+        When the bounds of the thing are known, a thing that is 
+        completely outside the clip rectangle is not written at all,
+        and the part of the bounds that is within the clip rectangle
+        is marked as dirty (_mark_dirty) in one step.
         """
         
         if isinstance( thing, str ):
             thing = text( thing )
-        
+            
+        bounds = thing.bounds( location )
+        if bounds is None:
+            self._write_thing( thing, location, ink )
+            return
+            
+        x0, y0, x1, y1 = self.clip_rectangle()
+        x0 = max( x0, bounds[ 0 ] )
+        y0 = max( y0, bounds[ 1 ] )
+        x1 = min( x1, bounds[ 2 ] )
+        y1 = min( y1, bounds[ 3 ] )
+        if ( x0 <= x1 ) and ( y0 <= y1 ):
+            self._write_bounded( thing, location, ink, x0, y0, x1, y1 )
+            
+    # =======================================================================
+
+    def _write_thing( 
+        self, 
+        thing: "shape",
+        location: xy,
+        ink : color | None
+    ) -> None:
         if ink is None:
             thing.write( self, location )
         else:
@@ -246,6 +394,97 @@ class canvas( invertible ):
         
     # =======================================================================
 
+    def _write_bounded( 
+        self, 
+        thing: "shape",
+        location: xy,
+        ink : color | None,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int
+    ) -> None:
+        """
+        write a thing that writes only within a rectangle
+        
+        The pixel writes don't mark the canvas dirty,
+        instead the rectangle is marked dirty.
+        """
+        
+        dirty = self._dirty
+        self._write_thing( thing, location, ink )
+        self._dirty = dirty
+        self._mark_dirty( x0, y0, x1, y1 )
+        
+    # =======================================================================
+
+    def _mark_dirty( 
+        self, 
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int
+    ) -> None:
+        """
+        mark a rectangle of the canvas as dirty
+        
+        The rectangle (inclusive) has been written, 
+        so it must be effectuated by the next flush().
+        The default marks the whole canvas dirty.
+        A concrete canvas can record the rectangle,
+        so a flush() writes only what has been changed.
+        """
+        
+        self._dirty = True
+        
+    # =======================================================================
+
+    def _frame_buffer( self ):
+        """
+        the frame buffer of the canvas
+        
+        A canvas that holds its pixels in a framebuf.FrameBuffer,
+        with the same coordinates as the canvas,
+        returns a ( framebuffer, format ) tuple, 
+        so the pixels can be copied with framebuf.blit().
+        The default returns None.
+        """
+        
+        return None
+        
+    # =======================================================================
+
+    def _stores_like( 
+        self, 
+        other: "canvas" 
+    ) -> bool:
+        """
+        whether the other canvas stores pixels like this canvas
+        
+        This is the case when both are backed by a framebuf of 
+        the same format, and (for color) encode colors the same way
+        (checked for a few colors),
+        so the raw pixels can be copied (framebuf.blit) from
+        one to the other.
+        """
+        
+        mine = self._frame_buffer()
+        theirs = other._frame_buffer()
+        if ( mine is None ) or ( theirs is None ):
+            return False
+        if mine[ 1 ] != theirs[ 1 ]:
+            return False
+        if self.is_color != other.is_color:
+            return False
+        if not self.is_color:
+            return True
+        for ink in ( colors.red, colors.green, colors.blue ):
+            if self._encode( ink ) != other._encode( ink ):
+                return False
+        return True
+        
+    # =======================================================================
+
     def clear( 
         self, 
         ink: bool | color = False 
@@ -309,6 +548,77 @@ class canvas( invertible ):
 
     # =======================================================================
     
+    def _write_rect_implementation(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        ink: color | bool
+    ) -> None:  
+        """
+        write a filled rectangle (concrete implementation)
+        
+        When this method is called the rectangle is within the canvas,
+        and not empty, and the ink is as for 
+        _write_pixel_implementation().
+        The default implementation writes the individual pixels.
+        A concrete canvas might implement a faster method.
+        """
+        
+        for dy in range( y, y + height ):
+            for dx in range( x, x + width ):
+                self._write_pixel_implementation( xy( dx, dy ), ink )
+
+    # =======================================================================
+    
+    def _read_pixel_implementation(
+        self,
+        location: xy
+    ) -> color | bool | None:  
+        """
+        read a pixel (concrete implementation)
+        
+        This method can be implemented by a concrete class that
+        can read its pixels. When this method is called the 
+        location is within the canvas.
+        The default implementation returns None: the pixel
+        can't be read.
+        """
+        
+        return None
+    
+    # =======================================================================
+    
+    def _write_blended_implementation(
+        self,
+        location: xy,
+        ink: color,
+        level: int
+    ) -> None:  
+        """
+        blend a pixel (concrete implementation)
+        
+        When this method is called the location is within the canvas,
+        the canvas is a color canvas, the ink is a color, 
+        and the level is 1 .. 14.
+        The default implementation reads the pixel (or uses the 
+        background), blends it with the ink, and writes the result.
+        A concrete canvas with a framebuffer can do this 
+        faster on the raw pixel values, see gf_blend.
+        """
+        
+        old = self._read_pixel_implementation( location )
+        if old is None:
+            old = self.background
+        self._write_pixel_implementation( location, color(
+            ( old.red * ( 15 - level ) + ink.red * level + 7 ) // 15,
+            ( old.green * ( 15 - level ) + ink.green * level + 7 ) // 15,
+            ( old.blue * ( 15 - level ) + ink.blue * level + 7 ) // 15
+        ) )
+    
+    # =======================================================================
+    
     def _flush_implementation(
         self,
         forced: bool
@@ -336,7 +646,9 @@ class canvas( invertible ):
             
         This method can be implemented by a concrete class that
         inherits from canvas. 
-        The default implementation writes False to all individual pixels.
+        The default implementation writes the whole canvas as one 
+        rectangle (_write_rect_implementation), so a canvas (or proxy)
+        that writes rectangles fast also clears fast.
         A concrete canvas might implement a faster method.
         
         When this method is called:    
@@ -344,9 +656,35 @@ class canvas( invertible ):
         - for a color canvas, the ink is a color.             
         """      
                 
-        for x in range( 0, self.size.x ):
-            for y in range( 0, self.size.y ):
-                self._write_pixel_implementation( xy( x, y ), ink )    
+        self._write_rect_implementation( 
+            0, 0, self.size.x, self.size.y, ink )
+    
+    # =======================================================================
+    
+    def _strip_index(
+        self,
+        x: int,
+        y: int
+    ):
+        """
+        the strip and index in that strip that a pixel maps to
+        
+        :param x: int
+        :param y: int
+            the location of the pixel, which is within the canvas
+            
+        A canvas that is (or maps each of its pixels to) a pixel of a
+        1-dimensional strip returns a ( strip, index ) tuple,
+        or None when the pixel isn't mapped to a strip pixel.
+        The strip must implement _write_index( index, ink ).
+        
+        This is used to collapse a chain of canvas proxies 
+        over a strip into a single lookup table.
+        The default implementation returns None, which means that
+        the pixels of the canvas are not strip pixels.
+        """
+        
+        return None
     
     # =======================================================================
     
@@ -413,7 +751,7 @@ class canvas( invertible ):
         """
         
         from godafoss.gf_canvas_folded import _canvas_folded        
-        return _canvas_folded( self, n, zigzag )        
+        return self._collapsed( _canvas_folded( self, n, zigzag ) )
         
     # =======================================================================
 
@@ -429,24 +767,32 @@ class canvas( invertible ):
         part of the original canvas, as specified by the
         start and size parameters.
         
-        The clear() method of a canvas part can be significantly slower
+        The clear() method of a canvas part can be slower
         than the clear() of the original canvas, because it can't use
         the clear() of the driver (which often has a fast way to clear 
-        the whole canvas).
+        the whole canvas): it writes a filled rectangle instead.
+        
+        A part of a part (or of a rotated or swapped canvas) is a
+        single transformation of the original canvas, so it doesn't
+        add another level of indirection.
         """
         
-        from godafoss.gf_canvas_part import _canvas_part
-        return _canvas_part( self, start, size )         
+        from godafoss.gf_canvas_transformed import _canvas_transformed
+        return self._collapsed( _canvas_transformed( 
+            self, 
+            size,
+            ( 1, 0, 0, 1, start.x, start.y )
+        ) )
         
     # =======================================================================
     
     def xy_swapped( self ):
         from godafoss.gf_canvas_transformed import _canvas_transformed
-        return _canvas_transformed( 
+        return self._collapsed( _canvas_transformed( 
             self, 
             xy( self.size.y, self.size.x ),
-            lambda c: xy( c.y, c.x )
-        )   
+            ( 0, 1, 1, 0, 0, 0 )
+        ) )
 
     # =======================================================================
 
@@ -463,7 +809,7 @@ class canvas( invertible ):
         """
         
         from godafoss.gf_canvas_rotated import _canvas_rotated
-        return _canvas_rotated( self, rotation )
+        return self._collapsed( _canvas_rotated( self, rotation ) )
         
     # =======================================================================
 
@@ -486,8 +832,67 @@ class canvas( invertible ):
         """         
         
         from godafoss.gf_canvas_extended import _canvas_extended
-        return _canvas_extended( self, other, direction )          
+        return self._collapsed( _canvas_extended( self, other, direction ) )
+
+    # =======================================================================
+
+    def dithered( self ) -> "canvas":
+        """
+        color version of a monochrome canvas
+
+        This method returns a color canvas that writes each pixel
+        to the (monochrome) original canvas as on or off,
+        using ordered (Bayer) dithering of its gray value.
+        This way color content (like a color user interface)
+        can be shown on a monochrome display.
+
+        For images, :class:`~godafoss.dither_floyd_steinberg`
+        gives a better result.
+        """
+
+        from godafoss.gf_dither import _canvas_dithered
+        return _canvas_dithered( self )
+
+    # =======================================================================
+
+    def _collapsed( 
+        self,
+        proxy: "canvas"
+    ) -> "canvas":
+        """
+        the proxy, collapsed into a lookup table when it is over a strip
+        
+        When the proxy (and the proxies it is build on) maps each of
+        its pixels to a pixel of a 1-dimensional strip, a canvas
+        that maps each pixel via a precomputed table is returned
+        (see gf_canvas_strip_map), otherwise the proxy itself.
+        """
+        
+        if self._strip_index( 0, 0 ) is None:
+            return proxy
+        from godafoss.gf_canvas_strip_map import _canvas_strip_mapped
+        return _canvas_strip_mapped( proxy )
 
     # =======================================================================
                                                                                                                                                    
 # ===========================================================================
+
+def _frame_buffer_bytes(
+    size: xy,
+    format: int
+) -> int:
+    """
+    the number of bytes of a framebuf.FrameBuffer of a size and format
+    """
+
+    import framebuf
+    if format == framebuf.RGB565:
+        return 2 * size.x * size.y
+    if format == framebuf.GS4_HMSB:
+        return ( ( size.x + 1 ) // 2 ) * size.y
+    if format == framebuf.MONO_VLSB:
+        return size.x * ( ( size.y + 7 ) // 8 )
+    return ( ( size.x + 7 ) // 8 ) * size.y
+
+
+# ===========================================================================
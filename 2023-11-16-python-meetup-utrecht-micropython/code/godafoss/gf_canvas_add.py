@@ -58,6 +58,19 @@ class _canvas_add( canvas ):
         
     # =======================================================================                                                                             
 
+    def _write_rect_implementation(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        ink: color | bool
+    ) -> None:
+        self._a.write_rect( xy( x, y ), xy( width, height ), ink )
+        self._b.write_rect( xy( x, y ), xy( width, height ), ink )
+        
+    # =======================================================================                                                                             
+
     def _flush_implementation(
         self,
         forced: bool
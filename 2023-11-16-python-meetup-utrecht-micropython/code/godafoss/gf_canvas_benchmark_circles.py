@@ -0,0 +1,69 @@
+# ===========================================================================
+#
+# file     : gf_canvas_benchmark_circles.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# ===========================================================================
+
+from godafoss.gf_tools import *
+from godafoss.gf_xy import *
+from godafoss.gf_canvas import *
+from godafoss.gf_circle import *
+from godafoss.gf_circle import _circle_half_widths
+
+
+# ===========================================================================
+
+def canvas_benchmark_circles( 
+    s : canvas, 
+    radii = ( 10, 40, 119 ),
+    iterations: int = 10
+):
+    """
+    filled circle write speed
+    
+    :param s: (:class:`~godafoss.canvas`)
+        the canvas on which the circles are written,
+        for instance a 240 x 240 lcd
+        
+    :param radii: (sequence of int)
+        the radii of the circles that are written
+        
+    :param iterations: (int)
+        the number of times each circle is written
+    
+    For each radius, this function writes a filled circle
+    (in the centre of the canvas) a number of times, 
+    and prints the time per circle and the number of pixels 
+    written per second.
+    The time does not include a flush.
+    """
+
+    print( "canvas benchmark filled circles on %d x %d" % ( 
+        s.size.x, s.size.y ) )
+    centre = xy( s.size.x // 2, s.size.y // 2 )
+    
+    for radius in radii:
+        shape = circle( radius, fill = True )
+        
+        # the number of pixels in the circle
+        pixels = 0
+        half = _circle_half_widths( radius )
+        for dy in range( len( half ) ):
+            pixels += ( 2 * half[ dy ] + 1 ) * ( 2 if dy else 1 )
+        
+        def run():
+            for _ in range( iterations ):
+                shape.write( s, centre )
+        us = elapsed_us( run ) // iterations
+        
+        print( "   radius %3d : %6d pixels, %7d us, %9d pixels/s" % (
+            radius, pixels, us, pixels * 1_000_000 // max( 1, us ) ) )
+        
+
+# ===========================================================================
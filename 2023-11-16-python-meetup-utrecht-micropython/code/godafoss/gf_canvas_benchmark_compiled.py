@@ -0,0 +1,116 @@
+# ===========================================================================
+#
+# file     : gf_canvas_benchmark_compiled.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# ===========================================================================
+
+from random import randint
+
+from godafoss.gf_tools import *
+from godafoss.gf_xy import *
+from godafoss.gf_canvas import *
+from godafoss.gf_line import *
+from godafoss.gf_rectangle import *
+from godafoss.gf_circle import *
+from godafoss.gf_text import *
+from godafoss.gf_ggf import *
+
+
+# ===========================================================================
+
+def canvas_benchmark_compiled( 
+    s : canvas, 
+    iterations: int = 5,
+    image: str | None = None
+):
+    """
+    compiled shape write speed
+    
+    :param s: (:class:`~godafoss.canvas`)
+        the canvas on which the shapes are written,
+        for instance a 240 x 240 lcd
+        
+    :param iterations: (int)
+        the number of times each scene is written
+        
+    :param image: (str, None)
+        the name of a :class:`~godafoss.ggf` file,
+        which is written as an extra scene
+        (a color ggf only on a color canvas)
+    
+    This function creates the scenes of the canvas_demo_lines, 
+    canvas_demo_rectangles, canvas_demo_circles and canvas_demo_text
+    demos (a frame plus random lines, rectangles or circles, or 
+    a few lines of text) as compound shapes,
+    plus the image when one is specified.
+    For each scene it prints the time per frame when the 
+    scene is written as-is and when it is written compiled, 
+    the speedup, and the RAM used by the compiled scene.
+    The times do not include a flush.
+    """
+
+    print( "canvas benchmark compiled shapes on %d x %d" % ( 
+        s.size.x, s.size.y ) )
+        
+    def random_xy():
+        return xy( randint( 0, s.size.x - 1 ), randint( 0, s.size.y - 1 ) )
+    
+    frame = rectangle( s.size )
+    
+    lines = frame
+    for _ in range( 20 ):
+        start, end = random_xy(), random_xy()
+        lines = lines + ( line( end - start ) @ start )
+        
+    rectangles = frame
+    for _ in range( 10 ):
+        start, end = random_xy(), random_xy()
+        rectangles = rectangles + ( rectangle( end - start ) @ start )
+        
+    circles = frame
+    for _ in range( 20 ):
+        radius = randint( 0, min( s.size.x, s.size.y ) // 2 )
+        circles = circles + ( circle( radius ) @ random_xy() )
+        
+    texts = ( 
+        frame
+        + ( text( "Hello world" ) @ xy( 1, 1 ) )
+        + ( text( "Micropython" ) @ xy( 1, 9 ) )
+        + ( text( "+ Godafoss" ) @ xy( 1, 17 ) ) 
+    )
+    
+    scenes = [
+        ( "lines", lines ),
+        ( "rectangles", rectangles ),
+        ( "circles", circles ),
+        ( "text", texts ),
+    ]
+    if image is not None:
+        scenes.append( ( "image", ggf( image, cached = True ) ) )
+    
+    for name, scene in scenes:
+        compiled = scene.compile()
+        
+        def run( subject ):
+            def frames():
+                for _ in range( iterations ):
+                    s.write( subject )
+            return elapsed_us( frames ) // iterations
+            
+        plain_us = run( scene )
+        compiled_us = run( compiled )
+        
+        print( "   %-10s : %7d us, compiled %7d us (x %d.%d), %5d bytes" % (
+            name, plain_us, compiled_us, 
+            plain_us // max( 1, compiled_us ),
+            ( 10 * plain_us // max( 1, compiled_us ) ) % 10,
+            compiled.size_bytes ) )
+        
+
+# ===========================================================================
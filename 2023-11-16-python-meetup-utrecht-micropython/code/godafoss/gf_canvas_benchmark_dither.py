@@ -0,0 +1,78 @@
+# ===========================================================================
+#
+# file     : gf_canvas_benchmark_dither.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# ===========================================================================
+
+from godafoss.gf_tools import *
+from godafoss.gf_xy import *
+from godafoss.gf_canvas import *
+from godafoss.gf_dither import *
+
+
+# ===========================================================================
+
+def canvas_benchmark_dither( 
+    s : canvas, 
+    iterations: int = 3
+):
+    """
+    dither speed
+    
+    :param s: (:class:`~godafoss.canvas`)
+        the monochrome canvas to which the rows are written,
+        for instance a 128 x 64 ssd1306
+        
+    :param iterations: (int)
+        the number of times the image is written
+    
+    This function writes a gray image (a diagonal gradient)
+    of the size of the canvas with the 
+    :class:`~godafoss.dither` (threshold), 
+    :class:`~godafoss.dither_bayer` and
+    :class:`~godafoss.dither_floyd_steinberg` classes.
+    For each it prints the number of rows per second,
+    and the number of pixels per second.
+    The times do not include a flush.
+    """
+
+    print( "canvas benchmark dither on %d x %d" % ( 
+        s.size.x, s.size.y ) )
+        
+    width, height = s.size.x, s.size.y
+    rows = [
+        bytes( 
+            ( 255 * ( x + y ) ) // ( width + height - 2 )
+            for x in range( width ) 
+        )
+        for y in range( height ) 
+    ]
+    
+    for name, method in (
+        ( "threshold", dither ),
+        ( "bayer", dither_bayer ),
+        ( "floyd-steinberg", dither_floyd_steinberg ),
+    ):
+        
+        def frames():
+            for _ in range( iterations ):
+                d = method( s, width )
+                for row in rows:
+                    d.write_row( row )
+                    
+        us = max( 1, elapsed_us( frames ) )
+        n = iterations * height
+        
+        print( "   %-15s : %7d rows/s, %9d pixels/s" % (
+            name, 
+            ( 1_000_000 * n ) // us,
+            ( 1_000_000 * n * width ) // us ) )
+        
+
+# ===========================================================================
@@ -0,0 +1,107 @@
+# ===========================================================================
+#
+# file     : gf_canvas_benchmark_fonts.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# ===========================================================================
+
+from godafoss.gf_tools import *
+from godafoss.gf_xy import *
+from godafoss.gf_canvas import *
+from godafoss.gf_text import *
+from godafoss.gf_font_default import *
+from godafoss.gf_gbf import *
+
+
+# ===========================================================================
+
+def canvas_benchmark_fonts(
+    s : canvas,
+    file_name: str,
+    data,
+    characters: str = "0123456789",
+    iterations: int = 5
+):
+    """
+    font heap use and glyph write speed
+
+    :param s: (:class:`~godafoss.canvas`)
+        the canvas on which the characters are written
+
+    :param file_name: (str)
+        a gbf font file
+
+    :param data: (bytes)
+        the same font as gbf data,
+        preferably from a frozen module
+
+    :param characters: (str)
+        the characters that are written
+
+    :param iterations: (int)
+        the number of times the characters are written
+
+    This function compares the built-in (framebuf) 8x8 font,
+    the :class:`~godafoss.gbf` font read from the file,
+    and the :class:`~godafoss.gbf_bytes` font that uses the data.
+    For each font it prints the heap the font object uses
+    (after all characters have been read once, so including
+    the glyph cache), the heap that is allocated per
+    glyph write, and the time per glyph write.
+    The times do not include a flush.
+
+    .. code-block::
+
+        import font_digits_48
+        canvas_benchmark_fonts(
+            display, "digits_48.gbf", font_digits_48.data )
+    """
+
+    from godafoss.gf_gc import collect, mem_free
+
+    print( "canvas benchmark fonts on %d x %d, %d characters" % (
+        s.size.x, s.size.y, len( characters ) ) )
+
+    for name, make in (
+        ( "framebuf", lambda: font_default() ),
+        ( "gbf file", lambda: gbf( file_name ) ),
+        ( "gbf bytes", lambda: gbf_bytes( data ) ),
+    ):
+        collect()
+        before = mem_free()
+        f = make()
+        for c in characters:
+            f.read( c )
+        collect()
+        font_bytes = before - mem_free()
+
+        # the allocations of one pass, without a collect in between
+        glyphs = text( characters, f )
+        collect()
+        before = mem_free()
+        s.write( glyphs )
+        write_bytes = before - mem_free()
+
+        def frames():
+            for _ in range( iterations ):
+                s.write( glyphs )
+
+        us = elapsed_us( frames )
+        n = iterations * len( characters )
+
+        print( "   %-10s : font %6d bytes, %5d bytes/glyph, %6d us/glyph" % (
+            name,
+            font_bytes,
+            write_bytes // len( characters ),
+            us // n ) )
+
+        if name == "gbf file":
+            f.close()
+
+
+# ===========================================================================
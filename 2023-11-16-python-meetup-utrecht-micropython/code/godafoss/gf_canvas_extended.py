@@ -63,8 +63,8 @@ def _canvas_extended(
             self.size.y + other.size.y )
 
         if alignment == "E":
-            a_shift = xy( b.size.x - a.size.x, 0 )
-            #b_shift = xy( a.size.x, 0 )
+            a_shift = xy( size.x - a.size.x, 0 )
+            b_shift = xy( size.x - b.size.x, a.size.y )
                 
         elif alignment == "W":
             a_shift = xy( 0, 0 )
@@ -73,22 +73,32 @@ def _canvas_extended(
         else:
             raise ValueError( "direction[ 1 ] is invalid" )           
         
-    return _canvas_extended_class( a, b, size, - a_shift, - b_shift ) 
+    return _canvas_extended_class( a, b, size, a_shift, b_shift ) 
 
 # ===========================================================================
 
 class _canvas_extended_class( canvas ):
     """
-    helper class that inverts a canvas    
+    helper class that combines two canvases side by side  
     """
     
-    def __init__( self, subject: canvas ):
-        self._subject = subject
+    def __init__( 
+        self, 
+        a: canvas, 
+        b: canvas, 
+        size: xy, 
+        a_shift: xy, 
+        b_shift: xy 
+    ):
+        self._a = a
+        self._b = b
+        self._a_shift = a_shift
+        self._b_shift = b_shift
         canvas.__init__(
             self,
-            subject.size,
-            subject.is_color,
-            _invert_ink( subject.background )
+            size,
+            a.is_color,
+            a.background
         )
         
     # =======================================================================                                                                             
@@ -98,10 +108,39 @@ class _canvas_extended_class( canvas ):
         location: xy,
         ink: bool | color   
     ) -> None:
-        self._subject.write_pixel( 
-            location, 
-            _invert_ink( ink ) 
-        )  
+        self._a.write_pixel( location - self._a_shift, ink )
+        self._b.write_pixel( location - self._b_shift, ink )
+        
+    # =======================================================================                                                                             
+
+    def _write_rect_implementation(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        ink: bool | color
+    ) -> None:
+        
+        # each canvas clips the rectangle to its own part
+        size = xy( width, height )
+        self._a.write_rect( xy( x, y ) - self._a_shift, size, ink )
+        self._b.write_rect( xy( x, y ) - self._b_shift, size, ink )
+        
+    # =======================================================================                                                                             
+
+    def _strip_index( 
+        self, 
+        x: int, 
+        y: int 
+    ):
+        for subject, shift in ( 
+            ( self._a, self._a_shift ), 
+            ( self._b, self._b_shift ) 
+        ):
+            if subject.within( xy( x - shift.x, y - shift.y ) ):
+                return subject._strip_index( x - shift.x, y - shift.y )
+        return None
         
     # =======================================================================                                                                             
 
@@ -109,7 +148,8 @@ class _canvas_extended_class( canvas ):
         self,
         forced: bool
     ) -> None:
-        self._subject.flush( forced )
+        self._a.flush( forced )
+        self._b.flush( forced )
         
     # =======================================================================                                                                             
 
@@ -117,7 +157,8 @@ class _canvas_extended_class( canvas ):
         self,
         ink: bool | color
     ) -> None:
-        self._subject.clear( _invert_ink( ink ) )       
+        self._a.clear( ink )       
+        self._b.clear( ink )       
 
     # =======================================================================                                                                             
 
@@ -58,6 +58,56 @@ class _canvas_folded( canvas ):
                
     # =======================================================================                                                                             
 
+    def _write_rect_implementation(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        ink: bool | color
+    ) -> None:
+        h = self._subject.size.y
+        w = self.size.x
+        
+        if self._zigzag:
+            # the odd rows are mirrored, so each row is a span
+            for row in range( y, y + height ):
+                sx = w - ( x + width ) if ( row % 2 ) == 1 else x
+                self._subject.write_rect( 
+                    xy( sx + w * ( row // h ), row % h ), 
+                    xy( width, 1 ), 
+                    ink 
+                )
+            return
+            
+        # the rows within a fold are a rectangle of the subject
+        row = y
+        while row < y + height:
+            fold = row // h
+            n = min( y + height, ( fold + 1 ) * h ) - row
+            self._subject.write_rect( 
+                xy( x + w * fold, row % h ), 
+                xy( width, n ), 
+                ink 
+            )
+            row += n
+               
+    # =======================================================================                                                                             
+
+    def _strip_index( 
+        self, 
+        x: int, 
+        y: int 
+    ):
+        if self._zigzag and ( ( y % 2 ) == 1 ):
+            x = self.size.x - ( x + 1 )
+        return self._subject._strip_index( 
+            x + self.size.x * ( y // self._subject.size.y ),
+            y % self._subject.size.y
+        )
+               
+    # =======================================================================                                                                             
+
     def _flush_implementation(
         self,
         forced: bool
@@ -70,7 +120,14 @@ class _canvas_folded( canvas ):
         self,
         ink: bool | color
     ) -> None:
-        self._subject.clear( ink )       
+    
+        # the subject clear() can be used only when the folded
+        # canvas covers all of the subject
+        if self.size.x * self._n == self._subject.size.x:
+            self._subject.clear( ink )       
+        else:
+            self._write_rect_implementation( 
+                0, 0, self.size.x, self.size.y, ink )
 
     # =======================================================================                                                                             
 
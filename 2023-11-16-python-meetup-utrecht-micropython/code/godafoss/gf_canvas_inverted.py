@@ -54,6 +54,22 @@ class _canvas_inverted( canvas ):
         
     # =======================================================================                                                                             
 
+    def _write_rect_implementation(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        ink: bool | color
+    ) -> None:
+        self._subject.write_rect( 
+            xy( x, y ), 
+            xy( width, height ), 
+            _invert_ink( ink ) 
+        )
+        
+    # =======================================================================                                                                             
+
     def _flush_implementation(
         self,
         forced: bool
@@ -0,0 +1,274 @@
+# ===========================================================================
+#
+# file     : gf_canvas_mirror.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the canvas_mirror class.
+#
+# ===========================================================================
+
+import framebuf
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_canvas import *
+from godafoss.gf_canvas import _frame_buffer_bytes
+
+
+# ===========================================================================
+
+class canvas_mirror( canvas ):
+    """
+    canvas that shows the same content on several displays
+
+    :param primary: (:class:`~godafoss.canvas`)
+        the canvas on which the content is rendered
+
+    :param mirrors: (:class:`~godafoss.canvas`, ...)
+        the canvases that show a copy of the primary
+
+    A canvas_mirror is like primary + mirror + ...,
+    but the pixels are rendered only once, on the primary.
+    On a flush() the changed part of the frame buffer of the 
+    primary is copied (framebuf.blit) to each mirror that stores 
+    its pixels in the same way (same size, same framebuf format 
+    and color encoding), and the mirror is flushed.
+    So the cost of a pixel write doesn't depend on the number
+    of mirrors, and there is no nesting of added canvases.
+
+    The changed part is the union of the rectangles that were 
+    marked dirty (by shape writes, see :meth:`~godafoss.canvas.write`)
+    since the last flush. 
+    Only that rectangle is copied (via a scratch buffer
+    of the size of the rectangle, which is kept for the next flush),
+    and it is marked dirty in the mirrors too, 
+    so for instance an lcd mirror flushes only what has changed.
+    When pixels were written outside such a rectangle,
+    the whole frame buffer is copied and the mirrors 
+    are flushed completely.
+    So pixels must be written through the canvas_mirror,
+    not directly to the primary.
+
+    A mirror that does not store its pixels like the primary
+    (a different kind of display) gets each pixel write,
+    like with the + operator.
+    """
+
+    def __init__(
+        self,
+        primary: canvas,
+        *mirrors
+    ):
+        self._primary = primary
+        self._copies = []
+        self._others = []
+        for mirror in mirrors:
+            if (
+                ( mirror.size.x == primary.size.x )
+                and ( mirror.size.y == primary.size.y )
+                and primary._stores_like( mirror )
+            ):
+                self._copies.append( mirror )
+            else:
+                self._others.append( mirror )
+
+        # the union of the rectangles that were marked dirty 
+        # since the last flush, or None
+        self._marked = None
+        
+        # for copying a rectangle, see _copy()
+        self._scratch = bytearray( 0 )
+
+        canvas.__init__(
+            self,
+            size = primary.size,
+            is_color = primary.is_color,
+            background = primary.background
+        )
+
+    # =======================================================================
+
+    def clip_rectangle( self ):
+        return self._primary.clip_rectangle()
+
+    # =======================================================================
+
+    def write_pixel(
+        self,
+        location: xy,
+        ink: color | bool | None = True
+    ) -> None:
+        self._dirty = True
+        self._primary.write_pixel( location, ink )
+        for other in self._others:
+            other.write_pixel( location, ink )
+
+    # =======================================================================
+
+    def write_rect(
+        self,
+        start: xy,
+        size: xy,
+        ink: color | bool | None = True
+    ) -> None:
+        self._dirty = True
+        self._primary.write_rect( start, size, ink )
+        for other in self._others:
+            other.write_rect( start, size, ink )
+
+    # =======================================================================
+
+    def write_blended(
+        self,
+        location: xy,
+        ink: color | bool | None,
+        level: int
+    ) -> None:
+        self._dirty = True
+        self._primary.write_blended( location, ink, level )
+        for other in self._others:
+            other.write_blended( location, ink, level )
+
+    # =======================================================================
+
+    def read_pixel(
+        self,
+        location: xy
+    ) -> color | bool | None:
+        return self._primary.read_pixel( location )
+
+    # =======================================================================
+
+    def _frame_buffer( self ):
+
+        # a blit to the primary reaches the copies on the next flush,
+        # but not the other mirrors
+        if self._others:
+            return None
+        return self._primary._frame_buffer()
+
+    # =======================================================================
+
+    def _write_bounded(
+        self,
+        thing: "shape",
+        location: xy,
+        ink: color | None,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int
+    ) -> None:
+
+        # the pixel writes go to the primary (and the other mirrors),
+        # the rectangle is marked dirty in all of them
+        unmarked = self._dirty
+        dirty = [ self._primary._dirty ]
+        for other in self._others:
+            dirty.append( other._dirty )
+        self._write_thing( thing, location, ink )
+        self._dirty = unmarked
+        self._primary._dirty = dirty[ 0 ]
+        for i in range( len( self._others ) ):
+            self._others[ i ]._dirty = dirty[ i + 1 ]
+        self._mark_dirty( x0, y0, x1, y1 )
+
+    # =======================================================================
+
+    def _mark_dirty(
+        self,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int
+    ) -> None:
+        if self._marked is None:
+            self._marked = ( x0, y0, x1, y1 )
+        else:
+            a0, b0, a1, b1 = self._marked
+            self._marked = ( 
+                min( a0, x0 ), min( b0, y0 ), max( a1, x1 ), max( b1, y1 ) )
+        self._primary._mark_dirty( x0, y0, x1, y1 )
+        for mirror in self._copies:
+            mirror._mark_dirty( x0, y0, x1, y1 )
+        for other in self._others:
+            other._mark_dirty( x0, y0, x1, y1 )
+
+    # =======================================================================
+
+    def flush(
+        self,
+        forced: bool = False
+    ) -> None:
+        """
+        $macro_insert canvas_flush
+        """
+
+        # pixels written outside a marked rectangle:
+        # the copies must be copied and flushed completely
+        # (the _dirty of the primary can't tell, 
+        # some canvases set it when a rectangle is marked dirty)
+        complete = forced or self._dirty
+        self._dirty = False
+        if self._copies:
+            if complete:
+                frame_buffer = self._primary._frame_buffer()[ 0 ]
+                for mirror in self._copies:
+                    mirror._frame_buffer()[ 0 ].blit( frame_buffer, 0, 0 )
+            elif self._marked is not None:
+                self._copy( *self._marked )
+        self._marked = None
+
+        self._primary.flush( forced )
+        for mirror in self._copies:
+            mirror.flush( complete )
+        for other in self._others:
+            other.flush( forced )
+
+    # =======================================================================
+
+    def _copy(
+        self,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int
+    ) -> None:
+        """
+        copy a rectangle of the primary to the copies
+        
+        framebuf.blit() has no source rectangle, so the rectangle 
+        is first copied (blit at - x0, - y0) to a frame buffer 
+        of its own size, which is then blitted to the copies.
+        """
+        
+        frame_buffer, format = self._primary._frame_buffer()
+        size = xy( x1 - x0 + 1, y1 - y0 + 1 )
+        n = _frame_buffer_bytes( size, format )
+        if len( self._scratch ) < n:
+            self._scratch = bytearray( n )
+        part = framebuf.FrameBuffer( 
+            memoryview( self._scratch )[ : n ], size.x, size.y, format )
+        part.blit( frame_buffer, - x0, - y0 )
+        for mirror in self._copies:
+            mirror._frame_buffer()[ 0 ].blit( part, x0, y0 )
+        
+    # =======================================================================
+
+    def clear(
+        self,
+        ink: bool | color = False
+    ) -> None:
+        self._dirty = True
+        self._primary.clear( ink )
+        for other in self._others:
+            other.clear( ink )
+
+    # =======================================================================
+
+# ===========================================================================
@@ -26,33 +26,39 @@ def _canvas_rotated(
 ) -> "canvas":
         
     from godafoss.gf_canvas_transformed import _canvas_transformed    
+    
+    last_x = self.size.x - 1
+    last_y = self.size.y - 1
 
     if rotation == 0:
         return _canvas_transformed( 
             self, 
             self.size, 
-            lambda c: xy( c.x, c.y )
+            ( 1, 0, 0, 1, 0, 0 )
         )
             
     elif rotation == 90:
+        # x, y => last_x - y, x
         return _canvas_transformed( 
             self, 
             xy( self.size.y, self.size.x ),
-            lambda c: xy( self.size.x - 1 - c.y, c.x )
+            ( 0, -1, 1, 0, last_x, 0 )
         )
             
     elif rotation == 180:
+        # x, y => last_x - x, last_y - y
         return _canvas_transformed( 
             self, 
             self.size, 
-            lambda c: xy( self.size.x - 1 - c.x, self.size.y - 1 - c.y )
+            ( -1, 0, 0, -1, last_x, last_y )
         )
            
     elif rotation == 270:
+        # x, y => y, last_y - x
         return _canvas_transformed( 
             self, 
             xy( self.size.y, self.size.x ), 
-            lambda c: xy( c.y, self.size.y - 1 - c.x ) 
+            ( 0, 1, -1, 0, 0, last_y )
         )    
             
     else:
@@ -0,0 +1,163 @@
+# ===========================================================================
+#
+# file     : gf_canvas_strip_map.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# ===========================================================================
+#
+# This file contains a helper function and class for the canvas class.
+#
+# ===========================================================================
+
+import array
+from micropython import const
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_canvas import *
+
+
+# ===========================================================================
+
+def _canvas_strip_mapped(
+    proxy: canvas
+) -> canvas:
+    """
+    the proxy, collapsed to a strip map when possible
+
+    When all pixels of the proxy canvas map to pixels of the same
+    strip (or to no pixel), a _canvas_strip_map for the strip is
+    returned, otherwise the proxy itself.
+    """
+
+    strip = None
+    index_map = array.array( "H", ( 
+        0 for _ in range( proxy.size.x * proxy.size.y ) ) )
+    n = 0
+    for y in range( proxy.size.y ):
+        for x in range( proxy.size.x ):
+            target = proxy._strip_index( x, y )
+            if target is None:
+                index_map[ n ] = _canvas_strip_map.unmapped
+            else:
+                if strip is None:
+                    strip = target[ 0 ]
+                elif target[ 0 ] is not strip:
+                    return proxy
+                index_map[ n ] = target[ 1 ]
+            n += 1
+
+    if strip is None:
+        return proxy
+    return _canvas_strip_map( strip, proxy.size, index_map )
+
+
+# ===========================================================================
+
+class _canvas_strip_map( canvas ):
+    """
+    helper class that maps a canvas to a strip via a lookup table
+
+    A chain of folded, transformed (swapped, rotated), part
+    and extended canvases over a 1-dimensional strip
+    (like :class:`~godafoss.ws281x`) is collapsed into a single
+    table of strip indexes, stored as an array( 'H' ).
+    A pixel write is then a table lookup and a write to the strip.
+
+    The map_bytes attribute is the RAM used by the table
+    (2 bytes per pixel).
+    """
+
+    # index value of a pixel that is not mapped to the strip
+    unmapped = const( 0xFFFF )
+
+    def __init__(
+        self,
+        strip: canvas,
+        size: xy,
+        index_map: array.array
+    ):
+        self._strip = strip
+        self._map = index_map
+        self.map_bytes = 2 * len( index_map )
+
+        # whether the map covers all pixels of the strip,
+        # so clear() can use the (faster) clear of the strip
+        covered = bytearray( strip.size.x )
+        for index in index_map:
+            if index != self.unmapped:
+                covered[ index ] = 1
+        self._covers_strip = ( sum( covered ) == strip.size.x )
+
+        canvas.__init__(
+            self,
+            size,
+            strip.is_color,
+            strip.background
+        )
+
+    # =======================================================================
+
+    def write_pixel(
+        self,
+        location: xy,
+        ink: color | bool | None = True
+    ) -> None:
+        if ( ink is not None ) and self.within( location ):
+            index = self._map[ location.y * self.size.x + location.x ]
+            if index != self.unmapped:
+                self._dirty = True
+                self._strip._write_index( index, self._cure_ink( ink ) )
+
+    # =======================================================================
+
+    def _write_pixel_implementation(
+        self,
+        location: xy,
+        ink: color | bool
+    ) -> None:
+        index = self._map[ location.y * self.size.x + location.x ]
+        if index != self.unmapped:
+            self._strip._write_index( index, ink )
+
+    # =======================================================================
+
+    def _strip_index(
+        self,
+        x: int,
+        y: int
+    ):
+        index = self._map[ y * self.size.x + x ]
+        if index == self.unmapped:
+            return None
+        return self._strip, index
+
+    # =======================================================================
+
+    def _flush_implementation(
+        self,
+        forced: bool
+    ) -> None:
+        self._strip.flush( forced )
+
+    # =======================================================================
+
+    def _clear_implementation(
+        self,
+        ink: color | bool
+    ) -> None:
+        if self._covers_strip:
+            self._strip.clear( ink )
+        else:
+            for index in self._map:
+                if index != self.unmapped:
+                    self._strip._write_index( index, ink )
+
+    # =======================================================================
+
+# ===========================================================================
@@ -23,11 +23,62 @@ from godafoss.gf_canvas import *
 class _canvas_transformed( canvas ):
     """
     helper class that is a transformed version of the canvas
+
+    The transformation is an integer affine matrix
+    ( a, b, c, d, e, f ):
+    a pixel x, y of this canvas is pixel
+    a * x + b * y + e, c * x + d * y + f of the subject.
+    The matrices used for rotations, swaps and parts
+    map rectangles to rectangles.
+
+    The pixels that are written are clipped to a rectangle
+    (in subject coordinates), which is both the image of this canvas
+    and within the subject.
+
+    When the subject is itself a transformed canvas, the two
+    matrices are composed and the clip rectangles are intersected,
+    so a chain like lcd.rotated( 90 ).part( ... ) is a single
+    transformation of the lcd, and a pixel write is one
+    matrix multiplication and one clip check.
     """
-    
-    def __init__( self, subject, size, transform_location ):
+
+    def __init__(
+        self,
+        subject: canvas,
+        size: xy,
+        matrix
+    ):
+        a, b, c, d, e, f = matrix
+
+        if isinstance( subject, _canvas_transformed ):
+            # subject( own( p ) ): compose the two matrices
+            sa, sb, sc, sd, se, sf = subject._matrix
+            a, b, c, d, e, f = (
+                sa * a + sb * c,   sa * b + sb * d,
+                sc * a + sd * c,   sc * b + sd * d,
+                sa * e + sb * f + se,   sc * e + sd * f + sf
+            )
+            x0, y0, x1, y1 = subject._clip
+            subject = subject._subject
+        else:
+            x0, y0, x1, y1 = 0, 0, subject.size.x - 1, subject.size.y - 1
+
         self._subject = subject
-        self._transform_location = transform_location
+        self._matrix = ( a, b, c, d, e, f )
+        self._a, self._b, self._c, self._d, self._e, self._f = self._matrix
+
+        # clip to the image of this canvas
+        p0x, p0y = self._map( 0, 0 )
+        p1x, p1y = self._map( size.x - 1, size.y - 1 )
+        self._clip = (
+            max( x0, min( p0x, p1x ) ), max( y0, min( p0y, p1y ) ),
+            min( x1, max( p0x, p1x ) ), min( y1, max( p0y, p1y ) ) )
+        self._x0, self._y0, self._x1, self._y1 = self._clip
+
+        # when the subject doesn't override write_pixel(), a pixel
+        # write can go directly to its _write_pixel_implementation()
+        self._direct = ( type( subject ).write_pixel is canvas.write_pixel )
+
         canvas.__init__(
             self,
             size = size,
@@ -35,25 +86,168 @@ class _canvas_transformed( canvas ):
             background = subject.background
         )
 
+    # =======================================================================
+
+    def _map(
+        self,
+        x: int,
+        y: int
+    ):
+        return (
+            self._a * x + self._b * y + self._e,
+            self._c * x + self._d * y + self._f
+        )
+
+    # =======================================================================
+
+    def clip_rectangle( self ):
+
+        # the inverse of a rotation, swap or mirror matrix
+        # is its transpose
+        x0, y0 = self._x0 - self._e, self._y0 - self._f
+        x1, y1 = self._x1 - self._e, self._y1 - self._f
+        p0x, p0y = self._a * x0 + self._c * y0, self._b * x0 + self._d * y0
+        p1x, p1y = self._a * x1 + self._c * y1, self._b * x1 + self._d * y1
+        return (
+            min( p0x, p1x ), min( p0y, p1y ),
+            max( p0x, p1x ), max( p0y, p1y ) )
+
+    # =======================================================================
+
     def write_pixel(
         self,
         location: xy,
-        ink: bool | None = True        
+        ink: color | bool | None = True
+    ) -> None:
+        if ink is None:
+            return
+        x = location.x
+        y = location.y
+        px = self._a * x + self._b * y + self._e
+        py = self._c * x + self._d * y + self._f
+        if ( self._x0 <= px <= self._x1 ) and ( self._y0 <= py <= self._y1 ):
+            subject = self._subject
+            if self._direct:
+                subject._dirty = True
+                subject._write_pixel_implementation(
+                    xy( px, py ),
+                    subject._cure_ink( ink )
+                )
+            else:
+                subject.write_pixel( xy( px, py ), ink )
+
+    # =======================================================================
+
+    def read_pixel(
+        self,
+        location: xy
+    ) -> color | bool | None:
+        px, py = self._map( location.x, location.y )
+        if ( self._x0 <= px <= self._x1 ) and ( self._y0 <= py <= self._y1 ):
+            return self._subject.read_pixel( xy( px, py ) )
+        return None
+
+    # =======================================================================
+
+    def write_blended(
+        self,
+        location: xy,
+        ink: color | bool | None,
+        level: int
+    ) -> None:
+        px, py = self._map( location.x, location.y )
+        if ( self._x0 <= px <= self._x1 ) and ( self._y0 <= py <= self._y1 ):
+            self._subject.write_blended( xy( px, py ), ink, level )
+
+    # =======================================================================
+
+    def write_rect(
+        self,
+        start: xy,
+        size: xy,
+        ink: color | bool | None = True
     ) -> None:
-        p = self._transform_location( location )
-        if self._subject.within( p ):        
-            self._subject.write_pixel( p, ink )      
-       
-    # =======================================================================                                                                             
+        if ( ink is None ) or ( size.x < 1 ) or ( size.y < 1 ):
+            return
+
+        # the image of a rectangle is a rectangle,
+        # for instance a horizontal line can become a vertical one
+        p0x, p0y = self._map( start.x, start.y )
+        p1x, p1y = self._map( start.x + size.x - 1, start.y + size.y - 1 )
+        x0 = max( self._x0, min( p0x, p1x ) )
+        y0 = max( self._y0, min( p0y, p1y ) )
+        x1 = min( self._x1, max( p0x, p1x ) )
+        y1 = min( self._y1, max( p0y, p1y ) )
+        if ( x0 <= x1 ) and ( y0 <= y1 ):
+            self._subject.write_rect(
+                xy( x0, y0 ),
+                xy( x1 - x0 + 1, y1 - y0 + 1 ),
+                ink
+            )
+
+    # =======================================================================
+
+    def _write_bounded(
+        self,
+        thing: "shape",
+        location: xy,
+        ink: color | None,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int
+    ) -> None:
+
+        # the pixel writes go to the subject,
+        # so the rectangle is marked dirty in the subject
+        subject = self._subject
+        dirty = subject._dirty
+        self._write_thing( thing, location, ink )
+        subject._dirty = dirty
+
+        p0x, p0y = self._map( x0, y0 )
+        p1x, p1y = self._map( x1, y1 )
+        subject._mark_dirty(
+            max( self._x0, min( p0x, p1x ) ), 
+            max( self._y0, min( p0y, p1y ) ),
+            min( self._x1, max( p0x, p1x ) ), 
+            min( self._y1, max( p0y, p1y ) ) 
+        )
+
+    # =======================================================================
+
+    def _strip_index(
+        self,
+        x: int,
+        y: int
+    ):
+        px, py = self._map( x, y )
+        if ( self._x0 <= px <= self._x1 ) and ( self._y0 <= py <= self._y1 ):
+            return self._subject._strip_index( px, py )
+        return None
+
+    # =======================================================================
 
     def flush( self, forced: bool = False ) -> None:
         self._subject.flush( forced )
-        
-    # =======================================================================                                                                             
 
-    def clear( self, ink: bool = False ) -> None:
-        self._subject.clear( ink )    
-        
-    # =======================================================================                                                                                                                                                       
+    # =======================================================================
+
+    def clear( self, ink: bool | color = False ) -> None:
+
+        # the subject clear() is often faster, but can be used
+        # only when this canvas covers all of the subject
+        if self._clip == (
+            0, 0, self._subject.size.x - 1, self._subject.size.y - 1
+        ):
+            self._subject.clear( ink )
+        else:
+            self._subject.write_rect(
+                xy( self._x0, self._y0 ),
+                xy( self._x1 - self._x0 + 1, self._y1 - self._y0 + 1 ),
+                ink
+            )
+
+    # =======================================================================
 
 # ===========================================================================
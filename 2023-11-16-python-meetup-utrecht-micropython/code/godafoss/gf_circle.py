@@ -15,7 +15,6 @@
 from godafoss.gf_xy import *
 from godafoss.gf_color import *
 from godafoss.gf_shape import *
-from godafoss.gf_line import *
 
              
 # ===========================================================================
@@ -35,6 +34,9 @@ class circle( shape ):
     Without any offset, a circle has its centre at the origin 
     (xy(0,0), the top-left pixel of the sheet).
     
+    A circle is written as horizontal spans (sheet.write_rect), 
+    each span only once.
+    
     $macro_insert shape
     """    
 
@@ -47,6 +49,13 @@ class circle( shape ):
         self._fill = fill
         shape.__init__( self )
     
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        r = self._radius
+        return offset.x - r, offset.y - r, offset.x + r, offset.y + r
+    
     def write( 
         self, 
         sheet: "sheet",
@@ -62,44 +71,133 @@ class circle( shape ):
         # don't draw anything when the size would be 0 
         if self._radius < 1:
             return
+            
+        _write_rows( 
+            sheet, 
+            offset, 
+            _circle_half_widths( self._radius ), 
+            self._fill, 
+            ink 
+        )
+            
+              
+# ===========================================================================
+
+def _circle_half_widths( 
+    radius: int 
+) -> list:
+    """
+    the half widths of the rows of a circle
+    
+    This function returns a list of radius + 1 values:
+    element dy is the largest x of the circle outline 
+    at row dy (from the centre).
+    """
          
-        # http://en.wikipedia.org/wiki/Midpoint_circle_algorithm
-   
-        fx = 1 - self._radius
-        ddFx = 1
-        ddFy = -2 * self._radius
-        x = 0
-        y = self._radius
-    
-        while x < y + 1:
+    # http://en.wikipedia.org/wiki/Midpoint_circle_algorithm
+    
+    half = [ -1 ] * ( radius + 1 )
+    fx = 1 - radius
+    ddFx = 1
+    ddFy = -2 * radius
+    x = 0
+    y = radius
+    
+    while x < y + 1:
+    
+        # the points of the two octants of the first quadrant
+        if x > half[ y ]:
+            half[ y ] = x
+        if y > half[ x ]:
+            half[ x ] = y
+
+        # calculate next outer circle point
+        if fx >= 0:
+            y -= 1
+            ddFy += 2
+            fx += ddFy
+       
+        x += 1
+        ddFx += 2
+        fx += ddFx     
         
-            self._draw_circle_part( sheet, offset, x,  y, ink )
-            self._draw_circle_part( sheet, offset, x, -y, ink )
-            self._draw_circle_part( sheet, offset, y,  x, ink )
-            self._draw_circle_part( sheet, offset, y, -x, ink )    
+    return half
+    
+    
+# ===========================================================================
 
-            # calculate next outer circle point
-            if fx >= 0:
-                y -= 1
-                ddFy += 2
-                fx += ddFy
-           
-            x += 1
-            ddFx += 2
-            fx += ddFx     
+def _row_runs( 
+    half: list, 
+    dy: int,
+    fill: bool
+):
+    """
+    the x ranges of a row of a symmetric shape
+    
+    :param half: list
+        the half widths of the rows, as returned by 
+        _circle_half_widths()
+    
+    :param dy: int
+        the row, relative to the centre
+        
+    :param fill: bool
+        whether the shape is filled or outline
+    
+    This function returns the first and last x of the
+    part of row dy that is right of the centre: 
+    for a filled shape this is 0 .. half[ dy ],
+    for an outline it is the part that is not covered by the 
+    next (outer) row, but at least one pixel.
+    """
+    
+    last = half[ dy ]
+    if fill:
+        return 0, last
+    outer = half[ dy + 1 ] if dy + 1 < len( half ) else -1
+    return min( outer + 1, last ), last
+    
+    
+# ===========================================================================
 
-    def _draw_circle_part(
-        self,
-        sheet,
-        offset,
-        x,
-        y,
-        ink
-    ):
-        sheet.write_pixel( offset + xy( - x, y ) )    
-        sheet.write_pixel( offset + xy( + x, y ) )    
-        if self._fill:
-            sheet.write( line( 2 * xy( x, 0 ) ), xy( -x,  y ) + offset, ink )
-            
-              
+def _write_rows( 
+    sheet: "sheet", 
+    offset: xy, 
+    half: list, 
+    fill: bool, 
+    ink: bool | color 
+) -> None:
+    """
+    write a shape that is symmetric in its horizontal and vertical axis
+    
+    :param half: list
+        the half widths of the rows, as returned by 
+        _circle_half_widths()
+    
+    Each row is written as one horizontal span
+    (or two for an outline, when the run doesn't cross the centre), 
+    and each span is written only once.
+    Rows outside the clip rectangle of the sheet are skipped.
+    """
+    
+    x0, y0, x1, y1 = sheet.clip_rectangle()
+    cx = offset.x
+    cy = offset.y
+    
+    for dy in range( len( half ) ):
+        if half[ dy ] < 0:
+            continue
+        first, last = _row_runs( half, dy, fill )
+        for y in ( ( cy + dy, cy - dy ) if dy else ( cy, ) ):
+            if y0 <= y <= y1:
+                if first == 0:
+                    sheet.write_rect( 
+                        xy( cx - last, y ), xy( 2 * last + 1, 1 ), ink )
+                else:
+                    sheet.write_rect( 
+                        xy( cx - last, y ), xy( last - first + 1, 1 ), ink )
+                    sheet.write_rect( 
+                        xy( cx + first, y ), xy( last - first + 1, 1 ), ink )
+    
+    
 # ===========================================================================
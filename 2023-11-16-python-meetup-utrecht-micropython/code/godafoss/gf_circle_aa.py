@@ -0,0 +1,128 @@
+# ===========================================================================
+#
+# file     : gf_circle_aa.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the circle_aa class
+#
+# ===========================================================================
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_shape import *
+
+             
+# ===========================================================================
+  
+class circle_aa( shape ):   
+    """
+    anti-aliased circle (outline) shape
+    
+    :param radius: (int)
+        the radius of the circle   
+
+    Without any offset, a circle has its centre at the origin 
+    (xy(0,0), the top-left pixel of the sheet).
+    
+    The circle is drawn with the Wu algorithm: for each step 
+    along an octant the two pixels nearest to the circle are
+    blended with the ink (sheet.write_blended), 
+    proportional to their distance from the circle.
+    The position of the circle is calculated with an integer
+    square root in 4-bit fixed point, so there is no floating 
+    point math.
+    
+    $macro_insert shape
+    """    
+
+    def __init__( 
+        self, 
+        radius: int
+    ):
+        self._radius = radius
+        shape.__init__( self )
+    
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        r = self._radius + 1
+        return offset.x - r, offset.y - r, offset.x + r, offset.y + r
+    
+    def write( 
+        self, 
+        sheet: "sheet",
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
+    ):
+        """
+        write the circle to the sheet
+       
+        $macro_insert shape_write 
+        """
+    
+        # don't draw anything when the size would be 0 
+        if self._radius < 1:
+            return
+            
+        cx = offset.x
+        cy = offset.y
+        r2 = self._radius * self._radius
+        write_blended = sheet.write_blended
+        
+        def write( a, b, level ):
+            # the ( a, b ) point in each of the 8 octants,
+            # each pixel only once
+            for x, y in ( ( a, b ), ( b, a ) ) if a != b else ( ( a, b ), ):
+                for sx in ( -1, 1 ) if x else ( 1, ): 
+                    for sy in ( -1, 1 ) if y else ( 1, ):
+                        write_blended( 
+                            xy( cx + sx * x, cy + sy * y ), ink, level )
+        
+        x = 0
+        y16 = self._radius << 4
+        while True:
+        
+            # y of the circle at x, in 1/16 pixels
+            # (the previous y is a good first guess)
+            y16 = _isqrt( ( r2 - x * x ) << 8, y16 )
+            y = y16 >> 4
+            if x > y:
+                break
+            level = y16 & 0x0F
+            
+            # the pixel inside and the pixel outside the circle
+            write( x, y, 15 - level )
+            if level:
+                write( x, y + 1, level )
+            x += 1
+            
+              
+# ===========================================================================
+
+def _isqrt( 
+    n: int, 
+    guess: int 
+) -> int:
+    """
+    the integer square root (floor) of n
+    
+    The guess must be >= the square root of n.
+    """
+    
+    if n <= 0:
+        return 0
+    x = max( guess, 1 )
+    while True:
+        y = ( x + n // x ) >> 1
+        if y >= x:
+            return x
+        x = y
+            
+              
+# ===========================================================================
@@ -0,0 +1,353 @@
+# ===========================================================================
+#
+# file     : gf_dither.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the dither classes.
+#
+# ===========================================================================
+
+import array
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_canvas import *
+
+
+# ===========================================================================
+
+# 4 x 4 Bayer matrix, as thresholds for 0 .. 255 gray values
+_bayer_thresholds = bytes(
+    16 * m + 8 for m in (
+        0,  8,  2, 10,
+       12,  4, 14,  6,
+        3, 11,  1,  9,
+       15,  7, 13,  5
+    )
+)
+
+
+# ===========================================================================
+
+def _gray(
+    ink: color
+) -> int:
+    """
+    the gray value (0 .. 255) of a color
+    """
+
+    r, g, b = ink.rgb()
+    return ( 77 * r + 150 * g + 29 * b ) >> 8
+
+
+# ===========================================================================
+
+class dither:
+    """
+    gray rows to a monochrome canvas
+
+    :param sheet: (:class:`~godafoss.canvas`)
+        the (monochrome) canvas to which the rows are written
+
+    :param width: (int)
+        the number of pixels in a row
+
+    :param offset: (:class:`~godafoss.xy`, default (0,0) )
+        the location in the sheet of the first pixel of the first row
+
+    :param ink: (bool, :class:`~godafoss.color`, default True)
+        the ink for the pixels that are on
+        (the pixels that are off are written with False)
+
+    A dither is a stage between an image decoder that produces rows
+    of gray values (0 .. 255), like a :class:`~godafoss.ggf`
+    with color pixels, and a monochrome canvas.
+    Each write_row() call writes the next row:
+    the gray values are converted to on/off pixels,
+    and each run of equal pixels is written as one span
+    (write_rect).
+    Rows that are outside the clip rectangle of the sheet
+    are converted (the conversion can have state),
+    but not written.
+
+    The conversion uses only integer arithmetic,
+    and doesn't allocate memory per row.
+
+    This class does a plain threshold (at 128),
+    :class:`~godafoss.dither_bayer` and
+    :class:`~godafoss.dither_floyd_steinberg` do better.
+    """
+
+    def __init__(
+        self,
+        sheet: canvas,
+        width: int,
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
+    ):
+        self._sheet = sheet
+        self._width = width
+        self._offset = offset
+        self._ink = ink
+        self._y = 0
+        self._bits = bytearray( width )
+
+    # =======================================================================
+
+    def write_row(
+        self,
+        row
+    ) -> None:
+        """
+        convert and write the next row
+
+        :param row: (bytes, bytearray, sequence of int)
+            the gray values (0 .. 255) of the pixels of the row
+        """
+
+        self._convert( row, self._bits, self._y )
+        y = self._offset.y + self._y
+        self._y += 1
+
+        x0, y0, x1, y1 = self._sheet.clip_rectangle()
+        if ( y < y0 ) or ( y > y1 ):
+            return
+
+        bits = self._bits
+        width = self._width
+        ox = self._offset.x
+        x = max( 0, x0 - ox )
+        last = min( width, x1 - ox + 1 )
+        while x < last:
+            bit = bits[ x ]
+            start = x
+            x += 1
+            while ( x < last ) and ( bits[ x ] == bit ):
+                x += 1
+            self._sheet.write_rect(
+                xy( ox + start, y ),
+                xy( x - start, 1 ),
+                self._ink if bit else False
+            )
+
+    # =======================================================================
+
+    def _convert(
+        self,
+        row,
+        bits: bytearray,
+        y: int
+    ) -> None:
+        """
+        convert a row of gray values to bits (0 or 1)
+        """
+
+        for x in range( self._width ):
+            bits[ x ] = 1 if row[ x ] >= 128 else 0
+
+    # =======================================================================
+
+# ===========================================================================
+
+class dither_bayer( dither ):
+    """
+    gray rows to a monochrome canvas, with ordered dithering
+
+    :param sheet: (:class:`~godafoss.canvas`)
+        the (monochrome) canvas to which the rows are written
+
+    :param width: (int)
+        the number of pixels in a row
+
+    :param offset: (:class:`~godafoss.xy`, default (0,0) )
+        the location in the sheet of the first pixel of the first row
+
+    :param ink: (bool, :class:`~godafoss.color`, default True)
+        the ink for the pixels that are on
+
+    Each gray value is compared to the threshold in a 4 x 4
+    Bayer matrix, for the position of the pixel.
+    This has no state, so it is fast and the result for
+    a pixel doesn't depend on the other pixels
+    (it is also used by :meth:`~godafoss.canvas.dithered`),
+    but it shows a regular pattern.
+
+    See :class:`~godafoss.dither` for the interface.
+    """
+
+    def _convert(
+        self,
+        row,
+        bits: bytearray,
+        y: int
+    ) -> None:
+        thresholds = _bayer_thresholds
+        base = 4 * ( ( self._offset.y + y ) & 3 )
+        ox = self._offset.x
+        for x in range( self._width ):
+            bits[ x ] = 1 if (
+                row[ x ] > thresholds[ base + ( ( ox + x ) & 3 ) ] ) else 0
+
+    # =======================================================================
+
+# ===========================================================================
+
+class dither_floyd_steinberg( dither ):
+    """
+    gray rows to a monochrome canvas, with error diffusion
+
+    :param sheet: (:class:`~godafoss.canvas`)
+        the (monochrome) canvas to which the rows are written
+
+    :param width: (int)
+        the number of pixels in a row
+
+    :param offset: (:class:`~godafoss.xy`, default (0,0) )
+        the location in the sheet of the first pixel of the first row
+
+    :param ink: (bool, :class:`~godafoss.color`, default True)
+        the ink for the pixels that are on
+
+    The difference between the gray value of a pixel and the
+    value that is written (0 or 255) is distributed over
+    the neighbouring pixels that are not yet written:
+    7/16 to the right, and 3/16, 5/16 and 1/16 to the
+    pixels below left, below and below right.
+    This gives a better image than ordered dithering,
+    but the rows must be written in order.
+
+    The errors for the next row are kept in a single
+    array( 'h' ) of width + 2 values:
+    the error for the next row is stored in the place
+    of the pixel that has just been used.
+
+    See :class:`~godafoss.dither` for the interface.
+    """
+
+    def __init__(
+        self,
+        sheet: canvas,
+        width: int,
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
+    ):
+        dither.__init__( self, sheet, width, offset, ink )
+
+        # the error for pixel x is at errors[ x + 1 ]
+        self._errors = array.array( "h", bytes( 2 * ( width + 2 ) ) )
+
+    # =======================================================================
+
+    def _convert(
+        self,
+        row,
+        bits: bytearray,
+        y: int
+    ) -> None:
+        errors = self._errors
+
+        # the error to the right, and the errors for the next
+        # row of the pixels left (x - 1) and below (x)
+        right = 0
+        below_left = 0
+        below = 0
+
+        for x in range( self._width ):
+            value = row[ x ] + errors[ x + 1 ] + right
+            if value >= 128:
+                bits[ x ] = 1
+                e = value - 255
+            else:
+                bits[ x ] = 0
+                e = value
+
+            right = ( 7 * e ) >> 4
+
+            # the error for x - 1 in the next row is complete,
+            # it is stored in its place, which is no longer used
+            errors[ x ] = below_left + ( ( 3 * e ) >> 4 )
+            below_left = below + ( ( 5 * e ) >> 4 )
+            below = e >> 4
+
+        errors[ self._width ] = below_left
+        errors[ self._width + 1 ] = 0
+
+    # =======================================================================
+
+# ===========================================================================
+
+class _canvas_dithered( canvas ):
+    """
+    helper class that is a color version of a monochrome canvas
+
+    A color pixel is written to the subject as on or off,
+    by comparing its gray value to the threshold in a 4 x 4
+    Bayer matrix, for the position of the pixel.
+    """
+
+    def __init__(
+        self,
+        subject: canvas
+    ):
+        self._subject = subject
+        canvas.__init__(
+            self,
+            size = subject.size,
+            is_color = True,
+            background = colors.white if subject.background else colors.black
+        )
+
+    # =======================================================================
+
+    def _write_pixel_implementation(
+        self,
+        location: xy,
+        ink: color
+    ) -> None:
+        x = location.x
+        y = location.y
+        self._subject.write_pixel( location,
+            _gray( ink ) > _bayer_thresholds[ 4 * ( y & 3 ) + ( x & 3 ) ] )
+
+    # =======================================================================
+
+    def _write_rect_implementation(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        ink: color
+    ) -> None:
+        gray = _gray( ink )
+
+        # below the lowest or above the highest threshold: one rect
+        if ( gray <= 8 ) or ( gray > 248 ):
+            self._subject.write_rect(
+                xy( x, y ), xy( width, height ), gray > 248 )
+            return
+
+        thresholds = _bayer_thresholds
+        write_pixel = self._subject.write_pixel
+        for py in range( y, y + height ):
+            base = 4 * ( py & 3 )
+            for px in range( x, x + width ):
+                write_pixel( xy( px, py ),
+                    gray > thresholds[ base + ( px & 3 ) ] )
+
+    # =======================================================================
+
+    def _flush_implementation(
+        self,
+        forced: bool
+    ) -> None:
+        self._subject.flush( forced )
+
+    # =======================================================================
+
+# ===========================================================================
@@ -89,6 +89,9 @@ class edge:
         # neopixels
         self.neopixel_data = self.p5
         
+        # created on first use by spi_device()
+        self._spi_bus = None
+        
     # =======================================================================
     #
     # utilities
@@ -120,6 +123,33 @@ class edge:
     
     # =======================================================================
 
+    def spi_device( 
+        self,
+        frequency = 10_000_000,
+        polarity = 1,
+        phase = 1,
+        chip_select = None,
+        mechanism: int = 1,        
+    ):
+        """
+        a device handle on the shared spi bus
+        
+        All handles share one :class:`~godafoss.spi_bus`, which
+        is created (with the mechanism of the first call) on first use.
+        The bus is re-initialized only when a handle with 
+        different settings is used.
+        """
+        if self._spi_bus is None:
+            self._spi_bus = self.spi( mechanism = mechanism ).shared()
+        return self._spi_bus.device(
+            baudrate = frequency,
+            polarity = polarity,
+            phase = phase,
+            chip_select = chip_select
+        )
+    
+    # =======================================================================
+
     def _soft_spi( 
         self,
         baudrate = 10_000_000,
@@ -0,0 +1,136 @@
+# ===========================================================================
+#
+# file     : gf_ellipse.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the ellipse class
+#
+# ===========================================================================
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_shape import *
+from godafoss.gf_shape import _span_bounds
+from godafoss.gf_circle import _write_rows
+
+             
+# ===========================================================================
+  
+class ellipse( shape ):   
+    """
+    ellipse shape
+    
+    :param radii: (:class:`~godafoss.xy`)
+        the horizontal and vertical radius of the ellipse   
+        
+    :param fill: (bool)
+        whether the ellipse is outline (False, default) or filled (True)     
+
+    Without any offset, an ellipse has its centre at the origin 
+    (xy(0,0), the top-left pixel of the sheet).
+    
+    Like a :class:`~godafoss.circle`, an ellipse is written
+    as horizontal spans, each span only once.
+    
+    $macro_insert shape
+    """    
+
+    def __init__( 
+        self, 
+        radii: xy, 
+        fill = False
+    ):
+        self._radii = radii
+        self._fill = fill
+        shape.__init__( self )
+    
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        return _span_bounds( offset - self._radii, 2 * self._radii )
+    
+    def write( 
+        self, 
+        sheet: "sheet",
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
+    ):
+        """
+        write the ellipse to the sheet
+       
+        $macro_insert shape_write 
+        """
+    
+        # don't draw anything when the size would be 0 
+        if ( self._radii.x < 1 ) or ( self._radii.y < 1 ):
+            return
+            
+        _write_rows( 
+            sheet, 
+            offset, 
+            _ellipse_half_widths( self._radii.x, self._radii.y ), 
+            self._fill, 
+            ink 
+        )
+            
+              
+# ===========================================================================
+
+def _ellipse_half_widths( 
+    rx: int,
+    ry: int
+) -> list:
+    """
+    the half widths of the rows of an ellipse
+    
+    This function returns a list of ry + 1 values:
+    element dy is the largest x of the ellipse outline 
+    at row dy (from the centre).
+    """
+         
+    # midpoint ellipse algorithm, in integers 
+    # (all decision values are multiplied by 4)
+    
+    half = [ -1 ] * ( ry + 1 )
+    rx2 = rx * rx
+    ry2 = ry * ry
+    x = 0
+    y = ry
+    
+    # region 1: slope > -1, x steps
+    d = 4 * ry2 - 4 * rx2 * ry + rx2
+    while ry2 * x < rx2 * y:
+        half[ y ] = x
+        if d >= 0:
+            y -= 1
+            d -= 8 * rx2 * y
+        x += 1
+        d += 4 * ry2 * ( 2 * x + 1 )
+        
+    # region 2: slope < -1, y steps
+    d = ( ry2 * ( 2 * x + 1 ) * ( 2 * x + 1 ) 
+        + 4 * rx2 * ( y - 1 ) * ( y - 1 ) - 4 * rx2 * ry2 )
+    while y >= 0:
+        if x > half[ y ]:
+            half[ y ] = x
+        if d <= 0:
+            x += 1
+            d += 8 * ry2 * x
+        y -= 1
+        d += 4 * rx2 * ( 1 - 2 * y )
+        
+    # for a flat ellipse region 1 can reach the centre row
+    # before x has reached rx, but the ellipse always 
+    # contains ( rx, 0 ), so the centre row spans -rx .. rx
+    half[ 0 ] = rx
+        
+    return half
+    
+    
+# ===========================================================================
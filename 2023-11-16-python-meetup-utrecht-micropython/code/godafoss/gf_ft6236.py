@@ -16,11 +16,12 @@ from micropython import const
 
 from godafoss.gf_xy import *
 from godafoss.gf_touch import *
+from godafoss.gf_i2c_device import *
 
 
 # ===========================================================================
 
-class ft6236( touch ):
+class ft6236( touch, i2c_device ):
     """
     ft6236 touch screen chip driver
     
@@ -95,23 +96,22 @@ class ft6236( touch ):
             size = size,
             span = 4096
         )
-        self._i2c = i2c
+        i2c_device.__init__( self, i2c, address, buffer_size = 5 )
         self._size = size
-        self._address = address
         
     # =======================================================================        
 
     def touch_adcs( self ):
         
-        status, x_high, x_low, y_high, y_low = \
-            self._i2c.readfrom_mem( self._address, 2, 5 )
+        # status, x_high, x_low, y_high, y_low
+        d = self.read_registers( self.registers.td_status, 5 )
         
-        if ( status & 0x03 ) == 0:
+        if ( d[ 0 ] & 0x03 ) == 0:
             return None, None
         
         else:
-            x = ( ( x_high & 0x0F ) << 8 ) + x_low
-            y = ( ( y_high & 0x0F ) << 8 ) + y_low
+            x = ( ( d[ 1 ] & 0x0F ) << 8 ) + d[ 2 ]
+            y = ( ( d[ 3 ] & 0x0F ) << 8 ) + d[ 4 ]
             return x, y
             
     # =======================================================================        
@@ -0,0 +1,359 @@
+# ===========================================================================
+#
+# file     : gf_gbf.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the gbf and gbf_bytes font classes.
+#
+# ===========================================================================
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_glyph import *
+from godafoss.gf_font import *
+
+
+# ===========================================================================
+
+class _gbf_glyph( glyph ):
+    """
+    glyph of a gbf font
+
+    The pixels are rows of bits, MSB first, each row padded
+    to a full byte.
+    The data can be a bytearray (read from a file) or a
+    memoryview into the bytes of the whole font.
+    """
+
+    def __init__(
+        self,
+        size: xy,
+        data
+    ):
+        glyph.__init__( self, size )
+        self._data = data
+        self._row_bytes = ( size.x + 7 ) // 8
+
+    # =======================================================================
+
+    def read(
+        self,
+        location: xy
+    ) -> bool:
+        x = location.x
+        d = self._data[ location.y * self._row_bytes + ( x >> 3 ) ]
+        return ( ( d << ( x & 7 ) ) & 0x80 ) != 0
+
+    # =======================================================================
+
+    def write(
+        self,
+        sheet: "sheet",
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
+    ) -> None:
+        """
+        write the glyph to the sheet
+
+        $macro_insert shape_write
+
+        Each run of set pixels in a row is written as one span
+        (write_rect).
+        """
+
+        # only the part that is within the sheet
+        x0, y0, x1, y1 = sheet.clip_rectangle()
+        first = max( 0, x0 - offset.x )
+        last = min( self.size.x, x1 - offset.x + 1 )
+        data = self._data
+        row_bytes = self._row_bytes
+        for y in range(
+            max( 0, y0 - offset.y ),
+            min( self.size.y, y1 - offset.y + 1 )
+        ):
+            base = y * row_bytes
+            x = first
+            while x < last:
+                if ( data[ base + ( x >> 3 ) ] << ( x & 7 ) ) & 0x80:
+                    start = x
+                    x += 1
+                    while ( x < last ) and (
+                        ( data[ base + ( x >> 3 ) ] << ( x & 7 ) ) & 0x80
+                    ):
+                        x += 1
+                    sheet.write_rect(
+                        xy( offset.x + start, offset.y + y ),
+                        xy( x - start, 1 ),
+                        ink
+                    )
+                else:
+                    x += 1
+
+    # =======================================================================
+
+# ===========================================================================
+
+def _gbf_blank(
+    size: xy
+) -> _gbf_glyph:
+    """
+    the empty glyph for a character that is not in a gbf font
+    """
+
+    width = size.x or size.y // 2
+    return _gbf_glyph(
+        xy( width, size.y ),
+        bytes( size.y * ( ( width + 7 ) // 8 ) ) )
+
+
+# ===========================================================================
+
+class _gbf_index:
+    """
+    helper class that holds the header and index of a gbf font
+
+    The index entries are sorted by code point,
+    so a glyph is found by a binary search.
+    """
+
+    def __init__(
+        self,
+        header,
+        index,
+        name: str
+    ):
+        if header[ 0 ] != 0xA7:
+            raise ValueError(
+                "font %s first byte %02X, should be 0xA7"
+                % ( name, header[ 0 ] ) )
+        if header[ 1 ] != 0:
+            raise ValueError(
+                "font %s version %d, should be 0"
+                % ( name, header[ 1 ] ) )
+        self.height = header[ 2 ] * 256 + header[ 3 ]
+        self.count = header[ 4 ] * 256 + header[ 5 ]
+        self.width = header[ 6 ] * 256 + header[ 7 ]
+        self.index = index
+
+    # =======================================================================
+
+    def find(
+        self,
+        code: int
+    ):
+        """
+        the ( width, offset ) of the glyph, or None
+        """
+
+        index = self.index
+        low = 0
+        high = self.count - 1
+        while low <= high:
+            middle = ( low + high ) // 2
+            i = 6 * middle
+            c = index[ i ] * 256 + index[ i + 1 ]
+            if c < code:
+                low = middle + 1
+            elif c > code:
+                high = middle - 1
+            else:
+                return index[ i + 2 ], (
+                    ( index[ i + 3 ] << 16 )
+                    + ( index[ i + 4 ] << 8 )
+                    + index[ i + 5 ] )
+        return None
+
+    # =======================================================================
+
+# ===========================================================================
+
+class gbf( font ):
+    """
+    font read from a gbf file
+
+    :param file_name: (str)
+        the file that contains the font in gbf format
+        (the .gbf extension is optional)
+
+    :param cache: (int, default 32)
+        the maximum number of glyphs that are kept in RAM
+
+    A gbf font is read from its file one glyph at a time:
+    when the glyph for a character is used for the first time,
+    it is read from the file (seek() and readinto())
+    and kept in the glyph cache.
+    When the cache is full it is emptied.
+    Only the header and the index are kept in RAM permanently,
+    so a large font (like 48 pixel high digits for a clock)
+    can be used on a target with little RAM.
+    The file is kept open.
+
+    A character that is not in the font is shown as a '?',
+    or as an empty glyph when that is not in the font either.
+
+    The Godafoss Bitmap Font (gbf) format is a very simple
+    uncompressed font format.
+    The gbf.py script (in the make directory) creates gbf files
+    from BDF fonts.
+
+    +-----------+----------------+-----------------------------------+
+    | gbf format                                                     |
+    +-----------+----------------+-----------------------------------+
+    | byte 0    | identification | 0xA7                              |
+    +-----------+----------------+-----------------------------------+
+    | byte 1    | version        | 0                                 |
+    +-----------+----------------+-----------------------------------+
+    | bytes 2-3 | height         | high byte first                   |
+    +-----------+----------------+-----------------------------------+
+    | bytes 4-5 | n glyphs       | high byte first                   |
+    +-----------+----------------+-----------------------------------+
+    | bytes 6-7 | width          | high byte first,                  |
+    |           |                | 0 for a proportional font         |
+    +-----------+----------------+-----------------------------------+
+    | bytes 8.. | index,         | code point: 2 bytes,              |
+    |           | 6 bytes per    | high byte first                   |
+    |           | glyph, sorted  +-----------------------------------+
+    |           | by code point  | width: 1 byte                     |
+    |           |                +-----------------------------------+
+    |           |                | offset of the pixel data          |
+    |           |                | in the file: 3 bytes,             |
+    |           |                | high byte first                   |
+    +-----------+----------------+-----------------------------------+
+    | ..        | pixel data     | per glyph: by row, 1 bit/pixel,   |
+    |           |                | MSB first, each row padded to a   |
+    |           |                | full byte                         |
+    +-----------+----------------+-----------------------------------+
+    """
+
+    def __init__(
+        self,
+        file_name: str,
+        cache: int = 32
+    ):
+        if not file_name.endswith( ".gbf" ):
+            file_name += ".gbf"
+        self._file = open( file_name, "rb" )
+        header = self._file.read( 8 )
+        count = header[ 4 ] * 256 + header[ 5 ]
+        self._index = _gbf_index(
+            header, self._file.read( 6 * count ), file_name )
+        self._cache = {}
+        self._cache_size = cache
+        font.__init__( self, xy( self._index.width, self._index.height ) )
+
+    # =======================================================================
+
+    def read(
+        self,
+        c: chr
+    ) -> glyph:
+        """
+        the :class:`~godafoss.glyph` for the specified character
+
+        :param c: (chr)
+            the char for which the :class:`~godafoss.glyph` is retrieved
+        """
+
+        code = ord( c )
+        try:
+            return self._cache[ code ]
+        except KeyError:
+            pass
+
+        found = self._index.find( code )
+        if found is None:
+            found = self._index.find( ord( "?" ) )
+        if found is None:
+            result = _gbf_blank( self.size )
+        else:
+            width, offset = found
+            data = bytearray( self.size.y * ( ( width + 7 ) // 8 ) )
+            self._file.seek( offset )
+            self._file.readinto( data )
+            result = _gbf_glyph( xy( width, self.size.y ), data )
+
+        if len( self._cache ) >= self._cache_size:
+            self._cache = {}
+        self._cache[ code ] = result
+        return result
+
+    # =======================================================================
+
+    def close( self ) -> None:
+        """
+        close the file
+        """
+
+        self._file.close()
+
+    # =======================================================================
+
+# ===========================================================================
+
+class gbf_bytes( font ):
+    """
+    font read from gbf data in memory
+
+    :param data: (bytes)
+        the font in gbf format (see :class:`~godafoss.gbf`)
+
+    A gbf_bytes font uses the font data where it is:
+    the index is searched in place, and each glyph is a
+    memoryview slice of the data, so the pixels are never copied.
+
+    When the data is a bytes literal in a module that is frozen
+    into the firmware, it stays in flash and costs no RAM at all.
+    The gbf.py script (in the make directory) writes such a module
+    for a BDF font, a gbf file, or a set of icons.
+    So a font that is used often can be fast (no file I/O)
+    and still cost (almost) no RAM: only a small glyph object
+    is created when a character is read.
+
+    .. code-block::
+
+        import font_digits_48
+        digits = gbf_bytes( font_digits_48.data )
+    """
+
+    def __init__(
+        self,
+        data
+    ):
+        self._data = memoryview( data )
+        count = data[ 4 ] * 256 + data[ 5 ]
+        self._index = _gbf_index(
+            data, self._data[ 8 : 8 + 6 * count ], "bytes" )
+        font.__init__( self, xy( self._index.width, self._index.height ) )
+
+    # =======================================================================
+
+    def read(
+        self,
+        c: chr
+    ) -> glyph:
+        """
+        the :class:`~godafoss.glyph` for the specified character
+
+        :param c: (chr)
+            the char for which the :class:`~godafoss.glyph` is retrieved
+        """
+
+        found = self._index.find( ord( c ) )
+        if found is None:
+            found = self._index.find( ord( "?" ) )
+        if found is None:
+            return _gbf_blank( self.size )
+        width, offset = found
+        return _gbf_glyph(
+            xy( width, self.size.y ),
+            self._data[
+                offset : offset + self.size.y * ( ( width + 7 ) // 8 ) ] )
+
+    # =======================================================================
+
+# ===========================================================================
@@ -16,7 +16,9 @@ from godafoss.gf_tools import *
 from godafoss.gf_xy import *
 from godafoss.gf_color import *
 from godafoss.gf_shape import *
+from godafoss.gf_shape import _span_bounds
 from godafoss.gf_canvas import *
+from godafoss.gf_dither import *
 
 
 # ===========================================================================
@@ -64,6 +66,14 @@ class ggf( shape ):
     | bytes 6.. | pixel data     | by row; for B/W the last byte of  |
     |           |                | each row is padded to a full byte |
     +-----------+----------------+-----------------------------------+
+    
+    A monochrome ggf (pixel format 0) writes its set pixels 
+    with the ink of the write() (default True), 
+    and its other pixels with False (the background).
+    When a color ggf (pixel format 1 or 2) is written to a 
+    monochrome canvas, the image is converted with 
+    Floyd-Steinberg dithering (see :meth:`write_dithered`),
+    otherwise its pixels are written with their own colors.
     """
     
     # =======================================================================
@@ -109,11 +119,99 @@ class ggf( shape ):
         
     # =======================================================================        
     
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        return _span_bounds( offset, self.size - xy( 1, 1 ) )
+        
+    # =======================================================================        
+    
+    def write_dithered( 
+        self,         
+        c: canvas, 
+        offset: xy = xy( 0, 0 ),
+        method = dither_floyd_steinberg,
+        ink: bool | color = True
+    ) -> None:
+        """
+        write a color ggf to a monochrome canvas
+        
+        :param c: (:class:`~godafoss.canvas`)
+            the (monochrome) canvas to write to
+            
+        :param offset: (:class:`~godafoss.xy`, default (0,0) )
+            the location of the top-left pixel
+            
+        :param method: (class, default dither_floyd_steinberg)
+            the dither class, for instance 
+            :class:`~godafoss.dither_bayer`
+            
+        :param ink: (bool, :class:`~godafoss.color`, default True)
+            the ink for the pixels that are on
+            
+        The image is read row by row (from RAM or from the file), 
+        each row is converted to gray values (0 .. 255) 
+        and written by the dither.
+        Only one row of gray values is in RAM at a time.
+        """
+        
+        d = method( c, self.size.x, offset, ink )
+        for row in self._gray_rows():
+            d.write_row( row )
+        
+    # =======================================================================        
+    
+    def _gray_rows( self ):
+        """
+        the rows of a color ggf, as gray values
+        
+        The same bytearray is yielded for each row.
+        """
+        
+        row = bytearray( self.size.x )
+        n = 3 if self.depth == 2 else 1
+        cached = hasattr( self, "data" )
+        if cached:
+            i = 0
+        else:
+            f = open( self.file_name, "rb" )
+            f.read( 6 )
+            
+        for y in range( self.size.y ):
+            if cached:
+                d = self.data[ i : i + n * self.size.x ]
+                i += n * self.size.x
+            else:
+                d = f.read( n * self.size.x )
+            for x in range( self.size.x ):
+                if n == 1:
+                    v = d[ x ]
+                    row[ x ] = ( 
+                        77 * ( ( ( v >> 5 ) & 0x07 ) << 5 )
+                        + 150 * ( ( ( v >> 2 ) & 0x07 ) << 5 )
+                        + 29 * ( ( v & 0x03 ) << 6 ) ) >> 8
+                else:
+                    j = 3 * x
+                    row[ x ] = ( 
+                        77 * d[ j ] + 150 * d[ j + 1 ] + 29 * d[ j + 2 ] ) >> 8
+            yield row
+            
+        if not cached:
+            f.close()
+        
+    # =======================================================================        
+    
     def _write_cached( 
         self,         
         c: canvas, 
-        offset: xy = xy( 0, 0 )    
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
     ):        
+        if ( not c.is_color ) and ( self.depth != 0 ):
+            self.write_dithered( c, offset, ink = ink )
+            return
+            
         i = 0
         for y in range( self.size.y ):
             for x in range( self.size.x ):
@@ -122,11 +220,13 @@ class ggf( shape ):
                     if ( x % 8 ) == 0:
                         v = self.data[ i ]
                         i += 1
-                    c.write_pixel( offset + xy( x, y ), v & 0x01 != 0x00 ) 
+                    c.write_pixel( offset + xy( x, y ), 
+                        ink if v & 0x01 != 0x00 else False ) 
                     v = v >> 1   
                 
                 elif self.depth == 1:    
-                    d = f.read( 1 )[ 0 ]
+                    d = self.data[ i ]
+                    i += 1
                     r = (( d >> 5 ) & 0x07 ) << 5
                     g = (( d >> 2 ) & 0x07 ) << 5
                     b = (( d >> 0 ) & 0x03 ) << 6
@@ -146,17 +246,23 @@ class ggf( shape ):
     def _write_from_file( 
         self,         
         c: canvas, 
-        offset: xy = xy( 0, 0 )    
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
     ):        
+        if ( not c.is_color ) and ( self.depth != 0 ):
+            self.write_dithered( c, offset, ink = ink )
+            return
+            
         f = open( self.file_name, "rb" )
-        f.read( 5 )
+        f.read( 6 )
         for y in range( self.size.y ):
             for x in range( self.size.x ):
         
                 if self.depth == 0:
                     if ( x % 8 ) == 0:
                         v = f.read( 1 )[ 0 ]
-                    c.write_pixel( offset + xy( x, y ), v & 0x01 != 0x00 ) 
+                    c.write_pixel( offset + xy( x, y ), 
+                        ink if v & 0x01 != 0x00 else False ) 
                     v = v >> 1                    
                 
                 elif self.depth == 1:    
@@ -15,6 +15,7 @@
 from godafoss.gf_xy import *
 from godafoss.gf_canvas import *
 from godafoss.gf_shape import *
+from godafoss.gf_shape import _span_bounds
 
 
 # ===========================================================================
@@ -53,6 +54,14 @@ class glyph( shape ):
 
     # =======================================================================
 
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        return _span_bounds( offset, self.size - xy( 1, 1 ) )
+
+    # =======================================================================
+
     def write( 
         self, 
         sheet: "sheet", 
@@ -68,8 +77,16 @@ class glyph( shape ):
         :param offset: :class:`~godafoss.xy`
             the location within the sheet where the glyph is written
         """
-        for x in range( self.size.x ): 
-            for y in range( self.size.y ):
+        # only the part that is within the sheet
+        x0, y0, x1, y1 = sheet.clip_rectangle()
+        for x in range( 
+            max( 0, x0 - offset.x ), 
+            min( self.size.x, x1 - offset.x + 1 )
+        ): 
+            for y in range( 
+                max( 0, y0 - offset.y ), 
+                min( self.size.y, y1 - offset.y + 1 ) 
+            ):
                 if self.read( xy( x, y ) ):
                     sheet.write_pixel( offset + xy( x, y ), ink )
 
@@ -16,6 +16,8 @@
 
 import micropython
 import framebuf
+import array
+import struct
 import machine
 import uctypes
 
@@ -26,6 +28,8 @@ from godafoss.gf_report import *
 from godafoss.gf_xy import *
 from godafoss.gf_color import *
 from godafoss.gf_canvas import *
+from godafoss.gf_target_rp2040 import *
+from godafoss.gf_blend import _blend_cache, _decode_565
 
 # ===========================================================================
 
@@ -65,6 +69,40 @@ class hub75( canvas ):
         background color (default: colors.black)
         
         The (default) background color of the display.
+        
+    :param depth: int
+        number of bits per color channel (1 .. 6, default: 4)
+        
+        The number of bit planes used for binary code modulation.
+        Each extra bit halves the refresh rate.
+        
+    :param gamma: float
+        gamma correction (default: 1.0, which is linear)
+        
+        The exponent used to map the (5 or 6 bit) color channel
+        values in the frame buffer to the depth bits per channel
+        that are shown on the panel.
+        
+    :param panel: xy
+        size of a single panel (default: None, which means that
+        the display is a single panel)
+        
+    :param layout: str
+        "rows" (default) or "serpentine"
+        
+        The arrangement of chained panels, see below.
+        
+    :param r1_b2_2, a_e_2, clk_lat_oe_2: int
+        pins of a second HUB75 connector (default: None)
+        
+        When r1_b2_2 is not None, the first half of the chain of
+        panels is driven from the first connector, the second half
+        from the second connector, by a second PIO state machine
+        (and DMA channels).
+        When a_e_2 is None, the a .. e pins of the first connector
+        are used: the two state machines run in lock-step.
+        The clk, lat and oe pins of the first connector are not
+        shared: clk_lat_oe_2 must be specified when r1_b2_2 is.
 
     A HUB75 panel has a two groups of three shift registers.
     Each group of three shift registers drives one row of RGB LEDs, 
@@ -126,6 +164,43 @@ class hub75( canvas ):
     This page describes the
     [binary code modulation](http://www.batsocks.co.uk/readme/art_bcm_1.htm)
     used by the driver to dim the LEDs.
+    
+    The pixels are stored in an RGB565 frame buffer.
+    A flush converts them (via a lookup table per color channel)
+    to depth bit planes in the buffer that is read by the DMA.
+    Only the row pairs that were written to since the previous
+    flush are converted, so the flush time is proportional
+    to the part of the display that was changed.
+    The DMA uses a list of bit plane addresses, in which
+    bit plane k occurs 2^k times, so it is shown 2^k times as long
+    as bit plane 0.
+    The list also contains one all-dark plane, to get a
+    power-of-two list length (which the DMA ring addressing
+    requires).
+    This costs 1 / 2^depth of the maximum brightness.
+    
+    The refresh_rate() method returns the resulting (estimated)
+    refresh rate, the print_timing() method prints a
+    table of depth versus refresh rate.
+    
+    Panels can be chained to form a larger display.
+    The panels are numbered in the order their data is shifted
+    out: panel 0 is at the far end of the chain, the last panel is 
+    the one that is connected to the RP2040.
+    (For a single panel, pixel x = 0 is shifted out first.)
+    With the "rows" layout panel i is at column i % n, 
+    row i // n of the grid of panels (n is the number of panels 
+    in a row), all panels the same side up.
+    With the "serpentine" layout the odd rows of panels run in the 
+    opposite direction, and those panels are mounted upside down.
+    The mapping of the display pixels to the chain(s) is calculated
+    once, when the display is created.
+    
+    The refresh rate is determined by the length of the chain
+    of panels, so driving two half-length chains from two connectors
+    doubles the refresh rate.
+    The DMA channels are allocated with
+    dma_channel_get() from gf_target_rp2040.
     """
 
     # =======================================================================
@@ -137,7 +212,14 @@ class hub75( canvas ):
         a_e: int,
         clk_lat_oe: int,
         frequency: int = 10_000_000,
-        background: color = colors.black
+        background: color = colors.black,
+        depth: int = 4,
+        gamma: float = 1.0,
+        panel: xy = None,
+        layout: str = "rows",
+        r1_b2_2: int = None,
+        a_e_2: int = None,
+        clk_lat_oe_2: int = None
     ):
         canvas.__init__(
             self,
@@ -147,9 +229,16 @@ class hub75( canvas ):
         )
             
         self._frequency = frequency       
-        self._r1_n = r1_b2
-        self._a_n = a_e
-        self._clk_n = clk_lat_oe
+        self._blends = None
+        
+        if not within( depth, 1, 6 ):
+            raise ValueError( "hub75 depth must be 1 .. 6" )
+        if ( r1_b2_2 is None ) != ( clk_lat_oe_2 is None ):
+            raise ValueError( 
+                "hub75 second connector requires both "
+                "r1_b2_2 and clk_lat_oe_2" )
+        self._depth = depth
+        self._luts = _hub75_luts( depth, gamma )
         
         self._framebuffer_buffer = bytearray( 
             2 * self.size.y * self.size.x )
@@ -159,96 +248,169 @@ class hub75( canvas ):
             self.size.y, 
             framebuf.RGB565 
         )
+        
+        self._build( 
+            self.size if panel is None else panel, 
+            layout, 
+            r1_b2_2 is not None 
+        )
+        self.clear()
+        self._start( [ 
+            ( r1_b2, a_e, clk_lat_oe ),
+            ( r1_b2_2, a_e if a_e_2 is None else a_e_2, clk_lat_oe_2 )
+        ] )
+        
+    # =======================================================================    
 
-        # any ongoing DMA must be killed before the pio sm is installed
-        machine.mem32[ 0x50000000 + 0x444 ] = 0x03
-        while machine.mem32[ 0x50000000 + 0x444 ] != 0:
-            pass
+    def _build( 
+        self,
+        panel: xy,
+        layout: str,
+        parallel: bool
+    ) -> None:
+        """
+        build the chain buffers (no hardware access)
+        """
         
-        # the fixed values in the pio buffer must be
-        # allocated and initialized before the pio sm is started
-        # flush_prepare takes care of this
-        self._flush_prepare()
-
-        # the state machine that outputs the word stream to the HUB75 display
-        @rp2.asm_pio(
-            autopull = True,
-            sideset_init = ( [ rp2.PIO.OUT_HIGH ] * 3 ),    
-            out_init = ( [ rp2.PIO.OUT_LOW ] * 6 ),
-            set_init = ( [ rp2.PIO.OUT_HIGH ] * 4 ),    
-            out_shiftdir = rp2.PIO.SHIFT_RIGHT
-        ) 
-        def spi_cpha0():
-            # I don't understadn why the two pull()
-            # instructions are needed
-            
-            # pull count from the data stream and put it on the a-e pins
-            pull()
-            mov( x, osr )
+        if ( self.size.x % panel.x ) or ( self.size.y % panel.y ):
+            raise ValueError( "hub75 size must be a multiple of the panel" )
+        if layout not in ( "rows", "serpentine" ):
+            raise ValueError( "hub75 layout must be rows or serpentine" )
+        self._panel = panel
+        self._rows = panel.y // 2
+        
+        # the grid position of each panel, in chain order,
+        # and whether it is mounted upside down
+        columns = self.size.x // panel.x
+        panels = []
+        for i in range( columns * ( self.size.y // panel.y ) ):
+            row = i // columns
+            if ( layout == "serpentine" ) and ( row % 2 ):
+                panels.append( ( columns - 1 - i % columns, row, True ) )
+            else:
+                panels.append( ( i % columns, row, False ) )
+                
+        if parallel:
+            if len( panels ) % 2:
+                raise ValueError( 
+                    "hub75 two connectors require an even number of panels" )
+            half = len( panels ) // 2
+            self._chains = [ 
+                _hub75_chain( self, panels[ : half ] ),
+                _hub75_chain( self, panels[ half : ] )
+            ]
+        else:
+            self._chains = [ _hub75_chain( self, panels ) ]
             
-            # shift out count 6-bit values to the color pins
-            label( "bitloop" )
-            out( pins, 8 ).side( 0 + 0 + 0 )
-            jmp( x_dec, "bitloop" ).side( 0 + 0 + 1 )
+        # the panel row pair that each display row is part of
+        self._row_map = bytearray( self.size.y )
+        for column, row, upside_down in panels:
+            for y in range( panel.y ):
+                self._row_map[ row * panel.y + y ] = \
+                    ( ( panel.y - 1 - y ) if upside_down else y ) % self._rows
+        
+        # a panel row pair that was written to since the last flush
+        # is marked in _dirty_rows
+        self._dirty_rows = bytearray( self._rows )
+        
+    # =======================================================================    
+
+    def _start( 
+        self,
+        pins: list
+    ) -> None:
+        """
+        start the DMA channels and state machines
+        """
+        
+        channels = []
+        for chain in self._chains:
+            chain.channels = ( dma_channel_get(), dma_channel_get() )
+            if None in chain.channels:
+                raise RuntimeError( "hub75: not enough free DMA channels" )
+            channels += chain.channels
             
-            # display off, latch new data
-            nop().side( 4 + 2 + 0 ) # oe = 1, lat = 0
+        # any ongoing DMA must be killed before the pio sm is installed
+        mask = 0
+        for channel in channels:
+            mask |= 1 << channel
+        machine.mem32[ 0x50000000 + 0x444 ] = mask
+        while machine.mem32[ 0x50000000 + 0x444 ] != 0:
+            pass
             
-            # exec the instruction that 
-            # outputs the row multiplex value to the a-e pins
-            pull()
-            out( exec, 32 )
-                 
-            # the first out in the bit loop will disable
-            # the latch and enable the display
-            # display will be on for the duration of the shifting
-
-        # install and start the state machine
-        sm_id = 0         
-        self._sm = rp2.StateMachine(
-            sm_id,
-            spi_cpha0,
-            2 * self._frequency,
-            set_base=machine.Pin( self._a_n ),
-            out_base=machine.Pin( self._r1_n ),
-            sideset_base=machine.Pin( self._clk_n ),
-        )
-        self._sm.active(1)
-        
-        def dma_poke(
-            channel: int,
-            offset: int,
-            value: int
+        # the state machines are created, the DMA fills their fifos,
+        # and then they are enabled together (so they run in lock-step)
+        enable = 0
+        for sm_id, ( chain, ( r1_b2, a_e, clk_lat_oe ) ) in enumerate( 
+            zip( self._chains, pins ) 
         ):
-            machine.mem32[ 0x50000000 + channel * 0x40 + offset ] = value
-           
-        # 1st DMA channel that transfers the _pio_buffer
-        # to the pio state machine
-        dma_poke( 1, 0x00, uctypes.addressof( self._pio_buffer ) )
-        dma_poke( 1, 0x04, 0x50200010 )
-        dma_poke( 1, 0x08, len( self._pio_buffer ) // 4 )
-        dma_poke( 1, 0x10,
-            ( 0x0 << 15 ) | ( 0 << 11 ) | ( 1 << 4 ) | ( 2 << 2 ) | 1  )
-        
-        # variable that holds the start address of the _pio_buffer
-        self._pio_buffer_start_var = bytearray( 4 )
-        machine.mem32[
-            uctypes.addressof( self._pio_buffer_start_var )
-        ] = uctypes.addressof( self._pio_buffer )
-
-        # 2nd DMA that transfers the start of the _pio_buffer to the
-        # start-and-trigger address of the 1st DMA channel
-        dma_poke( 0, 0x00, uctypes.addressof( self._pio_buffer_start_var ) )
-        dma_poke( 0, 0x04, 0x50000000 + 1 * 0x40 + 0x3C )
-        dma_poke( 0, 0x08, 1 )
-        dma_poke( 0, 0x0C,
-            ( 0x3F << 15 ) | ( 0 << 11 ) | ( 0 << 4 ) | ( 2 << 2 ) | 1 )
+            chain.sm = rp2.StateMachine(
+                sm_id,
+                _hub75_program,
+                2 * self._frequency,
+                set_base = machine.Pin( a_e ),
+                out_base = machine.Pin( r1_b2 ),
+                sideset_base = machine.Pin( clk_lat_oe ),
+            )
+            chain.start_dma( sm_id )
+            enable |= 1 << sm_id
+        
+        # PIO0 CTRL: enable and clock divider restart
+        machine.mem32[ 0x50200000 ] |= enable | ( enable << 8 )
         
     # =======================================================================    
 
     def _encode( self, ink ):
         a, b, c = ink.rgb()
-        return (( a >> 4 ) << 8 ) | (( b >> 4 ) << 4 ) | ( c >> 4 )        
+        return (( a >> 3 ) << 11 ) | (( b >> 2 ) << 5 ) | ( c >> 3 )        
+    
+    # =======================================================================
+
+    def _decode( self, v ):
+        return color( *_decode_565( v ) )
+    
+    # =======================================================================
+
+    def _read_pixel_implementation( 
+        self, 
+        location: xy 
+    ) -> color:
+        return self._decode( 
+            self._framebuffer.pixel( location.x, location.y ) )
+    
+    # =======================================================================
+
+    def _write_blended_implementation( 
+        self, 
+        location: xy,
+        ink: color,
+        level: int
+    ):
+        if self._blends is None:
+            self._blends = _blend_cache( self._encode, self._decode )
+        x = location.x
+        y = location.y
+        self._framebuffer.pixel( x, y, self._blends.table( 
+            ink, self._framebuffer.pixel( x, y ) )[ level ] )
+        self._dirty_rows[ self._row_map[ y ] ] = 1
+    
+    # =======================================================================
+
+    def _frame_buffer( self ):
+        return self._framebuffer, framebuf.RGB565
+    
+    # =======================================================================
+
+    def _mark_dirty( 
+        self, 
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int
+    ) -> None:
+        for y in range( y0, y1 + 1 ):
+            self._dirty_rows[ self._row_map[ y ] ] = 1
+        self._dirty = True
     
     # =======================================================================
 
@@ -257,6 +419,8 @@ class hub75( canvas ):
         ink: color
     ):
         self._framebuffer.fill( self._encode( ink ) )
+        for y in range( self._rows ):
+            self._dirty_rows[ y ] = 1
         
     # =======================================================================
         
@@ -270,75 +434,407 @@ class hub75( canvas ):
             location.y,
             self._encode( ink )
         )
+        self._dirty_rows[ self._row_map[ location.y ] ] = 1
         
+    # =======================================================================
+    
+    def _flush_direct_decode_viper( 
+        self,
+        forced: bool
+    ) -> None:
+        
+        # convert each run of adjacent dirty row pairs
+        dirty = self._dirty_rows
+        y = 0
+        while y < self._rows:
+            if dirty[ y ] or forced:
+                first = y
+                while ( y < self._rows ) and ( dirty[ y ] or forced ):
+                    dirty[ y ] = 0
+                    y += 1
+                for chain in self._chains:
+                    chain.convert( first, y )
+            else:
+                y += 1
+
     # =======================================================================    
 
-    def _flush_prepare( self ) -> None:
+    @report
+    def _flush_implementation(
+        self,
+        forced: bool
+    ) -> None:
+        self._flush_direct_decode_viper( forced )
 
-        self._pio_buffer = \
-            bytearray(  ( self.size.y // 2 ) * ( self.size.x + 8 ) )
-        self.clear()
+    # =======================================================================    
+
+    def refresh_rate( 
+        self,
+        depth: int = None
+    ) -> float:
+        """
+        estimated refresh rate (Hz)
         
-        buffer_pointer = uctypes.addressof( self._pio_buffer )
-        for y in range( self.size.y // 2 ):
-            
-            machine.mem32[ buffer_pointer ] = self.size.x
-            buffer_pointer += 4
-            
-            for x in range( self.size.x ):
-                machine.mem8[ buffer_pointer ] = 0
-                buffer_pointer += 1
-                
-            machine.mem32[ buffer_pointer ] = \
-                rp2.asm_pio_encode( "set(pins,%d)" % y, 0 )
-            buffer_pointer += 4
+        :param depth: int
+            the depth for which the refresh rate is calculated
+            (default: the depth of the display)
+        
+        The refresh rate is the number of times per second 
+        that all bit planes (of all rows) are shown.
+        Each row is shown while the next row is shifted in,
+        which takes ~ ( chain length + 3 ) interface clock cycles.
+        """
+        
+        if depth is None:
+            depth = self._depth
+        return self._frequency / ( 
+            ( 1 << depth ) * self._rows * ( self._chains[ 0 ].length + 3 ) )
+        
+    # =======================================================================    
 
-    # =======================================================================
+    def print_timing( self ) -> None:
+        """
+        print the refresh rate for each depth
+        
+        Refresh rates below ~ 100 Hz are likely to cause
+        visible flicker, especially in peripheral vision
+        or when the display or the eye moves.
+        """
+        
+        print( "hub75 %d x %d, %d connector(s) of %d pixels x %d row pairs"
+            ", %d Hz interface clock" % (
+            self.size.x, self.size.y, len( self._chains ),
+            self._chains[ 0 ].length, self._rows, self._frequency ) )
+        for depth in range( 1, 7 ):
+            rate = self.refresh_rate( depth )
+            print( "%s depth %d: %2d levels, %6.0f Hz refresh%s" % (
+                "*" if depth == self._depth else " ",
+                depth,
+                1 << depth,
+                rate,
+                "  (flicker)" if rate < 100 else ""
+            ) )
+
+    # =======================================================================    
+
+# ===========================================================================
+
+class _hub75_chain:
+    """
+    the buffers and DMA channels for one chain of hub75 panels
     
-    @micropython.native
-    def _flush_direct_decode_viper( self ) -> None:
-        pixel = self._framebuffer.pixel
-        mem8 = machine.mem8
-        size_x = self.size.x
-        size_y = self.size.y
-        
-        @micropython.viper
-        def encode( a: uint, b: uint ) -> uint:
-            d = uint( 0 )
-            if ( a & uint( 0x0F00 ) ): d += uint( 1 )
-            if ( a & uint( 0x00F0 ) ): d += uint( 2 )
-            if ( a & uint( 0x000F ) ): d += uint( 4 )
-                
-            if ( b & uint( 0x0F00 ) ): d += uint( 8 )
-            if ( b & uint( 0x00F0 ) ): d += uint( 16 )
-            if ( b & uint( 0x000F ) ): d += uint( 32 )
-            return d
+    :param display: hub75
+        the display
         
-        buffer_pointer = uctypes.addressof( self._pio_buffer )
-        for y in range( size_y // 2 ):
+    :param panels: list
+        ( grid column, grid row, upside down ) for each panel, 
+        in chain order
+    
+    The constructor only builds the buffers: it uses no hardware
+    and no addresses, so it can be run on a host (the hub75_check.py
+    script in the make directory does that, with fake machine,
+    rp2 and uctypes modules).
+    The addresses of the buffers are used only by start_dma(),
+    which fills the list of bit plane start addresses
+    and starts the DMA channels.
+    
+    The pio buffer contains depth bit planes followed by one 
+    all-dark plane.
+    Each plane contains, for each row pair, the pixel count, the
+    pixel bytes, and the instruction that selects the row pair.
+    
+    The parameters of the converter are, for each panel,
+    the number of pixels in a panel row, the frame buffer index of 
+    the pixel in the first row that is shifted out first, 
+    the index step to the next pixel in a row and to the next row,
+    and the index offset from the upper half pixel to the lower
+    half pixel.
+    """
+    
+    # =======================================================================    
 
-            # value never changes
-            buffer_pointer += 4
+    def __init__( 
+        self,
+        display: hub75,
+        panels: list
+    ):
+        panel = display._panel
+        width = display.size.x
+        rows = display._rows
+        depth = display._depth
+        self._display = display
+        self.length = len( panels ) * panel.x
+        self.row_bytes = self.length + 8
+        self.plane_bytes = rows * self.row_bytes
+        
+        # planes, plane bytes, row bytes, first row, last row + 1, 
+        # number of panels, 5 values per panel
+        parameters = [ depth, self.plane_bytes, self.row_bytes, 
+            0, rows, len( panels ) ]
+        for column, row, upside_down in panels:
+            start = ( row * panel.y ) * width + column * panel.x
+            if upside_down:
+                parameters += [ 
+                    panel.x, 
+                    start + ( panel.y - 1 ) * width + panel.x - 1,
+                    - 1, - width, - rows * width ]
+            else:
+                parameters += [ 
+                    panel.x, start, 1, width, rows * width ]
+        self.parameters = array.array( "i", parameters )
             
-            for x in range( self.size.x ):                   
-                a = pixel( x, y )    
-                b = pixel( x, y + size_y // 2 )
-                
-                mem8[ buffer_pointer ] = encode( a, b )
-                buffer_pointer += 1
+        # each row starts with the pixel count and ends with
+        # the instruction that selects the row,
+        # the pixel bytes are filled in by the converter
+        self.buffer = bytearray( ( depth + 1 ) * self.plane_bytes )
+        for y in range( rows ):
+            select = _hub75_select( y )
+            start = y * self.row_bytes
+            for plane in range( depth + 1 ):
+                struct.pack_into( "<I", self.buffer, start, self.length )
+                struct.pack_into( 
+                    "<I", self.buffer, start + 4 + self.length, select )
+                start += self.plane_bytes
+        
+        # the room for the list of bit plane start addresses, 
+        # which is filled in by start_dma()
+        self.list_bits = depth + 2
+        self._list_buffer = bytearray( 2 << self.list_bits )
+        self.list_address = None
                 
-            # value never changes    
-            buffer_pointer += 4    
+    # =======================================================================    
+    
+    def convert(
+        self,
+        first: int,
+        last: int
+    ) -> None:
+        """
+        convert the row pairs first .. last - 1
+        """
+        
+        self.parameters[ 3 ] = first
+        self.parameters[ 4 ] = last
+        _hub75_convert(
+            self._display._framebuffer_buffer,
+            self.buffer,
+            self._display._luts,
+            self.parameters
+        )
 
     # =======================================================================    
 
-    @report
-    def _flush_implementation(
+    def start_dma( 
         self,
-        forced: bool
+        sm_id: int
     ) -> None:
-        self._flush_direct_decode_viper()
+        """
+        start the DMA that feeds the (PIO0) state machine sm_id
+        """
+        
+        control, data = self.channels
+        
+        # the list of bit plane start addresses, 
+        # aligned for the DMA ring addressing
+        list_bytes = 1 << self.list_bits
+        self.list_address = ( 
+            uctypes.addressof( self._list_buffer ) + list_bytes - 1 
+        ) & ~ ( list_bytes - 1 )
+        offset = self.list_address - uctypes.addressof( self._list_buffer )
+        for i, plane in enumerate( 
+            _hub75_plane_sequence( self._display._depth ) 
+        ):
+            struct.pack_into( "<I", self._list_buffer, offset + 4 * i,
+                uctypes.addressof( self.buffer ) + plane * self.plane_bytes )
+        
+        def dma_poke(
+            channel: int,
+            offset: int,
+            value: int
+        ):
+            machine.mem32[ 0x50000000 + channel * 0x40 + offset ] = value
+           
+        # 1st DMA channel that transfers one bit plane 
+        # of the buffer to the pio state machine
+        dma_poke( data, 0x00, uctypes.addressof( self.buffer ) )
+        dma_poke( data, 0x04, 0x50200010 + 4 * sm_id )
+        dma_poke( data, 0x08, self.plane_bytes // 4 )
+        dma_poke( data, 0x10,
+            ( sm_id << 15 ) | ( control << 11 ) | ( 1 << 4 ) 
+            | ( 2 << 2 ) | 1  )
+        
+        # 2nd DMA that transfers the next bit plane start address 
+        # from the list to the start-and-trigger address 
+        # of the 1st DMA channel
+        dma_poke( control, 0x00, self.list_address )
+        dma_poke( control, 0x04, 0x50000000 + data * 0x40 + 0x3C )
+        dma_poke( control, 0x08, 1 )
+        dma_poke( control, 0x0C,
+            ( 0x3F << 15 ) | ( control << 11 ) | ( self.list_bits << 6 ) 
+            | ( 1 << 4 ) | ( 2 << 2 ) | 1 )
 
     # =======================================================================    
 
-# ===========================================================================
\ No newline at end of file
+# ===========================================================================
+
+# the state machine that outputs the word stream to the HUB75 display
+@rp2.asm_pio(
+    autopull = True,
+    sideset_init = ( [ rp2.PIO.OUT_HIGH ] * 3 ),    
+    out_init = ( [ rp2.PIO.OUT_LOW ] * 6 ),
+    set_init = ( [ rp2.PIO.OUT_HIGH ] * 4 ),    
+    out_shiftdir = rp2.PIO.SHIFT_RIGHT
+) 
+def _hub75_program():
+    # I don't understadn why the two pull()
+    # instructions are needed
+    
+    # pull count from the data stream and put it on the a-e pins
+    pull()
+    mov( x, osr )
+    
+    # shift out count 6-bit values to the color pins
+    label( "bitloop" )
+    out( pins, 8 ).side( 0 + 0 + 0 )
+    jmp( x_dec, "bitloop" ).side( 0 + 0 + 1 )
+    
+    # display off, latch new data
+    nop().side( 4 + 2 + 0 ) # oe = 1, lat = 0
+    
+    # exec the instruction that 
+    # outputs the row multiplex value to the a-e pins
+    pull()
+    out( exec, 32 )
+         
+    # the first out in the bit loop will disable
+    # the latch and enable the display
+    # display will be on for the duration of the shifting
+
+# ===========================================================================
+
+def _hub75_select( y: int ) -> int:
+    """
+    the PIO instruction set( pins, y ), with side-set 0
+    
+    This is what rp2.asm_pio_encode( "set(pins,%d)" % y, 0 ) returns: 
+    0b111 (set) in bits 15..13, 0b000 (pins) in bits 7..5,
+    and y in bits 4..0.
+    It is calculated here, so the buffers can be built 
+    without the rp2 module.
+    """
+    
+    return 0xE000 | y
+
+# ===========================================================================
+
+def _hub75_plane_sequence( depth: int ):
+    """
+    the order in which the bit planes are shown
+    
+    Bit plane k occurs 2^k times, the all-dark plane 
+    (number depth) occurs once, which gives 2^depth entries.
+    Entry i shows plane depth - 1 - (number of trailing zero bits of i), 
+    which spreads the occurrences of each plane evenly over the list.
+    """
+    
+    for i in range( 1 << depth ):
+        if i == 0:
+            yield depth
+        else:
+            plane = depth - 1
+            while ( i & 1 ) == 0:
+                i >>= 1
+                plane -= 1
+            yield plane
+
+# ===========================================================================
+
+def _hub75_luts( 
+    depth: int,
+    gamma: float
+) -> bytearray:
+    """
+    lookup tables from RGB565 channel values to depth-bit values
+    
+    The red table is at 0 (32 entries), the green table at 32
+    (64 entries), the blue table at 96 (32 entries).
+    """
+    
+    levels = ( 1 << depth ) - 1
+    luts = bytearray( 128 )
+    for start, n in ( ( 0, 32 ), ( 32, 64 ), ( 96, 32 ) ):
+        for value in range( n ):
+            luts[ start + value ] = \
+                int( levels * ( value / ( n - 1 ) ) ** gamma + 0.5 )
+    return luts
+
+# ===========================================================================
+
+@micropython.viper
+def _hub75_convert( 
+    source: ptr16, 
+    destination: ptr8, 
+    luts: ptr8,
+    parameters: ptr32
+):
+    """
+    convert RGB565 pixels to hub75 bit planes
+    
+    Each byte in a bit plane has the bits for the r1, g1, b1, 
+    r2, g2, b2 pins, for a pixel in the upper half and a pixel 
+    in the lower half of a panel.
+    The parameters are described in _hub75_chain.
+    """
+    
+    planes = int( parameters[ 0 ] )
+    plane_bytes = int( parameters[ 1 ] )
+    row_bytes = int( parameters[ 2 ] )
+    y = int( parameters[ 3 ] )
+    last = int( parameters[ 4 ] )
+    panels = int( parameters[ 5 ] )
+    
+    while y < last:
+    
+        # skip the count word at the start of each row
+        p = y * row_bytes + 4
+        
+        panel = 0
+        while panel < panels:
+            s = 6 + 5 * panel
+            end = p + int( parameters[ s ] )
+            step = int( parameters[ s + 2 ] )
+            bottom = int( parameters[ s + 4 ] )
+            i = int( parameters[ s + 1 ] ) + y * int( parameters[ s + 3 ] )
+            
+            while p < end:
+                a = int( source[ i ] )
+                b = int( source[ i + bottom ] )
+                r1 = int( luts[ a >> 11 ] )
+                g1 = int( luts[ 32 + ( ( a >> 5 ) & 0x3F ) ] )
+                b1 = int( luts[ 96 + ( a & 0x1F ) ] )
+                r2 = int( luts[ b >> 11 ] )
+                g2 = int( luts[ 32 + ( ( b >> 5 ) & 0x3F ) ] )
+                b2 = int( luts[ 96 + ( b & 0x1F ) ] )
+                
+                q = p
+                k = 0
+                while k < planes:
+                    destination[ q ] = ( 
+                        ( r1 & 1 ) | ( ( g1 & 1 ) << 1 ) 
+                        | ( ( b1 & 1 ) << 2 ) | ( ( r2 & 1 ) << 3 ) 
+                        | ( ( g2 & 1 ) << 4 ) | ( ( b2 & 1 ) << 5 ) )
+                    r1 >>= 1
+                    g1 >>= 1
+                    b1 >>= 1
+                    r2 >>= 1
+                    g2 >>= 1
+                    b2 >>= 1
+                    q += plane_bytes
+                    k += 1
+                    
+                i += step
+                p += 1
+            panel += 1
+        y += 1
+
+# ===========================================================================
@@ -0,0 +1,330 @@
+# ===========================================================================
+#
+# file     : gf_i2c_device.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the i2c_device class.
+#
+# ===========================================================================
+
+import machine
+
+
+# ===========================================================================
+
+class i2c_device:
+    """
+    i2c slave device register and data access
+
+    :param i2c: (machine.I2C, machine.SoftI2C)
+        i2c bus that connects to the chip
+
+    :param address: (int)
+        7-bit i2c slave address of the chip
+
+    :param buffer_size: (int)
+        size of the pre-allocated read buffer (default: 8)
+
+    This class provides the i2c transactions that are common to
+    the i2c chip drivers: write a byte, a word, or a register,
+    read a register or a number of data bytes, and write a
+    prefix (command or control) byte followed by a (large) buffer.
+
+    The frequently used transactions use pre-allocated buffers,
+    so they don't allocate memory.
+    The read_bytes() and read_registers() methods return a memoryview
+    of the pre-allocated read buffer, which is valid only until 
+    the next read.
+    After the first read of a specific length, a read of that length
+    doesn't allocate memory.
+
+    The write_prefixed() method uses a vectored write, so a header byte
+    and a (large) payload are sent in one i2c transaction,
+    without copying the payload.
+    """
+
+    # =======================================================================
+
+    def __init__(
+        self,
+        i2c: "machine.I2C",
+        address: int,
+        buffer_size: int = 8
+    ) -> None:
+        self._i2c = i2c
+        self._i2c_address = address
+        self._i2c_byte = bytearray( 1 )
+        self._i2c_word = bytearray( 2 )
+        self._i2c_prefix = bytearray( 1 )
+        self._i2c_vector = [ self._i2c_prefix, None ]
+        self._i2c_read_buffer = bytearray( buffer_size )
+        self._i2c_read_views = {}
+        self.i2c_frequency = None
+
+    # =======================================================================
+
+    def write_byte(
+        self,
+        value: int
+    ) -> None:
+        """
+        write a single byte to the chip
+        """
+
+        self._i2c_byte[ 0 ] = value
+        self._i2c.writeto( self._i2c_address, self._i2c_byte )
+
+    # =======================================================================
+
+    def write_word(
+        self,
+        value: int,
+        lsb_first: bool = False
+    ) -> None:
+        """
+        write a 16-bit word to the chip
+
+        :param value: (int)
+            the value to be written
+
+        :param lsb_first: (bool)
+            write the least significant byte first (default: False)
+        """
+
+        if lsb_first:
+            self._i2c_word[ 0 ] = value & 0xFF
+            self._i2c_word[ 1 ] = ( value >> 8 ) & 0xFF
+        else:
+            self._i2c_word[ 0 ] = ( value >> 8 ) & 0xFF
+            self._i2c_word[ 1 ] = value & 0xFF
+        self._i2c.writeto( self._i2c_address, self._i2c_word )
+
+    # =======================================================================
+
+    def write_bytes(
+        self,
+        data
+    ) -> None:
+        """
+        write the data (bytes, bytearray, memoryview) to the chip
+        """
+
+        self._i2c.writeto( self._i2c_address, data )
+
+    # =======================================================================
+
+    def write_register(
+        self,
+        register: int,
+        value: int
+    ) -> None:
+        """
+        write a single byte value to a register of the chip
+        """
+
+        self._i2c_byte[ 0 ] = value
+        self._i2c.writeto_mem( self._i2c_address, register, self._i2c_byte )
+
+    # =======================================================================
+
+    def write_registers(
+        self,
+        register: int,
+        data
+    ) -> None:
+        """
+        write the data to consecutive registers of the chip
+        """
+
+        self._i2c.writeto_mem( self._i2c_address, register, data )
+
+    # =======================================================================
+
+    def write_prefixed(
+        self,
+        prefix: int,
+        data
+    ) -> None:
+        """
+        write a prefix byte followed by the data, in one transaction
+
+        :param prefix: (int)
+            the first byte to be written, for instance a control
+            byte or a command
+
+        :param data: (bytes, bytearray, memoryview)
+            the data to be written after the prefix
+
+        This method uses a vectored write, so the data is not copied.
+        """
+
+        self._i2c_prefix[ 0 ] = prefix
+        self._i2c_vector[ 1 ] = data
+        self._i2c.writevto( self._i2c_address, self._i2c_vector )
+        self._i2c_vector[ 1 ] = None
+
+    # =======================================================================
+
+    def read_register(
+        self,
+        register: int
+    ) -> int:
+        """
+        read a single byte value from a register of the chip
+        """
+
+        self._i2c.readfrom_mem_into(
+            self._i2c_address, register, self._i2c_byte )
+        return self._i2c_byte[ 0 ]
+
+    # =======================================================================
+
+    def read_registers(
+        self,
+        register: int,
+        n: int
+    ) -> memoryview:
+        """
+        read n bytes from consecutive registers of the chip
+
+        The result is a view of the read buffer, which is valid
+        until the next read.
+        """
+
+        data = self._i2c_read_view( n )
+        self._i2c.readfrom_mem_into( self._i2c_address, register, data )
+        return data
+
+    # =======================================================================
+
+    def read_bytes(
+        self,
+        n: int
+    ) -> memoryview:
+        """
+        read n bytes from the chip
+
+        The result is a view of the read buffer, which is valid
+        until the next read.
+        """
+
+        data = self._i2c_read_view( n )
+        self._i2c.readfrom_into( self._i2c_address, data )
+        return data
+
+    # =======================================================================
+
+    def probe_frequency(
+        self,
+        new_bus = None,
+        frequencies = (
+            100_000, 400_000, 1_000_000, 1_700_000, 2_500_000, 3_400_000 ),
+        repeats: int = 16
+    ) -> int:
+        """
+        find the highest i2c clock frequency that works for the chip
+
+        :param new_bus: (None, function)
+            function that returns the i2c bus, configured
+            for the frequency that is passed as argument
+
+        :param frequencies: (sequence of int)
+            the frequencies to try, in increasing order
+
+        :param repeats: (int)
+            the number of probe transactions done at each frequency
+            (default: 16)
+
+        This method tries the frequencies in increasing order.
+        At each frequency the probe transaction of the chip is done
+        repeats times.
+        The first frequency at which a probe transaction fails
+        (or a probe read returns a wrong value) ends the search.
+        The bus is then set to the highest frequency that did work,
+        which is also stored as the i2c_frequency attribute
+        and returned.
+        When none of the frequencies works, the bus is set to the
+        lowest one, and None is returned.
+
+        When new_bus is None, the bus is reconfigured by calling
+        its init( freq = f ) method, which is not supported
+        by all I2C implementations (a SoftI2C init() also
+        requires the pins): when that fails a ValueError is raised,
+        and new_bus must be passed.
+        Otherwise the new_bus function is called to create the
+        bus for each frequency, for instance
+        lambda f: machine.I2C( 0, scl = 5, sda = 4, freq = f ).
+
+        The result depends on the pull-ups, the wiring, and the
+        chip, so it should be determined for each hardware setup.
+        Note that a SoftI2C might not reach the requested
+        frequencies at all: in that case the probe only finds
+        the highest frequency the chip accepts.
+        """
+
+        def set_frequency( f ):
+            if new_bus is None:
+                try:
+                    self._i2c.init( freq = f )
+                except ( TypeError, AttributeError ):
+                    raise ValueError(
+                        "this i2c bus can't be re-initialized "
+                        "with only a frequency, pass new_bus" )
+            else:
+                self._i2c = new_bus( f )
+
+        found = None
+        for f in frequencies:
+            set_frequency( f )
+            try:
+                for _ in range( repeats ):
+                    if not self._i2c_probe():
+                        raise OSError
+            except OSError:
+                break
+            found = f
+
+        set_frequency( frequencies[ 0 ] if found is None else found )
+        self.i2c_frequency = found
+        return found
+
+    # =======================================================================
+
+    def _i2c_probe( self ) -> bool:
+        """
+        a harmless transaction, used by probe_frequency()
+
+        This method returns whether the transaction was succesfull.
+        A failed transaction can also raise an OSError.
+        The default probe is an address-only write (like a bus scan),
+        which checks only that the chip ACKs.
+        A concrete chip class can implement a probe that
+        reads a known register value.
+        """
+
+        self._i2c.writeto( self._i2c_address, b'' )
+        return True
+
+    # =======================================================================
+
+    def _i2c_read_view(
+        self,
+        n: int
+    ) -> memoryview:
+        data = self._i2c_read_views.get( n )
+        if data is None:
+            if n > len( self._i2c_read_buffer ):
+                self._i2c_read_buffer = bytearray( n )
+                self._i2c_read_views = {}
+            data = memoryview( self._i2c_read_buffer )[ 0 : n ]
+            self._i2c_read_views[ n ] = data
+        return data
+
+    # =======================================================================
+
+# ===========================================================================
@@ -24,6 +24,7 @@ from godafoss.gf_pins import *
 from godafoss.gf_canvas import *
 from godafoss.gf_lcd_spi import *
 from godafoss.gf_lcd_reset_backlight_power import *
+from godafoss.gf_blend import _blend_cache, _decode_565
 
 @micropython.viper
 def dma_setup(
@@ -166,6 +167,12 @@ class lcd( canvas, lcd_spi, lcd_reset_backlight_power ):
         (default: xy(0,0)).          
     
     This class is a front-end for the drivers for various SPI color LCDs.
+    
+    When the driver for the chip knows the size of the chip RAM,
+    set_orientation() reconfigures the scan direction of the 
+    chip (MADCTL), so a rotated lcd has no per-pixel overhead.
+    Like for any canvas, rotated() and xy_swapped() return a 
+    (software) proxy canvas, and don't change the lcd.
     """
 
     # =======================================================================
@@ -196,6 +203,16 @@ class lcd( canvas, lcd_spi, lcd_reset_backlight_power ):
         self._mirror_y = mirror_y
         self._swap_xy = swap_xy
         self._offset = offset
+        self._x_deadband = x_deadband
+        
+        # for set_orientation()
+        self._initial_orientation = ( 
+            swap_xy, mirror_x, mirror_y, offset, size )
+        self._blends = None
+        
+        # the rectangle that was written by bounded writes (or None),
+        # see _mark_dirty()
+        self._dirty_rectangle = None
         
         canvas.__init__(
             self,
@@ -249,6 +266,7 @@ class lcd( canvas, lcd_spi, lcd_reset_backlight_power ):
             else:
                 raise ValueError( "unsupported color order '%s'" % color_order )   
         
+            self._framebuffer_width = self.size.x + x_deadband
             self._buffer = bytearray( 
                 2 * self.size.y * ( self.size.x + x_deadband ) )
             self._framebuffer = framebuf.FrameBuffer(
@@ -328,6 +346,184 @@ class lcd( canvas, lcd_spi, lcd_reset_backlight_power ):
         
     # =======================================================================
     
+    def _write_madctl( 
+        self, 
+        madctl: int 
+    ) -> None:
+        """
+        write the orientation flags to the MADCTL register of the chip
+        
+        This is called by the chip driver (which provides the 
+        MADCTL command code) during initialization, 
+        and by _reoriented().
+        """
+        
+        m = 0x00
+        if self._swap_xy:
+            m |= 0x20
+        if self._mirror_x:
+            m |= 0x40
+        if self._mirror_y:
+            m |= 0x80
+        self.write_command( madctl, [ m ] )
+        
+    # =======================================================================
+    
+    def set_orientation( 
+        self, 
+        rotation: int = 0,
+        swap: bool = False
+    ) -> None:
+        """
+        set the orientation of the lcd in the chip
+        
+        :param rotation: int
+            the clockwise rotation: 0, 90, 180 or 270
+            
+        :param swap: bool
+            whether x and y are swapped (after the rotation)
+        
+        The lcd itself is reconfigured (the scan direction of 
+        the chip and the logical size are changed), so 
+        rotated drawing has no per-pixel overhead.
+        The orientation is relative to the orientation the lcd was
+        constructed with (not to the current one), so
+        set_orientation( 0 ) restores that orientation.
+        The lcd is then shown as 
+        lcd.rotated( rotation ) (and .xy_swapped() when swap is True)
+        would show it, but unlike those (software) canvases, 
+        this affects all users of the lcd object.
+        Canvases derived from the lcd (like a part()) should be 
+        derived again after the orientation is changed.
+        The current content of the buffer is shown re-oriented,
+        so you will usually clear and redraw.
+        
+        This requires a chip driver that knows the size of the 
+        chip RAM, and no x_deadband.
+        Otherwise a ValueError is raised,
+        and rotated() and xy_swapped() can be used instead.
+        """
+        
+        linear = {
+            0:   (  1,  0,  0,  1 ),
+            90:  (  0, -1,  1,  0 ),
+            180: ( -1,  0,  0, -1 ),
+            270: (  0,  1, -1,  0 ),
+        }.get( rotation, None )
+        if linear is None:
+            raise ValueError( "invalid rotation %d" % rotation )
+            
+        current = ( 
+            self._swap_xy, self._mirror_x, self._mirror_y, 
+            self._offset, self.size )
+        self._swap_xy, self._mirror_x, self._mirror_y, \
+            self._offset, self.size = self._initial_orientation
+        if not (
+            self._reoriented( linear )
+            and ( ( not swap ) or self._reoriented( ( 0, 1, 1, 0 ) ) )
+        ):
+            self._swap_xy, self._mirror_x, self._mirror_y, \
+                self._offset, self.size = current
+            self._reoriented( ( 1, 0, 0, 1 ) )
+            raise ValueError( "this lcd can't be re-oriented by the chip" )
+        
+    # =======================================================================
+    
+    def _reoriented( 
+        self, 
+        linear 
+    ) -> bool:
+        """
+        reconfigure the chip for a transformed orientation
+        
+        :param linear: ( int, int, int, int )
+            the linear part ( a, b, c, d ) of the transformation
+            from the new coordinates to the current coordinates,
+            as used by _canvas_transformed
+        
+        The chip maps logical coordinates to the RAM by first 
+        swapping x and y (MV), then mirroring x (MX) and/or y (MY).
+        The new flags are found by composing that mapping with 
+        the transformation.
+        The offset of the displayed area in the (mirrored) RAM
+        requires the RAM size, which is provided by the driver.
+        
+        This method returns whether the chip could be reconfigured.
+        """
+        
+        ram = getattr( self._driver, "ram_size", None )
+        if ( ram is None ) or ( self._x_deadband != 0 ):
+            return False
+            
+        # a monochrome buffer row is a whole number of bytes
+        if ( not self.is_color ) and ( self.size.y % 8 != 0 ):
+            return False
+            
+        def to_ram( flags, x, y ):
+            swap, mirror_x, mirror_y = flags
+            if swap:
+                x, y = y, x
+            if mirror_x:
+                x = ram.x - 1 - x
+            if mirror_y:
+                y = ram.y - 1 - y
+            return x, y
+            
+        def from_ram( flags, x, y ):
+            swap, mirror_x, mirror_y = flags
+            if mirror_x:
+                x = ram.x - 1 - x
+            if mirror_y:
+                y = ram.y - 1 - y
+            if swap:
+                x, y = y, x
+            return x, y
+            
+        old = ( self._swap_xy, self._mirror_x, self._mirror_y )
+        
+        # the current mapping as a matrix, composed with the new one
+        a, b, c, d = ( 0, 1, 1, 0 ) if self._swap_xy else ( 1, 0, 0, 1 )
+        if self._mirror_x:
+            a, b = - a, - b
+        if self._mirror_y:
+            c, d = - c, - d
+        ta, tb, tc, td = linear
+        a, b, c, d = (
+            a * ta + b * tc,   a * tb + b * td,
+            c * ta + d * tc,   c * tb + d * td )
+        new = ( a == 0, ( a + b ) < 0, ( c + d ) < 0 )
+        
+        # the displayed area in RAM coordinates, then in the new ones
+        x0, y0 = to_ram( old, self._offset.x, self._offset.y )
+        x1, y1 = to_ram( old, 
+            self._offset.x + self.size.x - 1, 
+            self._offset.y + self.size.y - 1 )
+        x0, y0 = from_ram( new, x0, y0 )
+        x1, y1 = from_ram( new, x1, y1 )
+        
+        self._swap_xy, self._mirror_x, self._mirror_y = new
+        self._offset = xy( min( x0, x1 ), min( y0, y1 ) )
+        if new[ 0 ] != old[ 0 ]:
+            self.size = xy( self.size.y, self.size.x )
+        
+        # same buffer, new dimensions
+        self._framebuffer = framebuf.FrameBuffer(
+            self._buffer, 
+            self.size.x, 
+            self.size.y, 
+            framebuf.RGB565 if self.is_color else framebuf.MONO_HLSB 
+        )
+        if self.is_color:
+            self._framebuffer_width = self.size.x
+        if hasattr( self, "_line_buffer" ):
+            self._line_buffer = bytearray( 2 * self.size.x )
+            
+        self._write_madctl( self._driver.cmd.MADCTL )
+        self._dirty = True
+        return True
+        
+    # =======================================================================
+    
     def make_fsm( self ):
         import rp2
         
@@ -361,15 +557,13 @@ class lcd( canvas, lcd_spi, lcd_reset_backlight_power ):
     # =======================================================================
     
     def _flush_data_transport_color( self ):
-        self.write_command( self._driver.cmd.RAMWR, buffer = self._buffer )
+        self.transaction_buffer( self._buffer )
       
     # =======================================================================
     
     @micropython.native      
     def _flush_data_transport_monochrome_lookup( self ):       
-        self.write_command( self._driver.cmd.RAMWR )
         self._data_command.write( 1 )
-        self._chip_select.write( 0 )
         
         _n = const( 8 )
         _m = const( _n * 16 )
@@ -386,23 +580,18 @@ class lcd( canvas, lcd_spi, lcd_reset_backlight_power ):
             if i >= _m:
                 ww( p )
                 i = 0
-                
-        self._chip_select.write( 1 )        
       
     # =======================================================================
     
     #@micropython.native      
     def _flush_data_transport_monochrome_line_buffer( self ):       
-        self.write_command( self._driver.cmd.RAMWR )
         self._data_command.write( 1 )
-        self._chip_select.write( 0 )
         for y in range( self.size.y ):
             for x in range( self.size.x ):
                 c = 0xFF if self._framebuffer.pixel( x, y ) else 0x00
                 self._line_buffer[ 2 * x ] = c                  
                 self._line_buffer[ 2 * x + 1 ] = c                  
             self._spi.write( self._line_buffer )         
-        self._chip_select.write( 0 )
      
     # =======================================================================
     
@@ -450,10 +639,7 @@ class lcd( canvas, lcd_spi, lcd_reset_backlight_power ):
     def _flush_data_transport_monochrome_rp2_pio( self ):
         import ctypes, uctypes
         
-        self.write_command( self._driver.cmd.RAMWR )
-
         self._data_command.write( 1 )
-        self._chip_select.write( 0 )
                 
         self.spi_pio.restore()
 
@@ -467,33 +653,152 @@ class lcd( canvas, lcd_spi, lcd_reset_backlight_power ):
                     
         while self._sm.tx_fifo() != 0:
             pass
-          
 
         self.spi_gpio.restore()       
-
-        self._chip_select.write( 1 )     
       
     # =======================================================================
       
+    def _write_window(
+        self,
+        start: xy,
+        end: xy
+    ) -> None:
+        """
+        start a RAM write to a window
+        
+        :param start: :class:`~godafoss.xy`
+            the top-left pixel of the window
+            
+        :param end: :class:`~godafoss.xy`
+            the bottom-right pixel of the window (inclusive)
+        
+        This method starts a transaction that sets the address window
+        and the RAM write command, all with one activation of the
+        chip select.
+        The caller must write the pixel data and end the transaction.
+        """
+        
+        cmd = self._driver.cmd
+        self.transaction_begin()
+        self.transaction_command( cmd.CASET )
+        self.transaction_word_pair( 
+            start.x + self._offset.x, end.x + self._offset.x )
+        self.transaction_command( cmd.RASET )
+        self.transaction_word_pair( 
+            start.y + self._offset.y, end.y + self._offset.y )
+        self.transaction_command( cmd.RAMWR )
+        
+    # =======================================================================
+      
     @report  
     def _flush_implementation(
         self,
         forced: bool
     ) -> None:     
         
-        x_end = self.size.x - 1 + self._offset.x
-        self.write_command( self._driver.cmd.CASET, [
-            0x00, self._offset.x, 
-            x_end // 256, x_end % 256
-        ])
+        self._write_window( xy( 0, 0 ), self.size - xy( 1, 1 ) )
+        self._flush_data_transport()     
+        self.transaction_end()
         
-        y_end = self.size.y - 1 + self._offset.y
-        self.write_command( self._driver.cmd.RASET, [ 
-            0x00, self._offset.y,
-            y_end // 256, y_end % 256
-        ])
+    # =======================================================================
+    
+    def flush( 
+        self, 
+        forced: bool = False 
+    ) -> None:
+        """
+        $macro_insert canvas_flush
+        
+        When all writes since the previous flush were (bounded) 
+        shape writes, only the rectangle that contains these writes 
+        is flushed (flush_window).
+        """
+        
+        rectangle = self._dirty_rectangle
+        self._dirty_rectangle = None
+        if self._dirty or forced or ( rectangle is None ):
+            canvas.flush( self, forced )
+        else:
+            x0, y0, x1, y1 = rectangle
+            self.flush_window( xy( x0, y0 ), xy( x1 - x0 + 1, y1 - y0 + 1 ) )
         
-        self._flush_data_transport()     
+    # =======================================================================
+    
+    def _mark_dirty( 
+        self, 
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int
+    ) -> None:
+        if not self.is_color:
+            # flush_window() does a full flush
+            self._dirty = True
+        elif self._dirty_rectangle is None:
+            self._dirty_rectangle = ( x0, y0, x1, y1 )
+        else:
+            r = self._dirty_rectangle
+            self._dirty_rectangle = ( 
+                min( r[ 0 ], x0 ), min( r[ 1 ], y0 ), 
+                max( r[ 2 ], x1 ), max( r[ 3 ], y1 ) )
+        
+    # =======================================================================
+    
+    def _frame_buffer( self ):
+        return ( 
+            self._framebuffer, 
+            framebuf.RGB565 if self.is_color else framebuf.MONO_HLSB )
+        
+    # =======================================================================
+    
+    def flush_window(
+        self,
+        start: xy,
+        size: xy
+    ) -> None:
+        """
+        effectuate what was written to a part of the lcd
+        
+        :param start: :class:`~godafoss.xy`
+            the top-left pixel of the part that is flushed
+            
+        :param size: :class:`~godafoss.xy`
+            the size of the part that is flushed
+            
+        This method writes only the indicated part of the
+        lcd RAM, which is faster than a full flush when 
+        only a small part has been changed.
+        The part is clipped to the lcd.
+        In monochrome mode the data must be constructed on the fly,
+        so a full flush is done instead.
+        """
+        
+        if not self.is_color:
+            self.flush( forced = True )
+            return
+        
+        x0 = max( 0, start.x )
+        y0 = max( 0, start.y )
+        x1 = min( self.size.x, start.x + size.x ) - 1
+        y1 = min( self.size.y, start.y + size.y ) - 1
+        if ( x1 < x0 ) or ( y1 < y0 ):
+            return
+            
+        self._write_window( xy( x0, y0 ), xy( x1, y1 ) )
+        
+        # each row is a contiguous part of the buffer
+        stride = 2 * self._framebuffer_width
+        data = memoryview( self._buffer )
+        if ( x0 == 0 ) and ( x1 == self._framebuffer_width - 1 ):
+            self.transaction_buffer( 
+                data[ y0 * stride : ( y1 + 1 ) * stride ] )
+        else:
+            self._data_command.write( 1 )
+            for y in range( y0, y1 + 1 ):
+                self._spi.write( 
+                    data[ y * stride + 2 * x0 : y * stride + 2 * x1 + 2 ] )
+                
+        self.transaction_end()
         
     # =======================================================================
 
@@ -518,4 +823,60 @@ class lcd( canvas, lcd_spi, lcd_reset_backlight_power ):
         
     # =======================================================================
     
+    def _decode( 
+        self, 
+        v: int 
+    ) -> color:
+        """
+        the color of a raw (framebuffer) pixel value
+        """
+        
+        channels = _decode_565( ( ( v & 0xFF ) << 8 ) | ( ( v >> 8 ) & 0xFF ) )
+        order = self._color_order.upper()
+        return color( 
+            channels[ order.index( "R" ) ],
+            channels[ order.index( "G" ) ],
+            channels[ order.index( "B" ) ]
+        )
+        
+    # =======================================================================
+        
+    def _read_pixel_implementation( 
+        self, 
+        location: xy
+    ) -> color | bool:
+        v = self._framebuffer.pixel( location.x, location.y )
+        if self.is_color:
+            return self._decode( v )
+        return v != 0
+        
+    # =======================================================================
+        
+    def _write_blended_implementation( 
+        self, 
+        location: xy,
+        ink: color,
+        level: int
+    ):
+        if self._blends is None:
+            self._blends = _blend_cache( self._encode, self._decode )
+        x = location.x
+        y = location.y
+        self._framebuffer.pixel( x, y, self._blends.table( 
+            ink, self._framebuffer.pixel( x, y ) )[ level ] )
+        
+    # =======================================================================
+        
+    def _write_rect_implementation( 
+        self, 
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        ink: color
+    ):
+        self._framebuffer.fill_rect( x, y, width, height, self._encode( ink ) )
+        
+    # =======================================================================
+    
 # ===========================================================================
@@ -24,6 +24,9 @@ from godafoss.gf_lcd import *
 # ===========================================================================
 
 class lcd_driver_st7735:
+    
+    # size of the chip RAM, required for hardware rotation
+    ram_size = xy( 132, 162 )
 
     # =======================================================================
 
@@ -106,14 +109,7 @@ class lcd_driver_st7735:
 
         master.write_command( self.cmd.COLMOD, [ 0x55 ] ) # 16-bit RGB 565
         
-        m = 0x00
-        if master._swap_xy:
-            m |= 0x20
-        if master._mirror_x:
-            m |= 0x40
-        if master._mirror_y:
-            m |= 0x80
-        master.write_command( self.cmd.MADCTL, [ m ] )       
+        master._write_madctl( self.cmd.MADCTL )       
         
         master.write_command( self.cmd.DISPON )
         sleep_us(100 )
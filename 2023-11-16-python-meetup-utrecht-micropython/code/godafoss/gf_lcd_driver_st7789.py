@@ -25,6 +25,9 @@ from godafoss.gf_lcd import *
 
 class lcd_driver_st7789:
     
+    # size of the chip RAM, required for hardware rotation
+    ram_size = xy( 240, 320 )
+    
     class cmd: # klopt van geen kanten
         NOP        = const( 0x00 )
         SWRESET    = const( 0x01 )
@@ -84,14 +87,7 @@ class lcd_driver_st7789:
         master.write_command(
             self.cmd.INVON if master._invert else self.cmd.INVOFF )  
         
-        m = 0x00
-        if master._swap_xy:
-            m |= 0x20
-        if master._mirror_x:
-            m |= 0x40
-        if master._mirror_y:
-            m |= 0x80
-        master.write_command( self.cmd.MADCTL, [ m ] )          
+        master._write_madctl( self.cmd.MADCTL )          
 
         master.write_command( self.cmd.NORON )
         #time.sleep_ms( 10 )
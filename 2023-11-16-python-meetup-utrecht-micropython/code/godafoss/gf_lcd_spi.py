@@ -34,6 +34,24 @@ class lcd_spi:
     
     This class provides the basic command & data interface
     for a spi LCD with a command / data pin.
+    
+    The write_command method sends a command and / or data
+    as a single transaction (chip select is active for the duration
+    of the call).
+    The transaction_* methods can be used to combine a sequence of
+    commands and data into a single transaction, without 
+    allocating memory for the command and (small) data blocks.
+    This is used for instance to set the address window 
+    before a RAM write::
+    
+        s.transaction_begin()
+        s.transaction_command( CASET )
+        s.transaction_word_pair( x_first, x_last )
+        s.transaction_command( RASET )
+        s.transaction_word_pair( y_first, y_last )
+        s.transaction_command( RAMWR )
+        s.transaction_buffer( buffer )
+        s.transaction_end()
     """
 
     # =======================================================================    
@@ -47,6 +65,10 @@ class lcd_spi:
         self._spi = spi
         self._data_command = make_pin_out( data_command )
         self._chip_select = make_pin_out( chip_select )
+        
+        # pre-allocated, to avoid allocations for each command
+        self._command_byte = bytearray( 1 )
+        self._word_pair = bytearray( 4 )
 
     # =======================================================================    
 
@@ -64,30 +86,134 @@ class lcd_spi:
         
         :param data: (None, sequence of bytes)
             data bytes to be send to the lcd
+            
+        :param buffer: (None, bytes, bytearray, memoryview)
+            data bytes to be send to the lcd (without copying)
         
         This method writes a command (integer, optional)
         and data (also optional) to the lcd.
         The data must be acceptabel for a bytes() call.
         """
         
-        self._chip_select.write( 0 )
+        self.transaction_begin()
 
         if command is not None: 
-            self._data_command.write( 0 )
-            self._spi.write( bytearray( [ command ] ) )
-            #self._chip_select.write( 1 )
+            self.transaction_command( command )
         
         if data is not None:
-            self._data_command.write( 1 )
-            #self._chip_select.write( 0 )
-            self._spi.write( bytes( data ) )
+            self.transaction_data( data )
             
         if buffer is not None:
-            self._data_command.write( 1 )
-            #self._chip_select.write( 0 )
-            self._spi.write( buffer )
+            self.transaction_buffer( buffer )
+            
+        self.transaction_end()
+
+    # =======================================================================    
+
+    def transaction_begin( self ) -> None:
+        """
+        start a transaction
+        
+        This method activates the chip select.
+        It must be followed by transaction_command,
+        transaction_data, transaction_word_pair 
+        and transaction_buffer calls, 
+        and finally by a transaction_end call.
+        """
+        
+        self._chip_select.write( 0 )
+
+    # =======================================================================    
+
+    def transaction_command( 
+        self,
+        command: int
+    ) -> None:
+        """
+        write a command byte within a transaction
+        
+        :param command: (int)
+            the command byte to be send to the lcd
+        """
+        
+        self._data_command.write( 0 )
+        self._command_byte[ 0 ] = command
+        self._spi.write( self._command_byte )
+
+    # =======================================================================    
+
+    def transaction_data( 
+        self,
+        data
+    ) -> None:
+        """
+        write data bytes within a transaction
+        
+        :param data: (sequence of bytes)
+            data bytes to be send to the lcd
             
-        self._chip_select.write( 1 )    
+        The data must be acceptabel for a bytes() call.
+        This allocates a bytes object, so it is meant for
+        initialization commands, not for frequently used paths.
+        """
+        
+        self._data_command.write( 1 )
+        self._spi.write( bytes( data ) )
+
+    # =======================================================================    
+
+    def transaction_word_pair( 
+        self,
+        first: int,
+        second: int
+    ) -> None:
+        """
+        write two 16-bit data words within a transaction
+        
+        :param first: (int)
+            the first word, send most significant byte first
+        
+        :param second: (int)
+            the second word, send most significant byte first
+            
+        This is the format of the (start, end) address
+        parameters of the CASET and RASET commands.
+        """
+        
+        b = self._word_pair
+        b[ 0 ] = first >> 8
+        b[ 1 ] = first & 0xFF
+        b[ 2 ] = second >> 8
+        b[ 3 ] = second & 0xFF
+        self._data_command.write( 1 )
+        self._spi.write( b )
+
+    # =======================================================================    
+
+    def transaction_buffer( 
+        self,
+        buffer
+    ) -> None:
+        """
+        write a buffer within a transaction
+        
+        :param buffer: (bytes, bytearray, memoryview)
+            data bytes to be send to the lcd (without copying)
+        """
+        
+        self._data_command.write( 1 )
+        self._spi.write( buffer )
+
+    # =======================================================================    
+
+    def transaction_end( self ) -> None:
+        """
+        end a transaction
+        
+        This method de-activates the chip select.
+        """
+        
+        self._chip_select.write( 1 )
 
     # =======================================================================    
 
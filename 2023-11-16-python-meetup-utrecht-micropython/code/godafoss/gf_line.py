@@ -14,6 +14,7 @@
 
 from godafoss.gf_xy import *
 from godafoss.gf_shape import *
+from godafoss.gf_shape import _span_bounds
 
 
 # ===========================================================================
@@ -40,6 +41,12 @@ class line( shape ):
         self._span = span
         shape.__init__( self )
 
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        return _span_bounds( offset, self._span )
+    
     def write(
         self,
         s: "sheet",
@@ -52,10 +59,30 @@ class line( shape ):
         $macro_insert shape_write 
         """    
 
+        # horizontal and vertical lines are written as a rectangle,
+        # which the canvas can do faster than pixel-by-pixel
+        if self._span.y == 0:
+            if self._span.x > 0:
+                s.write_rect( offset, xy( self._span.x, 1 ), ink )
+            elif self._span.x < 0:
+                s.write_rect( 
+                    xy( offset.x + self._span.x + 1, offset.y ),
+                    xy( - self._span.x, 1 ), ink )
+            return
+        if self._span.x == 0:
+            if self._span.y > 0:
+                s.write_rect( offset, xy( 1, self._span.y ), ink )
+            else:
+                s.write_rect( 
+                    xy( offset.x, offset.y + self._span.y + 1 ),
+                    xy( 1, - self._span.y ), ink )
+            return
+
         x0 = offset.x
         y0 = offset.y
         x1 = offset.x + self._span.x
         y1 = offset.y + self._span.y
+        cx0, cy0, cx1, cy1 = s.clip_rectangle()
 
         # http://en.wikipedia.org/wiki/Bresenham%27s_line_algorithm
         # http://homepages.enterprise.net/murphy/thickline/index.html
@@ -64,6 +91,8 @@ class line( shape ):
         if steep:
             x0, y0 = y0, x0
             x1, y1 = y1, x1
+            cx0, cy0 = cy0, cx0
+            cx1, cy1 = cy1, cx1
 
         dx = x1 - x0
         dy = y1 - y0
@@ -80,13 +109,58 @@ class line( shape ):
 
         Dx = dx
         Dy = dy
-
+        if Dx == 0:
+            return
+
+        # Pixel k ( 0 <= k < Dx ) is at 
+        #    x = x0 + k * xstep, y = y0 + m( k ) * ystep,
+        # where m( k ) = ceil( ( 2 * Dy * k - Dx ) / ( 2 * Dx ) ) 
+        # is the number of y steps taken before it.
+        # The range of k for which the pixel is within the clip 
+        # rectangle is calculated (both x and m( k ) are monotonic
+        # in k), so only the visible part of the line is iterated.
+        
+        k_first = 0
+        k_last = Dx - 1
+        
+        # clip on x
+        if xstep > 0:
+            k_first = max( k_first, cx0 - x0 )
+            k_last = min( k_last, cx1 - x0 )
+        else:
+            k_first = max( k_first, x0 - cx1 )
+            k_last = min( k_last, x0 - cx0 )
+            
+        # clip on y: the range of m( k ) values that is visible
+        if ystep > 0:
+            m_first, m_last = cy0 - y0, cy1 - y0
+        else:
+            m_first, m_last = y0 - cy1, y0 - cy0
+        if Dy == 0:
+            if ( m_first > 0 ) or ( m_last < 0 ):
+                return
+        else:
+            # m( k ) >= m_first <=> k > ( 2 * Dx * m_first - Dx ) / ( 2 * Dy )
+            k_first = max( k_first, 
+                ( 2 * Dx * m_first - Dx ) // ( 2 * Dy ) + 1 )
+            # m( k ) <= m_last <=> k <= ( 2 * Dx * m_last + Dx ) / ( 2 * Dy )
+            k_last = min( k_last, 
+                ( 2 * Dx * m_last + Dx ) // ( 2 * Dy ) )
+        if k_first > k_last:
+            return
+
+        # the Bresenham state at the first visible pixel
+        m = - ( ( Dx - 2 * Dy * k_first ) // ( 2 * Dx ) )
         TwoDy = 2 * Dy
         TwoDyTwoDx = TwoDy - 2 * Dx  # 2*Dy - 2*Dx
-        E = TwoDy - Dx  # 2*Dy - Dx
-        y = y0
-
-        for x in range( x0, x1, xstep ):
+        E = TwoDy * ( k_first + 1 ) - Dx - 2 * Dx * m  
+        y = y0 + m * ystep
+
+        for x in range( 
+            x0 + k_first * xstep, 
+            x0 + ( k_last + 1 ) * xstep, 
+            xstep 
+        ):
 
             s.write_pixel( nth_from( steep, xy( x, y ), xy( y, x ) ), ink )
 
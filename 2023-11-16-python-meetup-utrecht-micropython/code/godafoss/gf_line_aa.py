@@ -0,0 +1,129 @@
+# ===========================================================================
+#
+# file     : gf_line_aa.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the line_aa class
+#
+# ===========================================================================
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_shape import *
+from godafoss.gf_shape import _span_bounds
+
+             
+# ===========================================================================
+  
+class line_aa( shape ):   
+    """
+    anti-aliased line shape
+    
+    :param span: (:class:`~godafoss.xy`)
+        the size of the line in the x and y direction
+        
+    Like a :class:`~godafoss.line`, an anti-aliased line starts at 
+    the offset and goes up to (but not including) offset + span, 
+    so the segments of a polyline don't overlap.
+    
+    The line is drawn with the Wu algorithm: for each step along
+    the major axis the two pixels nearest to the line 
+    are blended with the ink (sheet.write_blended), 
+    proportional to their distance from the line.
+    The distance is calculated with 16-bit fixed point integers,
+    and quantized to 16 levels, so there is no floating point 
+    math per pixel.
+    On a monochrome sheet, this writes the pixels that are
+    most covered, which is a normal line.
+    
+    $macro_insert shape
+    """    
+
+    def __init__( 
+        self, 
+        span: xy
+    ):
+        self._span = span
+        shape.__init__( self )
+    
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        return _span_bounds( offset, self._span, 1 )
+    
+    def write( 
+        self, 
+        sheet: "sheet",
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
+    ):
+        """
+        write the line to the sheet
+       
+        $macro_insert shape_write 
+        """
+        
+        dx = self._span.x
+        dy = self._span.y
+        steep = abs( dy ) > abs( dx )
+        if steep:
+            # iterate over y, with x as minor axis
+            dx, dy = dy, dx
+            major, minor = offset.y, offset.x
+            major_first, _, major_last, _ = _swapped( sheet.clip_rectangle() )
+        else:
+            major, minor = offset.x, offset.y
+            major_first, _, major_last, _ = sheet.clip_rectangle()
+        if dx == 0:
+            return
+            
+        step = 1 if dx > 0 else -1
+        n = abs( dx )
+        
+        # minor axis position as 16.16 fixed point, 
+        # starting in the middle of the pixel
+        gradient = ( dy << 16 ) // n
+        position = ( minor << 16 ) + 0x8000
+        
+        # the steps that are within the clip rectangle
+        if step > 0:
+            k_first = max( 0, major_first - major )
+            k_last = min( n - 1, major_last - major )
+        else:
+            k_first = max( 0, major - major_last )
+            k_last = min( n - 1, major - major_first )
+        position += k_first * gradient
+        major += k_first * step
+        
+        write_blended = sheet.write_blended
+        for _ in range( k_first, k_last + 1 ):
+        
+            # the pixel above and the pixel below the line
+            p = position - 0x8000
+            low = p >> 16
+            level = ( p >> 12 ) & 0x0F
+            if steep:
+                write_blended( xy( low, major ), ink, 15 - level )
+                write_blended( xy( low + 1, major ), ink, level )
+            else:
+                write_blended( xy( major, low ), ink, 15 - level )
+                write_blended( xy( major, low + 1 ), ink, level )
+                
+            position += gradient
+            major += step
+            
+              
+# ===========================================================================
+
+def _swapped( rectangle ):
+    x0, y0, x1, y1 = rectangle
+    return y0, x0, y1, x1
+    
+              
+# ===========================================================================
@@ -93,6 +93,8 @@ modules += """
 * adc
 * dac
 * spi
++ spi_bus
+* i2c_device
 """
 
 
@@ -134,17 +136,28 @@ modules += """
 modules += """
 * canvas
 = canvas_add
++ canvas_mirror
 = canvas_extended
 = canvas_folded
 = canvas_inverted
-= canvas_part
 = canvas_rotated
+= canvas_strip_map
 = canvas_transformed
+= blend
++ ram_canvas
+= dither
+    dither
+    dither_bayer
+    dither_floyd_steinberg
 
 + canvas_demo_blink
 + canvas_demo_lines
 + canvas_demo_rectangles
 + canvas_demo_circles
++ canvas_benchmark_circles
++ canvas_benchmark_compiled
++ canvas_benchmark_dither
++ canvas_benchmark_fonts
 + canvas_demo_text
 + canvas_demo_scrolling_text
 + canvas_demo_colors
@@ -153,20 +166,34 @@ modules += """
 + canvas_demo
 
 * shape
+= shape_compiled
 * glyph
 
 + font
 = font_default
+= gbf
+    gbf
+    gbf_bytes
 
 + line
++ line_aa
 + rectangle
 + circle
++ circle_aa
++ ellipse
++ arc
++ polygon
++ triangle
 + text
 + ggf
 + image
 
 + moving_text
 + terminal
++ scene
+= sprite
+    sprite
+    sprite_buffer_size
 """
 
 
@@ -283,6 +310,7 @@ modules += """
 + servo
 + sr04
 + tcs3472
++ aht2x
 + sx127x
 """
   
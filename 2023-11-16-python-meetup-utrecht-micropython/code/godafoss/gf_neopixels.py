@@ -31,7 +31,13 @@ class neopixels( canvas ):
         the background color (default: black)
         
     :param order: (str)
-        the color order (default: RGB)    
+        the order in which the chip expects the colors   
+        
+    :param brightness: (float)
+        the global brightness, 0.0 .. 1.0 (default: 1.0)
+        
+    :param gamma: (float)
+        the gamma correction (default: 1.0, which is linear)
         
     $macro_end    
     $macro_insert neopixels
@@ -70,6 +76,13 @@ class neopixels( canvas ):
     | ws2815   | led   | data         | 12V    | data only        |
     +----------+-------+--------------+--------+------------------+
     
+    The pixels are stored in a bytearray, 3 bytes per pixel,
+    in the color order of the chip.
+    The brightness and gamma correction are applied when the 
+    pixels are flushed, by a single pass through a lookup table.
+    They can be changed by set_brightness().
+    Writing and flushing pixels doesn't allocate memory.
+    
     Be aware that a chain of neopixels can draw a significant amount of
     current: at for brightness 60mA per pixel.
     Hence for non-trivial amounts of neopixels a separate power supply 
@@ -81,33 +94,57 @@ class neopixels( canvas ):
     def __init__( 
         self,  
         n: int, 
-        background, 
-        order: str = "RGB"
+        background: color, 
+        order: str,
+        brightness: float = 1.0,
+        gamma: float = 1.0
     ):
         canvas.__init__(
             self,
             size = xy( n, 1 ),
             is_color = True,
-            background = colors.black
+            background = background
         )
         
         order = order.upper()
-        if order == "RGB":
-            self._permutate = lambda ink: ( ink.red, ink.green, ink.blue )
-        elif order == "RBG":
-            self._permutate = lambda ink: ( ink.red, ink.blue, ink.green )
-        elif order == "BGR":
-            self._permutate = lambda ink: ( ink.blue, ink.green, ink.red )
-        elif order == "BRG":
-            self._permutate = lambda ink: ( ink.blue, ink.red, ink.green )
-        elif order == "GRB":
-            self._permutate = lambda ink: ( ink.green, ink.red, ink.blue )
-        elif order == "GBR":
-            self._permutate = lambda ink: ( ink.green, ink.blue, ink.red )
-        else:
-            raise ValueError( "color order '%s'", order )
+        if sorted( order ) != [ "B", "G", "R" ]:
+            raise ValueError( "color order '%s'" % order )
+        self._red = order.index( "R" )
+        self._green = order.index( "G" )
+        self._blue = order.index( "B" )
+        
+        self._pixels = bytearray( 3 * n )
+        self._lut = bytearray( 256 )
+        self.set_brightness( brightness, gamma )
+        
+    # =======================================================================
+    
+    def set_brightness( 
+        self,
+        brightness: float = 1.0,
+        gamma: float = None
+    ) -> None:
+        """
+        set the global brightness and gamma correction
+        
+        :param brightness: (float)
+            the global brightness, 0.0 .. 1.0 (default: 1.0)
+        
+        :param gamma: (None, float)
+            the gamma correction (default: None, 
+            which retains the current value)
+            
+        The new brightness and gamma are used by the next flush.
+        """
+        
+        self.brightness = clamp( brightness, 0.0, 1.0 )
+        if gamma is not None:
+            self.gamma = gamma
+        for value in range( 256 ):
+            self._lut[ value ] = int( 
+                255 * self.brightness * ( value / 255 ) ** self.gamma + 0.5 )
+        self._dirty = True
         
-
     # =======================================================================
     
     def _write_pixel_implementation( 
@@ -115,7 +152,65 @@ class neopixels( canvas ):
         location: ( int, xy ), 
         ink: color
     ):      
-        self._pixels[ location.x ] = self._permutate( ink )
+        n = 3 * location.x
+        self._pixels[ n + self._red ] = ink.red
+        self._pixels[ n + self._green ] = ink.green
+        self._pixels[ n + self._blue ] = ink.blue
+
+    # =======================================================================
+    
+    def _write_index( 
+        self, 
+        index: int, 
+        ink: color
+    ):      
+        """
+        write a pixel, used by a strip map (see gf_canvas_strip_map)
+        """
+        
+        n = 3 * index
+        self._pixels[ n + self._red ] = ink.red
+        self._pixels[ n + self._green ] = ink.green
+        self._pixels[ n + self._blue ] = ink.blue
+        self._dirty = True
+
+    # =======================================================================
+    
+    def _strip_index( 
+        self, 
+        x: int, 
+        y: int 
+    ):      
+        return self, x
+
+    # =======================================================================
+    
+    def _clear_implementation( 
+        self, 
+        ink: color
+    ):      
+        # write the first pixel, then double the written part
+        pixels = memoryview( self._pixels )
+        self._write_pixel_implementation( xy( 0, 0 ), ink )
+        done = 3
+        while done < len( pixels ):
+            n = min( done, len( pixels ) - done )
+            pixels[ done : done + n ] = pixels[ 0 : n ]
+            done += n
+
+    # =======================================================================
+    
+    def fill( 
+        self, 
+        ink: color
+    ):      
+        """
+        write the ink to all pixels
+        
+        This is the same as clear( ink ).
+        """
+        
+        self.clear( ink )
 
     # =======================================================================
     
@@ -132,6 +227,8 @@ class neopixels( canvas ):
         dim: int = 30,
         blackout: bool = True
     ):
+        brightness = self.brightness
+        self.set_brightness( brightness / dim )
         for _ in repeater( iterations ):
             self.clear()
             for c in ( color_list ):
@@ -140,7 +237,7 @@ class neopixels( canvas ):
                     sleep_us( delay )
                     self.write_pixel(
                         xy( n, 0 ),
-                        c // dim
+                        c
                     )  
                 if blackout:
                  for n in range( self.size.x + 1 ):
@@ -150,13 +247,24 @@ class neopixels( canvas ):
                         xy( n, 0 ),
                         colors.black
                     ) 
+        self.set_brightness( brightness )
     
 # ===========================================================================
 
    
 class ws281x( neopixels ):
     """
-    requires neopixel support in the target, Teensy 4.1 by default doesn't
+    ws2811, ws2812, ws2813, ws2815 neopixels
+    
+    :param pin: (int)
+        the pin that connects to the data input of the first pixel
+    
+    $macro_insert neopixels
+    
+    The default order (GRB) is the order of the ws2812.
+    
+    This driver requires neopixel support in the target, 
+    Teensy 4.1 by default doesn't.
     """
 
     def __init__( 
@@ -164,19 +272,113 @@ class ws281x( neopixels ):
         pin: int, 
         n: int, 
         background = colors.black, 
-        order: str = "RGB"
+        order: str = "GRB",
+        brightness: float = 1.0,
+        gamma: float = 1.0
     ):
         import neopixel, machine
-        self._pixels = neopixel.NeoPixel(
+        self._neopixel = neopixel.NeoPixel(
             machine.Pin( pin, machine.Pin.OUT ), n )
         
-        neopixels.__init__( self, n, background, order )
+        neopixels.__init__( 
+            self, n, background, order, brightness, gamma )
+
+    # =======================================================================
+
+    def _flush_implementation( self, forced ):
+        
+        # the lookup is written directly into the buffer of the 
+        # NeoPixel object, which is already in the chip order
+        _neopixels_lookup( 
+            self._pixels, self._neopixel.buf, self._lut, len( self._pixels ) )
+        self._neopixel.write()    
+
+    # =======================================================================
+    
+# ===========================================================================
+
+   
+class apa102( neopixels ):
+    """
+    apa102 (and hd107) neopixels
+    
+    :param spi: (machine.SPI, machine.SoftSPI, :class:`~godafoss.spi`)
+        the SPI bus that connects to the data and clock inputs
+        of the first pixel
+    
+    $macro_insert neopixels
+    
+    The default order (BGR) is the order of the apa102.
+    The 5-bit per-pixel brightness of the apa102 is set to the maximum:
+    the brightness is applied to the color values.
+    """
+
+    def __init__( 
+        self, 
+        spi, 
+        n: int, 
+        background = colors.black, 
+        order: str = "BGR",
+        brightness: float = 1.0,
+        gamma: float = 1.0
+    ):
+        self._spi = spi
+        
+        # start frame (4 x 0x00), 4 bytes per pixel (0xFF + 3 colors), 
+        # end frame: at least n / 2 clock pulses
+        self._frame = bytearray( 
+            b'\x00' * 4 + b'\xFF' * ( 4 * n + ( n + 15 ) // 16 ) )
+        
+        neopixels.__init__( 
+            self, n, background, order, brightness, gamma )
 
     # =======================================================================
 
     def _flush_implementation( self, forced ):
-        self._pixels.write()    
+        _apa102_lookup( 
+            self._pixels, self._frame, self._lut, self.size.x )
+        self._spi.write( self._frame )    
 
     # =======================================================================
     
 # ===========================================================================
+
+@micropython.viper
+def _neopixels_lookup( 
+    source: ptr8, 
+    destination: ptr8, 
+    lut: ptr8, 
+    n: int 
+):
+    """
+    destination[ i ] = lut[ source[ i ] ] for the first n bytes
+    """
+    
+    i = 0
+    while i < n:
+        destination[ i ] = lut[ source[ i ] ]
+        i += 1
+    
+# ===========================================================================
+
+@micropython.viper
+def _apa102_lookup( 
+    source: ptr8, 
+    destination: ptr8, 
+    lut: ptr8, 
+    n: int 
+):
+    """
+    lookup the colors of the n pixels into the apa102 frame
+    """
+    
+    i = 0
+    d = 5
+    while i < 3 * n:
+        destination[ d ] = lut[ source[ i ] ]
+        destination[ d + 1 ] = lut[ source[ i + 1 ] ]
+        destination[ d + 2 ] = lut[ source[ i + 2 ] ]
+        i += 3
+        d += 4
+    
+# ===========================================================================
@@ -16,11 +16,12 @@ from machine import I2C
 from godafoss.gf_tools import *
 from godafoss.gf_ports import *
 from godafoss.gf_port_buffers import *
+from godafoss.gf_i2c_device import *
 
 
 # ===========================================================================
 
-class pcf8574x( port_out_buffer ):
+class pcf8574x( port_out_buffer, i2c_device ):
     """
     pcf8574 / pcf8574a I2C I/O extender
     
@@ -59,12 +60,11 @@ class pcf8574x( port_out_buffer ):
         The address must be the 7-bit I2C address.
         """
         port_out_buffer.__init__( self, 8 )
-        self._bus = bus
-        self._address = address
+        i2c_device.__init__( self, bus, address, buffer_size = 1 )
 
     def flush( self ):
         "write buffer to chip"
-        self._bus.writeto( self._address, self._buffer )
+        self.write_byte( self._value & 0xFF )
 
 # ===========================================================================
 
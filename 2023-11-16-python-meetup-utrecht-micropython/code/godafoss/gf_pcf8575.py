@@ -14,11 +14,12 @@
 
 from godafoss.gf_tools import *
 from godafoss.gf_port_buffers import *
+from godafoss.gf_i2c_device import *
 
 
 # ===========================================================================
 
-class pcf8575( port_oc_buffer ):
+class pcf8575( port_oc_buffer, i2c_device ):
     """
     pcf8575 I2C I/O extender
     
@@ -61,14 +62,20 @@ class pcf8575( port_oc_buffer ):
     # =======================================================================    
 
     def __init__( self, bus, address = 0x20 ):
-        self._bus = bus
-        self._address = address
+        i2c_device.__init__( self, bus, address, buffer_size = 2 )
         port_oc_buffer.__init__( self, 16 )
 
     # =======================================================================    
 
     def flush( self ):
         "write buffer to chip"
-        self._bus.writeto( self._address, bytes_from_int( self._value, 2 ) )
+        self.write_word( self._value, lsb_first = True )
+
+    # =======================================================================    
+
+    def refresh( self ):
+        "read the pin levels from the chip"
+        data = self.read_bytes( 2 )
+        self._value = data[ 0 ] | ( data[ 1 ] << 8 )
 
 # ===========================================================================   
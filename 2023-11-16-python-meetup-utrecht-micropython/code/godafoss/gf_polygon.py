@@ -0,0 +1,187 @@
+# ===========================================================================
+#
+# file     : gf_polygon.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the polygon class
+#
+# ===========================================================================
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_shape import *
+from godafoss.gf_line import *
+
+             
+# ===========================================================================
+  
+class polygon( shape ):   
+    """
+    polygon shape
+    
+    :param points: (sequence of :class:`~godafoss.xy`)
+        the corners of the polygon
+        
+    :param fill: (bool)
+        whether the polygon is outline (False, default) or filled (True)     
+
+    The polygon is closed: the last point is connected to the first.
+    
+    The points are on the grid lines between the pixels 
+    (like the span of a :class:`~godafoss.rectangle`):
+    when filled, a pixel is written when its centre is inside 
+    the polygon (even-odd rule), so a polygon with corners 
+    (0,0), (w,0), (w,h) and (0,h) writes the same w x h pixels 
+    as a filled rectangle( xy( w, h ) ).
+    The outline is written as a :class:`~godafoss.line` 
+    from each point to the next.
+    
+    A filled polygon is written with a scanline algorithm:
+    the edge table is made when the polygon is constructed, 
+    and each scanline is written as horizontal spans 
+    (sheet.write_rect), using only integer arithmetic
+    and without allocating memory per scanline.
+    Scanlines outside the clip rectangle of the sheet are skipped.
+    
+    $macro_insert shape
+    """    
+
+    def __init__( 
+        self, 
+        points, 
+        fill = False
+    ):
+        self._points = tuple( points )
+        self._fill = fill
+        shape.__init__( self )
+        
+        xs = [ p.x for p in self._points ] or [ 0 ]
+        ys = [ p.y for p in self._points ] or [ 0 ]
+        self._bounds = ( min( xs ), min( ys ), max( xs ), max( ys ) )
+        
+        # The edge table, sorted on the first scanline of each edge.
+        # For scanline y (sampled at y + 0.5) the x of an edge is
+        #    x0 + ( y + 0.5 - y0 ) * dx / dy 
+        #       = ( 2 * x0 * dy + ( 2 * ( y - y0 ) + 1 ) * dx ) / ( 2 * dy )
+        # The numerator is kept as an integer that is 
+        # incremented by 2 * dx for each scanline.
+        # Horizontal edges are not in the table.
+        edges = []
+        n = len( self._points )
+        for i in range( n ):
+            a = self._points[ i ]
+            b = self._points[ ( i + 1 ) % n ]
+            if a.y == b.y:
+                continue
+            if a.y > b.y:
+                a, b = b, a
+            dx = b.x - a.x
+            dy = b.y - a.y
+            edges.append( ( 
+                a.y, b.y, 2 * a.x * dy + dx, 2 * dx, 2 * dy ) )
+        edges.sort()
+        self._first = [ e[ 0 ] for e in edges ]
+        self._last = [ e[ 1 ] for e in edges ]
+        self._start = [ e[ 2 ] for e in edges ]
+        self._step = [ e[ 3 ] for e in edges ]
+        self._divisor = [ e[ 4 ] for e in edges ]
+        
+        # pre-allocated work lists for write()
+        self._numerator = [ 0 ] * len( edges )
+        self._active = [ 0 ] * len( edges )
+        self._x = [ 0 ] * len( edges )
+    
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        x0, y0, x1, y1 = self._bounds
+        return offset.x + x0, offset.y + y0, offset.x + x1, offset.y + y1
+    
+    def write( 
+        self, 
+        sheet: "sheet",
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
+    ):
+        """
+        write the polygon to the sheet
+       
+        $macro_insert shape_write 
+        """
+        
+        if not self._fill:
+            n = len( self._points )
+            for i in range( n ):
+                a = self._points[ i ]
+                b = self._points[ ( i + 1 ) % n ]
+                line( b - a ).write( sheet, offset + a, ink )
+            return
+            
+        n_edges = len( self._first )
+        if n_edges == 0:
+            return
+            
+        first = self._first
+        last = self._last
+        start = self._start
+        step = self._step
+        divisor = self._divisor
+        numerator = self._numerator
+        active = self._active
+        xs = self._x
+        
+        # only the scanlines within the clip rectangle
+        x0, y0, x1, y1 = sheet.clip_rectangle()
+        y_first = max( first[ 0 ], y0 - offset.y )
+        y_last = min( max( last ), y1 - offset.y + 1 )
+        
+        n_active = 0
+        next_edge = 0
+        for y in range( y_first, y_last ):
+        
+            # add the edges that start at (or before) this scanline
+            while ( next_edge < n_edges ) and ( first[ next_edge ] <= y ):
+                if last[ next_edge ] > y:
+                    active[ n_active ] = next_edge
+                    numerator[ next_edge ] = ( start[ next_edge ] 
+                        + ( y - first[ next_edge ] ) * step[ next_edge ] )
+                    n_active += 1
+                next_edge += 1
+                
+            # remove the edges that have ended, calculate the first
+            # pixel right of each edge, and sort these (insertion sort,
+            # the number of active edges is small)
+            k = 0
+            for i in range( n_active ):
+                e = active[ i ]
+                if last[ e ] > y:
+                    active[ k ] = e
+                    d = divisor[ e ]
+                    # ceil( x - 0.5 ) = ceil( ( n - d / 2 ) / d )
+                    x = - ( ( ( d >> 1 ) - numerator[ e ] ) // d )
+                    j = k
+                    while ( j > 0 ) and ( xs[ j - 1 ] > x ):
+                        xs[ j ] = xs[ j - 1 ]
+                        j -= 1
+                    xs[ j ] = x
+                    numerator[ e ] += step[ e ]
+                    k += 1
+            n_active = k
+            
+            # write the spans between pairs of edges
+            for i in range( 0, n_active - 1, 2 ):
+                if xs[ i + 1 ] > xs[ i ]:
+                    sheet.write_rect( 
+                        xy( offset.x + xs[ i ], offset.y + y ), 
+                        xy( xs[ i + 1 ] - xs[ i ], 1 ), 
+                        ink 
+                    )
+            
+              
+# ===========================================================================
@@ -0,0 +1,342 @@
+# ===========================================================================
+#
+# file     : gf_ram_canvas.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the ram_canvas class.
+#
+# ===========================================================================
+
+import framebuf
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_canvas import *
+from godafoss.gf_canvas import _frame_buffer_bytes
+from godafoss.gf_shape import *
+from godafoss.gf_blend import _blend_cache, _decode_565
+
+
+# ===========================================================================
+
+class ram_canvas( canvas ):
+    """
+    canvas in RAM, that can be written to other canvases
+
+    :param size: (:class:`~godafoss.xy`)
+        the size of the canvas in pixels
+
+    :param format: (int, default framebuf.RGB565)
+        the framebuf format of the pixels:
+        framebuf.RGB565 or framebuf.GS4_HMSB (color),
+        or framebuf.MONO_HLSB, framebuf.MONO_HMSB or
+        framebuf.MONO_VLSB (monochrome)
+
+    :param like: (:class:`~godafoss.canvas`, None)
+        when not None, a canvas of which the format and the
+        pixel encoding are used (instead of the format parameter)
+
+    :param background: (:class:`~godafoss.color`, bool, None)
+        the background, None for black (color) or False (monochrome)
+
+    A ram_canvas holds its pixels in a framebuf.FrameBuffer.
+    It can be used anywhere a :class:`~godafoss.canvas` is used,
+    for instance to compose a widget once.
+    The as_shape() method returns a :class:`~godafoss.shape`
+    that writes the pixels of the ram_canvas,
+    and blit( c, location ) writes the ram_canvas to canvas c.
+
+    When the canvas it is written to is backed by a framebuf
+    with the same format and pixel encoding
+    (like an :class:`~godafoss.lcd`, when the ram_canvas was
+    created with like = that lcd), the write is a single
+    FrameBuffer.blit().
+    Otherwise the pixels are converted row by row, and each run
+    of equal pixels is written as a span (write_rect).
+
+    The pixels of a color ram_canvas are all written.
+    On a monochrome canvas they are converted to gray values,
+    which are dithered (see :class:`~godafoss.dither_bayer`).
+    For a monochrome ram_canvas, the pixels that are set are
+    written with the ink, the other pixels are not written.
+    For a GS4 ram_canvas, colors are stored as 16 levels of gray.
+    """
+
+    def __init__(
+        self,
+        size: xy,
+        format: int = framebuf.RGB565,
+        like: canvas | None = None,
+        background: color | bool | None = None
+    ):
+        if like is None:
+            self._format = format
+            if format == framebuf.RGB565:
+                self._encode = _encode_565
+                self._decode = lambda v: color( *_decode_565( v ) )
+            elif format == framebuf.GS4_HMSB:
+                self._encode = _encode_gs4
+                self._decode = lambda v: color( v * 17, v * 17, v * 17 )
+            elif format in (
+                framebuf.MONO_HLSB, framebuf.MONO_HMSB, framebuf.MONO_VLSB
+            ):
+                self._encode = lambda ink: 1 if ink else 0
+                self._decode = lambda v: v != 0
+            else:
+                raise ValueError( "unsupported format %d" % format )
+            is_color = format in ( framebuf.RGB565, framebuf.GS4_HMSB )
+        else:
+            frame_buffer = like._frame_buffer()
+            if frame_buffer is None:
+                raise ValueError( "like canvas is not backed by a framebuf" )
+            self._format = frame_buffer[ 1 ]
+            is_color = like.is_color
+            if is_color:
+                self._encode = like._encode
+                self._decode = like._decode
+            else:
+                self._encode = lambda ink: 1 if ink else 0
+                self._decode = lambda v: v != 0
+
+        if background is None:
+            background = colors.black if is_color else False
+        canvas.__init__(
+            self,
+            size = size,
+            is_color = is_color,
+            background = background
+        )
+
+        self._buffer = bytearray( _frame_buffer_bytes( size, self._format ) )
+        self._framebuffer = framebuf.FrameBuffer(
+            self._buffer, size.x, size.y, self._format )
+        self._blends = None
+        self._clear_implementation( background )
+
+    # =======================================================================
+
+    def as_shape( self ) -> shape:
+        """
+        a shape that writes the pixels of the ram_canvas
+
+        The shape has the size of the ram_canvas.
+        Without an offset, it starts at the origin.
+        """
+
+        return _ram_canvas_shape( self )
+
+    # =======================================================================
+
+    def blit(
+        self,
+        target: canvas,
+        location: xy = xy( 0, 0 ),
+        ink: color | bool | None = None
+    ) -> None:
+        """
+        write the ram_canvas to a canvas
+
+        :param target: (:class:`~godafoss.canvas`)
+            the canvas to which the pixels are written
+
+        :param location: (:class:`~godafoss.xy`, default (0,0) )
+            the location in the target of the top-left pixel
+
+        :param ink: (:class:`~godafoss.color`, bool, None)
+            for a monochrome ram_canvas:
+            the ink for the pixels that are set
+        """
+
+        target.write( _ram_canvas_shape( self ), location, ink )
+
+    # =======================================================================
+
+    def _frame_buffer( self ):
+        return self._framebuffer, self._format
+
+    # =======================================================================
+
+    def _write_pixel_implementation(
+        self,
+        location: xy,
+        ink: color | bool
+    ) -> None:
+        self._framebuffer.pixel(
+            location.x, location.y, self._encode( ink ) )
+
+    # =======================================================================
+
+    def _read_pixel_implementation(
+        self,
+        location: xy
+    ) -> color | bool:
+        return self._decode(
+            self._framebuffer.pixel( location.x, location.y ) )
+
+    # =======================================================================
+
+    def _write_rect_implementation(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        ink: color | bool
+    ) -> None:
+        self._framebuffer.fill_rect( x, y, width, height, self._encode( ink ) )
+
+    # =======================================================================
+
+    def _write_blended_implementation(
+        self,
+        location: xy,
+        ink: color,
+        level: int
+    ) -> None:
+        if self._blends is None:
+            self._blends = _blend_cache( self._encode, self._decode )
+        x = location.x
+        y = location.y
+        self._framebuffer.pixel( x, y, self._blends.table(
+            ink, self._framebuffer.pixel( x, y ) )[ level ] )
+
+    # =======================================================================
+
+    def _clear_implementation(
+        self,
+        ink: color | bool
+    ) -> None:
+        self._framebuffer.fill( self._encode( ink ) )
+
+    # =======================================================================
+
+    def _flush_implementation(
+        self,
+        forced: bool
+    ) -> None:
+        pass
+
+    # =======================================================================
+
+# ===========================================================================
+
+class _ram_canvas_shape( shape ):
+    """
+    helper class that is a shape that writes a ram_canvas
+    """
+
+    def __init__(
+        self,
+        subject: ram_canvas
+    ):
+        self._subject = subject
+        shape.__init__( self )
+
+    def bounds(
+        self,
+        offset: xy = xy( 0, 0 )
+    ):
+        size = self._subject.size
+        return offset.x, offset.y, offset.x + size.x - 1, offset.y + size.y - 1
+
+    def write(
+        self,
+        sheet: "sheet",
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
+    ) -> None:
+        """
+        write the ram_canvas to the sheet
+
+        $macro_insert shape_write
+        """
+
+        subject = self._subject
+        x0, y0, x1, y1 = sheet.clip_rectangle()
+        x0 = max( x0, offset.x )
+        y0 = max( y0, offset.y )
+        x1 = min( x1, offset.x + subject.size.x - 1 )
+        y1 = min( y1, offset.y + subject.size.y - 1 )
+        if ( x0 > x1 ) or ( y0 > y1 ):
+            return
+
+        # the same pixel format: a single blit,
+        # for monochrome with the 0 pixels transparent
+        if (
+            hasattr( sheet, "_frame_buffer" )
+            and ( ( ink is True ) or subject.is_color )
+            and subject._stores_like( sheet )
+        ):
+            sheet._frame_buffer()[ 0 ].blit(
+                subject._framebuffer, offset.x, offset.y,
+                -1 if subject.is_color else 0 )
+            sheet._mark_dirty( x0, y0, x1, y1 )
+            return
+
+        pixel = subject._framebuffer.pixel
+        decode = subject._decode
+
+        # color pixels on a monochrome sheet: each row is converted
+        # to gray values, which are dithered (the columns outside
+        # the clip rectangle are not used by the dither)
+        if subject.is_color and not sheet.is_color:
+            from godafoss.gf_dither import dither_bayer, _gray
+            row = bytearray( subject.size.x )
+            grays = {}
+            rows = dither_bayer(
+                sheet, subject.size.x, xy( offset.x, y0 ), ink )
+            for y in range( y0, y1 + 1 ):
+                sy = y - offset.y
+                for sx in range( x0 - offset.x, x1 - offset.x + 1 ):
+                    raw = pixel( sx, sy )
+                    gray = grays.get( raw )
+                    if gray is None:
+                        gray = _gray( decode( raw ) )
+                        grays[ raw ] = gray
+                    row[ sx ] = gray
+                rows.write_row( row )
+            return
+
+        # otherwise convert row by row, each run of equal
+        # raw pixel values is written as one span
+        for y in range( y0, y1 + 1 ):
+            sy = y - offset.y
+            x = x0
+            while x <= x1:
+                raw = pixel( x - offset.x, sy )
+                start = x
+                x += 1
+                while ( x <= x1 ) and ( pixel( x - offset.x, sy ) == raw ):
+                    x += 1
+                if subject.is_color:
+                    sheet.write_rect(
+                        xy( start, y ), xy( x - start, 1 ), decode( raw ) )
+                elif raw:
+                    sheet.write_rect( xy( start, y ), xy( x - start, 1 ), ink )
+
+    # =======================================================================
+
+# ===========================================================================
+
+def _encode_565(
+    ink: color
+) -> int:
+    r, g, b = ink.rgb()
+    return ( ( r >> 3 ) << 11 ) | ( ( g >> 2 ) << 5 ) | ( b >> 3 )
+
+
+# ===========================================================================
+
+def _encode_gs4(
+    ink: color
+) -> int:
+    r, g, b = ink.rgb()
+    return ( 77 * r + 150 * g + 29 * b ) >> 12
+
+
+# ===========================================================================
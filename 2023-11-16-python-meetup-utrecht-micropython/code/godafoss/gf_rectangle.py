@@ -14,6 +14,7 @@
 
 from godafoss.gf_xy import *
 from godafoss.gf_shape import *
+from godafoss.gf_shape import _span_bounds
 from godafoss.gf_line import *
 
               
@@ -43,6 +44,14 @@ class rectangle( shape ):
         self._fill = fill
         shape.__init__( self )
                 
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        # the far end is not included
+        return _span_bounds( 
+            offset, xy( less( self._span.x ), less( self._span.y ) ) )
+    
     def write( 
         self, 
         s: "sheet",
@@ -56,9 +65,7 @@ class rectangle( shape ):
         """    
         
         if self._fill:
-            for dx in range( 0, self._span.x ):
-                for dy in range( 0, self._span.y ):
-                    s.write_pixel( offset + xy( dx, dy ), ink )
+            s.write_rect( offset, self._span, ink )
         else:
             h = line( xy( self._span.x, 0 ) )
             v = line( xy( 0, self._span.y ) )
@@ -0,0 +1,309 @@
+# ===========================================================================
+#
+# file     : gf_scene.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the scene class.
+#
+# ===========================================================================
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_canvas import *
+from godafoss.gf_shape import *
+from godafoss.gf_rectangle import *
+
+
+# ===========================================================================
+
+class scene:
+    """
+    shapes on a canvas, redrawn where they changed
+
+    :param canvas: (:class:`~godafoss.canvas`)
+        the canvas on which the scene is shown
+
+    :param background: (:class:`~godafoss.color`, bool, default False)
+        the ink that is written where there is no shape
+        (False is the background of the canvas)
+
+    :param max_damaged: (int, default 8)
+        the maximum number of separate damaged rectangles
+
+    A scene holds nodes, each with a :class:`~godafoss.shape`,
+    a location, an ink and a z (layer) value.
+    The add() method adds a node and returns it.
+    The nodes are written in order of increasing z
+    (and in order of addition for equal z),
+    so a node with a higher z is on top.
+
+    Changing a node (node.set()) or removing it (scene.remove())
+    marks the bounds of the node before and after the change
+    as damaged.
+    The render() method clears only the damaged rectangles,
+    writes the nodes that overlap each of them
+    (clipped to the rectangle, via canvas.part()),
+    and flushes.
+    When the canvas supports a partial flush
+    (like an :class:`~godafoss.lcd`) the rectangles are flushed
+    one by one, otherwise the canvas is flushed once.
+
+    So when for instance only the seconds of a clock change,
+    a render writes only the pixels of the (old and new) seconds text,
+    instead of clearing and writing the whole canvas.
+
+    Damaged rectangles that overlap or touch are merged.
+    When there are more than max_damaged rectangles,
+    a new rectangle is merged with the one that grows least.
+
+    A node of which the bounds are not known
+    damages the whole canvas.
+    Initially the whole canvas is damaged, so the first render()
+    clears the canvas.
+    """
+
+    # =======================================================================
+
+    def __init__(
+        self,
+        canvas: canvas,
+        background: color | bool = False,
+        max_damaged: int = 8
+    ):
+        self._canvas = canvas
+        self._background = background
+        self._max_damaged = max_damaged
+        self._nodes = []
+        self._damaged = []
+        self._windowed = hasattr( canvas, "flush_window" )
+        self.damage( None )
+
+    # =======================================================================
+
+    def add(
+        self,
+        shape: shape,
+        location: xy = xy( 0, 0 ),
+        ink: color | bool | None = None,
+        z: int = 0
+    ) -> "_scene_node":
+        """
+        add a shape to the scene
+
+        :param shape: (:class:`~godafoss.shape`)
+            the shape
+
+        :param location: (:class:`~godafoss.xy`, default (0,0) )
+            the location (offset) at which the shape is written
+
+        :param ink: (:class:`~godafoss.color`, bool, None)
+            the ink with which the shape is written
+            (None: the default ink of the shape)
+
+        :param z: (int, default 0)
+            the layer of the node: a node with a higher z
+            is written on top of a node with a lower z
+
+        This method returns the node, which can be changed
+        with its set() method, and removed with remove().
+        """
+
+        node = _scene_node( self, shape, location, ink, z )
+        self._nodes.append( node )
+        self._sort()
+        node._damage()
+        return node
+
+    # =======================================================================
+
+    def remove(
+        self,
+        node: "_scene_node"
+    ) -> None:
+        """
+        remove a node from the scene
+        """
+
+        node._damage()
+        self._nodes.remove( node )
+
+    # =======================================================================
+
+    def damage(
+        self,
+        rectangle = None
+    ) -> None:
+        """
+        mark a rectangle as damaged
+
+        :param rectangle: ( ( int, int, int, int ), None )
+            the ( x0, y0, x1, y1 ) rectangle (inclusive)
+            that must be redrawn by the next render(),
+            or None for the whole canvas
+
+        The rectangle is clipped to the canvas.
+        """
+
+        cx1 = self._canvas.size.x - 1
+        cy1 = self._canvas.size.y - 1
+        if rectangle is None:
+            rectangle = ( 0, 0, cx1, cy1 )
+        x0, y0, x1, y1 = rectangle
+        x0, y0 = max( 0, x0 ), max( 0, y0 )
+        x1, y1 = min( cx1, x1 ), min( cy1, y1 )
+        if ( x0 > x1 ) or ( y0 > y1 ):
+            return
+
+        # merge with the rectangles that overlap or touch,
+        # which can make it overlap others, hence the loop
+        damaged = self._damaged
+        i = 0
+        while i < len( damaged ):
+            a0, b0, a1, b1 = damaged[ i ]
+            if (
+                ( a0 <= x1 + 1 ) and ( x0 <= a1 + 1 )
+                and ( b0 <= y1 + 1 ) and ( y0 <= b1 + 1 )
+            ):
+                x0, y0 = min( x0, a0 ), min( y0, b0 )
+                x1, y1 = max( x1, a1 ), max( y1, b1 )
+                damaged.pop( i )
+                i = 0
+            else:
+                i += 1
+
+        if len( damaged ) < self._max_damaged:
+            damaged.append( ( x0, y0, x1, y1 ) )
+            return
+
+        # merge with the rectangle that grows least
+        best = None
+        for i in range( len( damaged ) ):
+            a0, b0, a1, b1 = damaged[ i ]
+            growth = (
+                ( max( x1, a1 ) - min( x0, a0 ) + 1 )
+                    * ( max( y1, b1 ) - min( y0, b0 ) + 1 )
+                - ( a1 - a0 + 1 ) * ( b1 - b0 + 1 ) )
+            if ( best is None ) or ( growth < best ):
+                best = growth
+                n = i
+        a0, b0, a1, b1 = damaged.pop( n )
+        self.damage( (
+            min( x0, a0 ), min( y0, b0 ), max( x1, a1 ), max( y1, b1 ) ) )
+
+    # =======================================================================
+
+    def render( self ) -> int:
+        """
+        redraw the damaged rectangles
+
+        This method clears the damaged rectangles,
+        writes the nodes that overlap them, and flushes.
+        It returns the number of pixels that were redrawn.
+        """
+
+        canvas = self._canvas
+        damaged = self._damaged
+        self._damaged = []
+
+        pixels = 0
+        for x0, y0, x1, y1 in damaged:
+            start = xy( x0, y0 )
+            size = xy( x1 - x0 + 1, y1 - y0 + 1 )
+            pixels += size.x * size.y
+
+            canvas.write( rectangle( size, fill = True ), start,
+                self._background )
+            part = canvas.part( start, size )
+            for node in self._nodes:
+                bounds = node._bounds()
+                if ( bounds is None ) or (
+                    ( bounds[ 0 ] <= x1 ) and ( x0 <= bounds[ 2 ] )
+                    and ( bounds[ 1 ] <= y1 ) and ( y0 <= bounds[ 3 ] )
+                ):
+                    part.write( node._shape, node._location - start,
+                        node._ink )
+
+            if self._windowed:
+                canvas.flush()
+
+        if not self._windowed:
+            canvas.flush()
+        return pixels
+
+    # =======================================================================
+
+    def _sort( self ) -> None:
+        # sort() is stable, so equal z's stay in order of addition
+        self._nodes.sort( key = lambda node: node._z )
+
+    # =======================================================================
+
+# ===========================================================================
+
+class _scene_node:
+    """
+    helper class that is a node of a scene
+    """
+
+    def __init__(
+        self,
+        scene: scene,
+        shape: shape,
+        location: xy,
+        ink: color | bool | None,
+        z: int
+    ):
+        self._scene = scene
+        self._shape = shape
+        self._location = location
+        self._ink = ink
+        self._z = z
+
+    # =======================================================================
+
+    def set(
+        self,
+        shape: shape | None = None,
+        location: xy | None = None,
+        ink: color | bool | None = None,
+        z: int | None = None
+    ) -> None:
+        """
+        change the node
+
+        The parameters that are not None replace the
+        shape, location, ink or z of the node.
+        The bounds of the node before and after the change
+        are marked as damaged.
+        """
+
+        self._damage()
+        if shape is not None:
+            self._shape = shape
+        if location is not None:
+            self._location = location
+        if ink is not None:
+            self._ink = ink
+        if z is not None:
+            self._z = z
+            self._scene._sort()
+        self._damage()
+
+    # =======================================================================
+
+    def _bounds( self ):
+        return self._shape.bounds( self._location )
+
+    # =======================================================================
+
+    def _damage( self ) -> None:
+        self._scene.damage( self._bounds() )
+
+    # =======================================================================
+
+# ===========================================================================
@@ -91,6 +91,57 @@ class shape:
 
     # =======================================================================
 
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        """
+        the rectangle that contains the shape
+        
+        :param offset: (:class:`~godafoss.xy`, default (0,0) )
+            the offset at which the shape would be written 
+        
+        This method returns an ( x0, y0, x1, y1 ) tuple:
+        the top-left and bottom-right (inclusive) pixels of
+        a rectangle that contains all pixels that the shape writes
+        when it is written at the offset, 
+        or None when this is not known.
+        The rectangle can be somewhat larger than the shape.
+        
+        The write() method of a canvas uses the bounds to skip 
+        a shape that is completely outside the canvas, 
+        and to mark the rectangle as dirty in one step.
+        """
+        
+        return None
+
+    # =======================================================================
+
+    def compile( self ) -> "shape":
+        """
+        compiled version of the shape
+        
+        This method returns a shape that writes the same pixels
+        as the original shape, but faster: the shape is rasterized 
+        once into a list of horizontal spans, and writing the
+        compiled shape writes those spans.
+        This is useful for a (compound) shape that is written often, 
+        like the static parts of a dashboard.
+        The size_bytes attribute of the compiled shape is the
+        RAM it uses.
+        
+        A compiled shape can be written at any offset, 
+        and with any ink.
+        The pixels of a color image (like a color 
+        :class:`~godafoss.ggf`) are recorded with their colors,
+        so the compiled image must be written to a color canvas.
+        """
+        
+        from godafoss.gf_shape_compiled import _shape_compiled
+        return _shape_compiled( self )
+        
+    # =======================================================================
+
     def __add__( 
         self, 
         other: "shape"
@@ -146,6 +197,12 @@ class _shape_offset( shape ):
     ) -> None:
         self._subject.write( sheet, self._offset + offset, ink ) 
         
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        return self._subject.bounds( self._offset + offset )
+        
         
 # ===========================================================================
 
@@ -165,6 +222,42 @@ class _shape_add( shape ):
         self._a.write( sheet, offset, ink ) 
         self._b.write( sheet, offset, ink ) 
         
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        a = self._a.bounds( offset )
+        b = self._b.bounds( offset )
+        if ( a is None ) or ( b is None ):
+            return None
+        return (
+            min( a[ 0 ], b[ 0 ] ), min( a[ 1 ], b[ 1 ] ),
+            max( a[ 2 ], b[ 2 ] ), max( a[ 3 ], b[ 3 ] ) )
+        
+        
+# ===========================================================================
+
+def _span_bounds( 
+    offset: xy, 
+    span: xy,
+    margin: int = 0
+):
+    """
+    the bounds of the pixels between offset and offset + span
+    
+    This function returns the ( x0, y0, x1, y1 ) rectangle 
+    that contains both the offset and offset + span,
+    extended by the margin on all sides.
+    """
+    
+    x0 = offset.x
+    x1 = offset.x + span.x
+    y0 = offset.y
+    y1 = offset.y + span.y
+    return (
+        min( x0, x1 ) - margin, min( y0, y1 ) - margin, 
+        max( x0, x1 ) + margin, max( y0, y1 ) + margin )
+        
         
 # ===========================================================================
         
\ No newline at end of file
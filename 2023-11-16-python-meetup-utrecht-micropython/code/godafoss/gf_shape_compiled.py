@@ -0,0 +1,287 @@
+# ===========================================================================
+#
+# file     : gf_shape_compiled.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# ===========================================================================
+#
+# This file contains a helper class for the shape class.
+#
+# ===========================================================================
+
+import array
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_shape import *
+
+
+# ===========================================================================
+
+# stands for the ink that is passed to the write() of a compiled shape
+_ink_of_write = object()
+
+
+# ===========================================================================
+
+class _span_recorder:
+    """
+    helper class that records what a shape writes, as spans
+    
+    This class provides the (part of the) canvas interface that is 
+    used by shapes: is_color, clip_rectangle(), write_pixel(), 
+    write_rect() and write_blended().
+    The pixels are recorded as horizontal spans ( y, x0, x1 ), 
+    with x1 exclusive, grouped by ink and level.
+    """
+
+    def __init__( self ):
+        
+        # unbounded: the shape is recorded completely
+        self.size = xy( 32767, 32767 )
+        
+        # colors are recorded as-is, so for instance a color image
+        # is recorded with its colors (not dithered)
+        self.is_color = True
+        self._groups = {}
+        self._order = []
+
+    # =======================================================================
+
+    def clip_rectangle( self ):
+        return -32768, -32768, 32767, 32767
+
+    # =======================================================================
+
+    def _spans( 
+        self, 
+        ink, 
+        level: int 
+    ) -> list:
+    
+        # colors don't compare by value, so they are grouped by rgb
+        if isinstance( ink, color ):
+            key = ( ink.rgb(), level )
+        else:
+            key = ( ink, level )
+        spans = self._groups.get( key, None )
+        if spans is None:
+            spans = []
+            self._groups[ key ] = spans
+            self._order.append( ( key, ink, level ) )
+        return spans
+
+    # =======================================================================
+
+    def write_pixel(
+        self,
+        location: xy,
+        ink = True
+    ) -> None:
+        if ink is not None:
+            self._spans( ink, 15 ).append( 
+                ( location.y, location.x, location.x + 1 ) )
+
+    # =======================================================================
+
+    def write_rect(
+        self,
+        start: xy,
+        size: xy,
+        ink = True
+    ) -> None:
+        if ink is not None:
+            spans = self._spans( ink, 15 )
+            for y in range( start.y, start.y + size.y ):
+                spans.append( ( y, start.x, start.x + size.x ) )
+
+    # =======================================================================
+
+    def write_blended(
+        self,
+        location: xy,
+        ink,
+        level: int
+    ) -> None:
+        if ( ink is not None ) and ( level > 0 ):
+            self._spans( ink, min( level, 15 ) ).append( 
+                ( location.y, location.x, location.x + 1 ) )
+
+    # =======================================================================
+
+    def write( 
+        self, 
+        thing, 
+        location: xy = xy( 0, 0 ),
+        ink = None
+    ) -> None:
+        thing.write( self, location, _ink_of_write if ink is None else ink )
+
+    # =======================================================================
+
+# ===========================================================================
+
+class _shape_compiled( shape ):
+    """
+    helper class that is a compiled version of a shape
+    
+    The subject shape is written once (at offset 0,0) to a recorder.
+    The pixels are stored as spans ( y, x0, x1, height ) in an
+    array( 'h' ), grouped in ink runs.
+    For a full-coverage ink the spans are sorted, 
+    adjacent and overlapping spans in a row are merged,
+    and equal spans in consecutive rows are merged into
+    one span with a larger height 
+    (so a filled rectangle or a vertical line is a single span).
+    
+    Writing the compiled shape writes the spans (sheet.write_rect, 
+    or sheet.write_pixel for a single pixel), 
+    translated by the offset, without running the rasterizers
+    of the subject or walking a tree of compound shapes.
+    Pixels that the subject writes with the write() ink are written 
+    with the ink of the write() of the compiled shape, pixels 
+    with a specific ink (for instance of an image) with that ink.
+    When the subject writes different inks to the same pixel,
+    the ink that was written first to any pixel is written first.
+    
+    The size_bytes attribute is the RAM used by the spans and runs.
+    """
+
+    def __init__( 
+        self, 
+        subject: shape 
+    ):
+        shape.__init__( self )
+        recorder = _span_recorder()
+        subject.write( recorder, xy( 0, 0 ), _ink_of_write )
+        
+        self._inks = []
+        self._levels = []
+        self._counts = array.array( "H" )
+        self._spans = array.array( "h" )
+        for key, ink, level in recorder._order:
+            spans = recorder._groups[ key ]
+            if level == 15:
+                spans = _merged( spans )
+            else:
+                spans = [ ( y, x0, x1, 1 ) for y, x0, x1 in spans ]
+            self._inks.append( ink )
+            self._levels.append( level )
+            self._counts.append( len( spans ) )
+            for span in spans:
+                self._spans.extend( span )
+                
+        self.size_bytes = 2 * len( self._spans ) + 2 * len( self._counts )
+        
+        # the bounds of the spans
+        spans = self._spans
+        self._bounds = None
+        for i in range( 0, len( spans ), 4 ):
+            y, x0, x1, height = spans[ i : i + 4 ]
+            if self._bounds is None:
+                self._bounds = ( x0, y, x1 - 1, y + height - 1 )
+            else:
+                bx0, by0, bx1, by1 = self._bounds
+                self._bounds = ( 
+                    min( bx0, x0 ), min( by0, y ), 
+                    max( bx1, x1 - 1 ), max( by1, y + height - 1 ) )
+
+    # =======================================================================
+
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        if self._bounds is None:
+            # nothing is written
+            return offset.x, offset.y, offset.x - 1, offset.y - 1
+        x0, y0, x1, y1 = self._bounds
+        return offset.x + x0, offset.y + y0, offset.x + x1, offset.y + y1
+
+    # =======================================================================
+
+    def write( 
+        self, 
+        sheet: "sheet",
+        offset: xy = xy( 0, 0 ),
+        ink: bool | color = True
+    ) -> None:
+        
+        # only the spans that have rows within the clip rectangle
+        x0, y0, x1, y1 = sheet.clip_rectangle()
+        y0 -= offset.y
+        y1 -= offset.y
+        
+        spans = self._spans
+        ox = offset.x
+        oy = offset.y
+        i = 0
+        for run in range( len( self._counts ) ):
+            run_ink = self._inks[ run ]
+            if run_ink is _ink_of_write:
+                run_ink = ink
+            level = self._levels[ run ]
+            end = i + 4 * self._counts[ run ]
+            while i < end:
+                y = spans[ i ]
+                height = spans[ i + 3 ]
+                if ( y <= y1 ) and ( y + height > y0 ):
+                    sx = spans[ i + 1 ]
+                    width = spans[ i + 2 ] - sx
+                    if level < 15:
+                        for x in range( sx, sx + width ):
+                            sheet.write_blended( 
+                                xy( ox + x, oy + y ), run_ink, level )
+                    elif ( width == 1 ) and ( height == 1 ):
+                        sheet.write_pixel( xy( ox + sx, oy + y ), run_ink )
+                    else:
+                        sheet.write_rect( 
+                            xy( ox + sx, oy + y ), 
+                            xy( width, height ), 
+                            run_ink 
+                        )
+                i += 4
+
+    # =======================================================================
+
+# ===========================================================================
+
+def _merged( 
+    spans: list 
+) -> list:
+    """
+    the spans ( y, x0, x1 ), merged into spans ( y, x0, x1, height )
+    
+    Adjacent and overlapping spans in a row are merged,
+    and equal spans in consecutive rows are merged.
+    """
+    
+    spans.sort()
+    rows = []
+    for y, x0, x1 in spans:
+        if rows and ( rows[ -1 ][ 0 ] == y ) and ( x0 <= rows[ -1 ][ 2 ] ):
+            if x1 > rows[ -1 ][ 2 ]:
+                rows[ -1 ] = ( y, rows[ -1 ][ 1 ], x1 )
+        else:
+            rows.append( ( y, x0, x1 ) )
+            
+    # open_spans[ ( x0, x1 ) ] is the index in result 
+    # of the last span with that x0, x1
+    result = []
+    open_spans = {}
+    for y, x0, x1 in rows:
+        n = open_spans.get( ( x0, x1 ), None )
+        if ( n is not None ) and ( result[ n ][ 0 ] + result[ n ][ 3 ] == y ):
+            result[ n ] = ( result[ n ][ 0 ], x0, x1, result[ n ][ 3 ] + 1 )
+        else:
+            open_spans[ ( x0, x1 ) ] = len( result )
+            result.append( ( y, x0, x1, 1 ) )
+    return result
+
+
+# ===========================================================================
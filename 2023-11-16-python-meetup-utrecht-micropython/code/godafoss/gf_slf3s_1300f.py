@@ -17,11 +17,19 @@ import machine
 from godafoss.gf_tools import *
 from godafoss.gf_time import *
 from godafoss.gf_temperature import *
+from godafoss.gf_i2c_device import *
 
 
 # ===========================================================================
 
-class slf3s_1300f:
+def _int16_from_msb_lsb( msb: int, lsb: int ) -> int:
+    value = ( msb << 8 ) | lsb
+    return value - 0x1_0000 if value & 0x8000 else value
+    
+    
+# ===========================================================================
+
+class slf3s_1300f( i2c_device ):
     """
     sensirion slf3s_1300f flow sensor
     
@@ -49,13 +57,12 @@ class slf3s_1300f:
         i2c: machine.I2C,
         address: int = 8
     ) -> None:
-        self.i2c = i2c
-        self.address = address
+        i2c_device.__init__( self, i2c, address, buffer_size = 18 )
         self.fluid = self.commands.start_measuring_water
         
         # general call reset and reset time
         # this seems to be required
-        self.i2c.writeto( 0x00, bytes( [ 0x06 ] ) )
+        self._i2c.writeto( 0x00, b'\x06' )
         sleep_us( 25_000 )
         
         self._reading = False
@@ -70,10 +77,7 @@ class slf3s_1300f:
         write a 16-bit command
         """
         
-        self.i2c.writeto(
-            self.address,
-            bytes( ( ( command >> 8 ) & 0xFF, command & 0xFF ) )
-        )
+        self.write_word( command )
         
     # =======================================================================    
 
@@ -81,7 +85,7 @@ class slf3s_1300f:
         self,
         n: int 
     ):
-        return self.i2c.readfrom( self.address, n )
+        return self.read_bytes( n )
     
     # =======================================================================    
 
@@ -125,20 +129,14 @@ class slf3s_1300f:
 
     def get_flow( self ):
         d = self.get_flow_data( 3 )
-        return int_from_bytes(
-            ( d[ 1 ], d[ 0 ] ),
-            signed = True
-        )
+        return _int16_from_msb_lsb( d[ 0 ], d[ 1 ] )
     
     # =======================================================================    
 
     def get_temperature( self ):
         d = self.get_flow_data( 6 )
         return temperature(
-            int_from_bytes(
-                ( d[ 4 ], d[ 3 ] ),
-                signed = True
-            ) / 200.0,
+            _int16_from_msb_lsb( d[ 3 ], d[ 4 ] ) / 200.0,
             temperature.scale.celcius
         )
     
@@ -146,7 +144,7 @@ class slf3s_1300f:
 
     def get_flags( self ):
         d = self.get_flow_data( 9 )
-        return int_from_bytes( ( d[ 8 ], d[ 7 ] ) )
+        return ( d[ 7 ] << 8 ) | d[ 8 ]
     
     # =======================================================================
     
@@ -26,6 +26,7 @@ class spi:
         self.sck = sck
         self.mosi = mosi
         self.miso = miso
+        self._shared = None
          
         if self.mechanism == self.soft:
                 
@@ -73,5 +74,28 @@ class spi:
         else:
             raise ValueError( "unknown mechanism %d" % self.mechanism )
         
+    def init( self, *args, **kwargs ):
+        self.bus.init( *args, **kwargs )
+        
     def write( self, *args, **kwargs ):
         self.bus.write( *args, **kwargs )
+        
+    def read( self, *args, **kwargs ):
+        return self.bus.read( *args, **kwargs )
+        
+    def readinto( self, *args, **kwargs ):
+        self.bus.readinto( *args, **kwargs )
+        
+    def write_readinto( self, *args, **kwargs ):
+        self.bus.write_readinto( *args, **kwargs )
+        
+    def shared( self ):
+        """
+        a :class:`~godafoss.spi_bus` that shares this bus among devices
+        
+        The same spi_bus is returned by each call.
+        """
+        if self._shared is None:
+            from godafoss.gf_spi_bus import spi_bus
+            self._shared = spi_bus( self.bus )
+        return self._shared
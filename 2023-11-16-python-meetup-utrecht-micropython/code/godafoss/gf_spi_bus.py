@@ -0,0 +1,223 @@
+# ===========================================================================
+#
+# file     : gf_spi_bus.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the spi_bus class, which shares one SPI bus
+# among devices that require different bus settings.
+#
+# ===========================================================================
+
+import machine
+
+from godafoss.gf_pins import *
+from godafoss.gf_make_pins import *
+
+
+# ===========================================================================
+
+class spi_bus:
+    """
+    SPI bus shared by devices with different settings
+
+    :param bus: (machine.SPI, machine.SoftSPI, :class:`~godafoss.spi`)
+        the SPI bus that is shared
+
+    Devices on the same SPI bus can require different settings:
+    an LCD controller can run at tens of MHz, while for instance
+    a XPT2046 touch controller is limited to 2.5 MHz.
+
+    The device() method returns a device handle, that has the
+    settings for one device.
+    A device handle can be used instead of the SPI bus object
+    (it provides the write, read, readinto and write_readinto methods),
+    so it can be passed to a driver like :class:`~godafoss.lcd`
+    or :class:`~godafoss.xpt2046`.
+    Before each transfer the handle checks whether the bus is
+    configured for its settings, and re-initializes the bus only
+    when they differ from those of the previously active device.
+
+    The number of re-initializations is available as the
+    reconfigurations attribute.
+    It shows how much 'bus thrash' is caused by alternating
+    between devices, for instance between the flush of an LCD and
+    the polling of a touch controller.
+
+    A device handle is also a context manager:
+    inside a 'with device:' block the bus is configured for the
+    device and its chip select (if any) is active.
+    Inside an 'async with device:' block the same is done, but first
+    the lock of the bus is acquired, so transfers by
+    (u)asyncio tasks that use the same bus are serialized.
+    """
+
+    # =======================================================================
+
+    def __init__(
+        self,
+        bus
+    ) -> None:
+
+        # a godafoss spi is a wrapper around the machine SPI
+        self._bus = getattr( bus, "bus", bus )
+        self._active = None
+        self._lock = None
+        self.reconfigurations = 0
+
+    # =======================================================================
+
+    def device(
+        self,
+        baudrate: int = 1_000_000,
+        polarity: int = 0,
+        phase: int = 0,
+        chip_select: [ None, int, pin_out, pin_in_out, pin_oc ] = None
+    ) -> "_spi_device":
+        """
+        a handle for a device on this bus
+
+        :param baudrate: (int)
+            the SPI clock frequency for this device
+
+        :param polarity: (int)
+            the SPI clock polarity (0 or 1) for this device
+
+        :param phase: (int)
+            the SPI clock phase (0 or 1) for this device
+
+        :param chip_select: ($macro_insert make_pin_out_types , None)
+            the chip select pin (active low) of this device
+
+            When the driver that uses the handle controls the
+            chip select itself, this parameter should be None.
+        """
+
+        return _spi_device(
+            self,
+            baudrate,
+            polarity,
+            phase,
+            chip_select
+        )
+
+    # =======================================================================
+
+    def _activate(
+        self,
+        device: "_spi_device"
+    ) -> None:
+        if self._active is not device:
+            if ( self._active is None ) or (
+                self._active._settings != device._settings
+            ):
+                self._bus.init(
+                    baudrate = device.baudrate,
+                    polarity = device.polarity,
+                    phase = device.phase
+                )
+                self.reconfigurations += 1
+            self._active = device
+
+    # =======================================================================
+
+    @property
+    def lock( self ):
+        """
+        the (u)asyncio lock that serializes the use of the bus
+
+        The lock is created (and asyncio is imported) on first use.
+        """
+
+        if self._lock is None:
+            import asyncio
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    # =======================================================================
+
+# ===========================================================================
+
+class _spi_device:
+    """
+    handle for a device on a shared SPI bus
+
+    This class is not intended to be used directly,
+    use spi_bus.device() instead.
+    """
+
+    # =======================================================================
+
+    def __init__(
+        self,
+        bus: spi_bus,
+        baudrate: int,
+        polarity: int,
+        phase: int,
+        chip_select
+    ) -> None:
+        self._bus = bus
+        self.baudrate = baudrate
+        self.polarity = polarity
+        self.phase = phase
+        self._settings = ( baudrate, polarity, phase )
+        self._chip_select = make_pin_out( chip_select )
+        self._chip_select.write( 1 )
+
+    # =======================================================================
+
+    def write( self, buffer ) -> None:
+        self._bus._activate( self )
+        self._bus._bus.write( buffer )
+
+    # =======================================================================
+
+    def read( self, n: int, write: int = 0x00 ) -> bytes:
+        self._bus._activate( self )
+        return self._bus._bus.read( n, write )
+
+    # =======================================================================
+
+    def readinto( self, buffer, write: int = 0x00 ) -> None:
+        self._bus._activate( self )
+        self._bus._bus.readinto( buffer, write )
+
+    # =======================================================================
+
+    def write_readinto( self, write_buffer, read_buffer ) -> None:
+        self._bus._activate( self )
+        self._bus._bus.write_readinto( write_buffer, read_buffer )
+
+    # =======================================================================
+
+    def __enter__( self ) -> "_spi_device":
+        self._bus._activate( self )
+        self._chip_select.write( 0 )
+        return self
+
+    # =======================================================================
+
+    def __exit__( self, *args ) -> None:
+        self._chip_select.write( 1 )
+
+    # =======================================================================
+
+    async def __aenter__( self ) -> "_spi_device":
+        await self._bus.lock.acquire()
+        self._bus._activate( self )
+        self._chip_select.write( 0 )
+        return self
+
+    # =======================================================================
+
+    async def __aexit__( self, *args ) -> None:
+        self._chip_select.write( 1 )
+        self._bus.lock.release()
+
+    # =======================================================================
+
+# ===========================================================================
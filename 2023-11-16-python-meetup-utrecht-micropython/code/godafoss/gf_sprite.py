@@ -0,0 +1,218 @@
+# ===========================================================================
+#
+# file     : gf_sprite.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the sprite class and the sprite_buffer_size function.
+#
+# ===========================================================================
+
+import framebuf
+
+from godafoss.gf_xy import *
+from godafoss.gf_color import *
+from godafoss.gf_canvas import *
+from godafoss.gf_canvas import _frame_buffer_bytes
+from godafoss.gf_shape import *
+
+
+# ===========================================================================
+
+def _shape_size(
+    shape: shape
+) -> xy:
+    bounds = shape.bounds( xy( 0, 0 ) )
+    if bounds is None:
+        raise ValueError( "a sprite shape must have known bounds" )
+    return xy( bounds[ 2 ] - bounds[ 0 ] + 1, bounds[ 3 ] - bounds[ 1 ] + 1 )
+
+
+# ===========================================================================
+
+def sprite_buffer_size(
+    canvas: canvas,
+    shape: shape
+) -> int:
+    """
+    the size of the save-under buffer of a sprite
+
+    :param canvas: (:class:`~godafoss.canvas`)
+        the canvas on which the sprite is shown
+
+    :param shape: (:class:`~godafoss.shape`)
+        the shape of the sprite
+
+    This function returns the number of bytes the save-under
+    buffer of a :class:`~godafoss.sprite` needs,
+    or 0 when the sprite doesn't use a buffer
+    (because the canvas is not backed by a framebuf).
+    """
+
+    frame_buffer = canvas._frame_buffer()
+    if frame_buffer is None:
+        return 0
+    return _frame_buffer_bytes( _shape_size( shape ), frame_buffer[ 1 ] )
+
+
+# ===========================================================================
+
+class sprite:
+    """
+    shape that can be moved over a canvas
+
+    :param canvas: (:class:`~godafoss.canvas`)
+        the canvas on which the sprite is shown
+
+    :param shape: (:class:`~godafoss.shape`)
+        the shape of the sprite, which must have known bounds
+
+    :param location: (:class:`~godafoss.xy`, default (0,0) )
+        the initial location (offset) of the shape
+
+    :param ink: (:class:`~godafoss.color`, bool, None)
+        the ink with which the shape is written
+        (None: the default ink of the shape)
+
+    :param buffer: (bytearray, memoryview, None)
+        the save-under buffer, or None to allocate it
+
+    A sprite saves the pixels of the canvas under its shape
+    before the shape is written (show()), and writes them back
+    to remove the shape (hide()).
+    A move() hides the sprite, changes its location, and shows
+    it again, so the rest of the canvas doesn't need to be redrawn:
+    the time it takes is proportional to the size of the sprite.
+
+    When the canvas is backed by a framebuf (like an
+    :class:`~godafoss.lcd`) the pixels are saved and restored with
+    framebuf.blit(), otherwise they are read (read_pixel())
+    and written one by one.
+    (When the canvas can't read its pixels, the background
+    is restored.)
+    Both the old and the new rectangle are marked dirty,
+    so on an lcd a flush() writes only those rectangles.
+
+    The buffer that is needed can be calculated with
+    :func:`~godafoss.sprite_buffer_size`.
+    To avoid fragmentation, many sprites can share one allocation:
+    each sprite gets a memoryview slice of a single bytearray.
+
+    Sprites that overlap must be hidden in the reverse order
+    in which they were shown.
+    """
+
+    def __init__(
+        self,
+        canvas: canvas,
+        shape: shape,
+        location: xy = xy( 0, 0 ),
+        ink: color | bool | None = None,
+        buffer = None
+    ):
+        self._canvas = canvas
+        self._shape = shape
+        self._location = location
+        self._ink = ink
+        self._shown = False
+        self._size = _shape_size( shape )
+
+        frame_buffer = canvas._frame_buffer()
+        if frame_buffer is None:
+            self._saved = [ None ] * ( self._size.x * self._size.y )
+        else:
+            n = sprite_buffer_size( canvas, shape )
+            if buffer is None:
+                buffer = bytearray( n )
+            elif len( buffer ) < n:
+                raise ValueError(
+                    "sprite buffer is %d bytes, should be %d"
+                    % ( len( buffer ), n ) )
+            self._saved = framebuf.FrameBuffer(
+                buffer,
+                self._size.x,
+                self._size.y,
+                frame_buffer[ 1 ]
+            )
+
+    # =======================================================================
+
+    def show( self ) -> None:
+        """
+        save the pixels under the sprite, and write the sprite
+        """
+
+        if self._shown:
+            return
+        self._shown = True
+
+        x0, y0, _, _ = self._shape.bounds( self._location )
+        frame_buffer = self._canvas._frame_buffer()
+        if frame_buffer is None:
+            n = 0
+            read_pixel = self._canvas.read_pixel
+            for y in range( y0, y0 + self._size.y ):
+                for x in range( x0, x0 + self._size.x ):
+                    self._saved[ n ] = read_pixel( xy( x, y ) )
+                    n += 1
+        else:
+            self._saved.blit( frame_buffer[ 0 ], - x0, - y0 )
+
+        self._canvas.write( self._shape, self._location, self._ink )
+
+    # =======================================================================
+
+    def hide( self ) -> None:
+        """
+        restore the pixels under the sprite
+        """
+
+        if not self._shown:
+            return
+        self._shown = False
+
+        canvas = self._canvas
+        x0, y0, x1, y1 = self._shape.bounds( self._location )
+        frame_buffer = canvas._frame_buffer()
+        if frame_buffer is None:
+            n = 0
+            write_pixel = canvas.write_pixel
+            for y in range( y0, y1 + 1 ):
+                for x in range( x0, x1 + 1 ):
+                    ink = self._saved[ n ]
+                    write_pixel( xy( x, y ), False if ink is None else ink )
+                    n += 1
+        else:
+            frame_buffer[ 0 ].blit( self._saved, x0, y0 )
+            x0, y0 = max( 0, x0 ), max( 0, y0 )
+            x1 = min( canvas.size.x - 1, x1 )
+            y1 = min( canvas.size.y - 1, y1 )
+            if ( x0 <= x1 ) and ( y0 <= y1 ):
+                canvas._mark_dirty( x0, y0, x1, y1 )
+
+    # =======================================================================
+
+    def move(
+        self,
+        location: xy
+    ) -> None:
+        """
+        move the sprite to a new location
+
+        When the sprite is shown, it is hidden at its old location
+        and shown at the new location.
+        """
+
+        shown = self._shown
+        self.hide()
+        self._location = location
+        if shown:
+            self.show()
+
+    # =======================================================================
+
+# ===========================================================================
@@ -21,6 +21,7 @@ from godafoss.gf_make_pins import *
 from godafoss.gf_canvas import *
 from godafoss.gf_lcd_reset_backlight_power import *
 from godafoss.gf_lcd_spi import *
+from godafoss.gf_i2c_device import *
 
 
 # ===========================================================================
@@ -80,7 +81,18 @@ class _ssd1306_base( canvas ):
             is_color = False,
             background = background
         )
-        self._buffer = bytearray((( self.size.y + 7 ) // 8 ) * self.size.x )
+        self._pages = ( self.size.y + 7 ) // 8
+        self._all_pages = ( 1 << self._pages ) - 1
+        self._dirty_pages = self._all_pages
+        self._rotated = False
+        self._buffer = bytearray( self._pages * self.size.x )
+        
+        # the active area is x-centered
+        x0 = ( 128 - self.size.x ) // 2
+        self._window = bytearray( (
+            self.commands.set_col_addr, x0, x0 + self.size.x - 1,
+            self.commands.set_page_addr, 0, self._pages - 1
+        ) )
         self._framebuf = framebuf.FrameBuffer(
             self._buffer, self.size.x, self.size.y, framebuf.MONO_VLSB )
             
@@ -124,6 +136,86 @@ class _ssd1306_base( canvas ):
             location.y,
             ink
         )           
+        self._dirty_pages |= 1 << ( location.y >> 3 )
+
+    # =======================================================================
+
+    def _frame_buffer( self ):
+        return self._framebuf, framebuf.MONO_VLSB
+
+    # =======================================================================
+
+    def _mark_dirty(
+        self,
+        x0: int,
+        y0: int,
+        x1: int,
+        y1: int
+    ) -> None:
+        self._dirty_pages |= ( 2 << ( y1 >> 3 ) ) - ( 1 << ( y0 >> 3 ) )
+        self._dirty = True
+
+    # =======================================================================
+
+    def _read_pixel_implementation(
+        self,
+        location: xy
+    ) -> bool:
+        return self._framebuf.pixel( location.x, location.y ) != 0
+
+    # =======================================================================
+
+    def _write_rect_implementation(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        ink: bool
+    ) -> None:
+        self._framebuf.fill_rect( x, y, width, height, ink )
+        self._dirty_pages |= ( 
+            ( 2 << ( ( y + height - 1 ) >> 3 ) ) - ( 1 << ( y >> 3 ) ) )
+
+    # =======================================================================
+    
+    def set_orientation( 
+        self, 
+        rotation: int = 0
+    ) -> None:
+        """
+        set the orientation of the display in the chip
+        
+        :param rotation: int
+            the clockwise rotation: 0 or 180
+        
+        The chip can mirror its segment (x) and com (y) scan direction,
+        so a rotation of 180 degrees can be done by the chip:
+        the display itself is reconfigured,
+        and there is no per-pixel overhead.
+        The rotation is absolute: set_orientation( 0 ) restores
+        the normal orientation.
+        Note that this affects all users of the display object.
+        The chip can't swap x and y, so for 90 and 270 degrees 
+        use rotated(), which returns a (software) rotated canvas.
+        """
+        
+        if rotation not in ( 0, 180 ):
+            raise ValueError( 
+                "the chip can rotate only 0 or 180, not %d" % rotation )
+        self._rotated = rotation == 180
+        # bytes, not a tuple: the i2c version writes the commands
+        # with writevto(), which requires a buffer
+        if self._rotated:
+            self.write_commands( bytes( ( 
+                self.commands.set_seg_remap, 
+                self.commands.set_com_out_dir ) ) )
+        else:
+            self.write_commands( bytes( ( 
+                self.commands.set_seg_remap | 0x01, 
+                self.commands.set_com_out_dir | 0x08 ) ) )
+        self._dirty_pages = self._all_pages
+        self._dirty = True
 
     # =======================================================================
     
@@ -132,6 +224,7 @@ class _ssd1306_base( canvas ):
         ink
     ) -> None:
         self._framebuf.fill( 0xFF if ink else 0x00 )
+        self._dirty_pages = self._all_pages
 
     # =======================================================================
 
@@ -146,19 +239,44 @@ class _ssd1306_base( canvas ):
                
     # =======================================================================
 
-    def _flush_implementation( self ) -> None:
+    def write_commands(
+        self,
+        commands
+    ) -> None:
+        """
+        write a sequence of command bytes to the chip
+        """
+        for cmd in commands:
+            self.write_command( cmd )
+               
+    # =======================================================================
+
+    def _flush_implementation( 
+        self, 
+        forced: bool 
+    ) -> None:
         
-        # the active area is x-centered
-        x0 = ( 128 - self.size.x ) // 2 
-        x1 = x0 + self.size.x - 1
-            
-        self.write_command( self.commands.set_col_addr )
-        self.write_command( x0 )
-        self.write_command( x1 )
-        self.write_command( self.commands.set_page_addr )
-        self.write_command( 0 )
-        self.write_command( ( self.size.y // 8 ) - 1 )
-        self._write_framebuf()
+        # Only the pages (rows of 8 pixels) that were written are
+        # transferred, each run of adjacent pages in its own window.
+        pages = self._all_pages if forced else self._dirty_pages
+        self._dirty_pages = 0
+        
+        width = self.size.x
+        buffer = memoryview( self._buffer )
+        page = 0
+        while pages:
+            if pages & 1:
+                first = page
+                while pages & 1:
+                    pages >>= 1
+                    page += 1
+                self._window[ 4 ] = first
+                self._window[ 5 ] = page - 1
+                self.write_commands( self._window )
+                self._write_framebuf( buffer[ first * width : page * width ] )
+            else:
+                pages >>= 1
+                page += 1
 
     # =======================================================================
         
@@ -166,7 +284,7 @@ class _ssd1306_base( canvas ):
 # ===========================================================================
 
 
-class ssd1306_i2c( _ssd1306_base ):
+class ssd1306_i2c( i2c_device, _ssd1306_base ):
     """
     ssd1306 i2c monochrome oled display driver
     
@@ -182,9 +300,22 @@ class ssd1306_i2c( _ssd1306_base ):
     :param address: (int)
         7-bit i2c slave address, default is 0x3C
 
+    :param chunk_size: (None, int)
+        maximum number of pixel data bytes per i2c transaction,
+        default (None) is no maximum
+
     This is an i2c driver for the i2c ssd1306 monochrome oled controller.
     This chip is used in various cheap oled displays and modules.
     
+    A flush writes only the pages (rows of 8 pixels) that were
+    written to, as one transaction per chunk, without copying the
+    pixel data.
+    A smaller chunk_size can be required for an i2c implementation
+    that copies a vectored write into one temporary buffer.
+    
+    The probe_frequency() method can be used to find the highest
+    i2c clock frequency that works for a specific module.
+    
     #$insert_image( "ssd1306-i2c", 1, 200 )
     
     $macro_insert canvas_monochrome    
@@ -197,11 +328,11 @@ class ssd1306_i2c( _ssd1306_base ):
         size: xy, 
         i2c: machine.I2C, 
         background = False, 
-        address = 0x3C
+        address = 0x3C,
+        chunk_size: int = None
     ) -> None:
-        self._i2c = i2c
-        self._address = address
-        self._cmd = bytearray( 2 )
+        i2c_device.__init__( self, i2c, address )
+        self.chunk_size = chunk_size
         _ssd1306_base.__init__(
             self,
             size = size,
@@ -223,19 +354,41 @@ class ssd1306_i2c( _ssd1306_base ):
         This method writes a single command byte to the chip.
         """
         
-        self._cmd[ 0 ] = 0x80  # Co=1, D/C#=0
-        self._cmd[ 1 ] = cmd
-        self._i2c.writeto( self._address, self._cmd )
+        # control byte: Co=1, D/C#=0
+        self.write_register( 0x80, cmd )
+
+    # =======================================================================
+
+    def write_commands(
+        self,
+        commands
+    ) -> None:
+        """
+        write a sequence of command bytes to the chip
+        
+        The command bytes are written in a single i2c transaction.
+        """
+        
+        # control byte: Co=0, D/C#=0
+        self.write_prefixed( 0x00, commands )
 
     # =======================================================================
 
-    def _write_framebuf( self ) -> None:
-        self._i2c.start()
-        self._cmd[ 0 ] = ( self._address << 1 ) | 0x00
-        self._cmd[ 1 ] = 0x40 # set_disp_start_line?
-        self._i2c.write( self._cmd )
-        self._i2c.write( self._buffer )
-        self._i2c.stop()
+    def _write_framebuf( 
+        self, 
+        data: memoryview 
+    ) -> None:
+        # control byte: Co=0, D/C#=1
+        chunk = self.chunk_size or len( data )
+        for start in range( 0, len( data ), chunk ):
+            self.write_prefixed( 0x40, data[ start : start + chunk ] )
+        
+    # =======================================================================
+
+    def _i2c_probe( self ) -> bool:
+        # control byte: Co=1, D/C#=0, command: nop
+        self.write_register( 0x80, 0xE3 )
+        return True
         
     # =======================================================================
         
@@ -307,8 +460,11 @@ class ssd1306_spi(
 
     # =======================================================================
     
-    def _write_framebuf( self ) -> None:
-        self.write_command( None, buffer = self._buffer )
+    def _write_framebuf( 
+        self, 
+        data: memoryview 
+    ) -> None:
+        self.write_command( None, buffer = data )
 
     # =======================================================================
     
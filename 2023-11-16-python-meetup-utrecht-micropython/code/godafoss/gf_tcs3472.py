@@ -1,17 +1,28 @@
 # ===========================================================================
 
-class tcs3472:
+from godafoss.gf_time import *
+from godafoss.gf_color import *
+from godafoss.gf_pins import *
+from godafoss.gf_i2c_device import *
+
+
+# ===========================================================================
+
+class tcs3472( i2c_device ):
 
     def __init__( self, bus, address = 0x29, leds = pin_out_dummy ):
-        self.bus = bus
-        self.address = address
+        i2c_device.__init__( self, bus, address, buffer_size = 8 )
         self.leds = leds
-        self.bus.writeto( self.address, b'\x80\x03' )
-        self.bus.writeto( self.address, b'\x81\x2B' )
+        
+        # command bit | register: enable = power on, rgbc enable
+        self.write_register( 0x80, 0x03 )
+        
+        # command bit | register: atime
+        self.write_register( 0x81, 0x2B )
 
     def read( self ):
-        self.bus.writeto( self.address, b'\xB4' )
-        data = self.bus.readfrom( self.address, 8 )
+        # command bit | auto-increment | register: clear data low
+        data = self.read_registers( 0xB4, 8 )
         clear = data[ 0 ] + ( data[ 1 ] << 8 )
         red = data[ 2 ] + ( data[ 3 ] << 8 )
         green = data[ 4 ] + ( data[ 5 ] << 8 )
@@ -25,4 +36,4 @@ class tcs3472:
         while True:
             # print( self.read() )
             self.read()
-            time.sleep_us( 500_000 )
\ No newline at end of file
+            sleep_us( 500_000 )
\ No newline at end of file
@@ -14,6 +14,7 @@
 
 from godafoss.gf_xy import *
 from godafoss.gf_shape import *
+from godafoss.gf_shape import _span_bounds
 from godafoss.gf_font import *
 from godafoss.gf_font_default import *
 
@@ -29,11 +30,38 @@ class text( shape ):
     ):
         self._text = text
         self._font = font
-        self.size = xy(
-            sum( [ self._font.read( c ).size.x for c in text ] ),
-            self._font.read( text[ " " ] ).size.y
-        )    
+        
+        # the widths of the characters and of the (longest) line,
+        # in one pass: each glyph is read at most once, and not at 
+        # all for a fixed width font
+        width = font.size.x
+        total = 0
+        line = 0
+        longest = 0
+        for c in text:
+            w = width or font.read( c ).size.x
+            total += w
+            if c == '\n':
+                longest = max( longest, line )
+                line = 0
+            else:
+                line += w
+        longest = max( longest, line )
+        
+        self.size = xy( total, font.size.y )
+        
+        # the size of the (multi-line) text as written
+        self._extent = xy( 
+            longest, 
+            ( text.count( '\n' ) + 1 ) * font.size.y 
+        )
         shape.__init__( self )   
+        
+    def bounds( 
+        self, 
+        offset: xy = xy( 0, 0 )
+    ):
+        return _span_bounds( offset, self._extent - xy( 1, 1 ) )
                     
     def write( 
         self, 
@@ -41,38 +69,51 @@ class text( shape ):
         offset: xy = xy( 0, 0 ),
         ink: bool | color = True
     ):  
-        x_offset_in_text = 0
-        y_offset = 0
-        for c in self._text:
+        # only the lines and characters that are (partly)
+        # within the sheet are written
+        x0, y0, x1, y1 = sheet.clip_rectangle()
+        font = self._font
+        height = font.size.y
+        width = font.size.x
+        text = self._text
         
-            if c == '\n':
-                x_offset_in_text = 0
-                y_offset += self._font.size.y
-                
-                # quit when below the sheet
-                if y_offset >= sheet.size.y:
-                    return
-                    
-                continue
+        start = 0
+        y = offset.y
+        while start <= len( text ):
         
-            glyph = self._font.read( c )
-            x_offset_in_sheet = offset.x + x_offset_in_text
-            
-            # skip when beyond the right side of the sheet
-            if (
-                # skip when before the left side of the sheet
-                ( x_offset_in_sheet + glyph.size.x >= 0 )
+            end = text.find( '\n', start )
+            if end < 0:
+                end = len( text )
+                
+            # quit when below the sheet
+            if y > y1:
+                return
                 
-                # skip when beyond the right side of the sheet
-                and ( x_offset_in_sheet < sheet.size.x )
-            ):    
-                glyph.write( 
-                    sheet, 
-                    offset + xy( x_offset_in_text, y_offset ),
-                    ink
-                )
+            # skip the line when above the sheet
+            if y + height > y0:
+                x = offset.x
+                n = start
                 
-            x_offset_in_text += glyph.size.x
+                # for a fixed width font the characters before the
+                # left side of the sheet can be skipped without
+                # reading their glyphs
+                if ( width > 0 ) and ( x < x0 ):
+                    skip = min( ( x0 - x ) // width, end - start )
+                    n += skip
+                    x += skip * width
+                    
+                # quit the line when beyond the right side of the sheet
+                while ( n < end ) and ( x <= x1 ):
+                    glyph = font.read( text[ n ] )
+                    
+                    # skip when before the left side of the sheet
+                    if x + glyph.size.x > x0:
+                        glyph.write( sheet, xy( x, y ), ink )
+                    x += glyph.size.x
+                    n += 1
+                    
+            y += height
+            start = end + 1
             
             
 # ===========================================================================
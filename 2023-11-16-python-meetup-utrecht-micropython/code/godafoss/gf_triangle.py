@@ -0,0 +1,48 @@
+# ===========================================================================
+#
+# file     : gf_triangle.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This file contains the triangle class
+#
+# ===========================================================================
+
+from godafoss.gf_xy import *
+from godafoss.gf_polygon import *
+
+             
+# ===========================================================================
+  
+class triangle( polygon ):   
+    """
+    triangle shape
+    
+    :param a: (:class:`~godafoss.xy`)
+    :param b: (:class:`~godafoss.xy`)
+    :param c: (:class:`~godafoss.xy`)
+        the corners of the triangle
+        
+    :param fill: (bool)
+        whether the triangle is outline (False, default) or filled (True)     
+
+    A triangle is a :class:`~godafoss.polygon` with three corners.
+    
+    $macro_insert shape
+    """    
+
+    def __init__( 
+        self, 
+        a: xy, 
+        b: xy, 
+        c: xy,
+        fill = False
+    ):
+        polygon.__init__( self, ( a, b, c ), fill )
+            
+              
+# ===========================================================================
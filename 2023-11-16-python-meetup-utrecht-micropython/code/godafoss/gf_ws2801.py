@@ -17,13 +17,24 @@ from godafoss.gf_color import *
 from godafoss.gf_canvas import *
 from godafoss.gf_pins import *
 from godafoss.gf_make_pins import *
+from godafoss.gf_neopixels import neopixels, _neopixels_lookup
 
 
 # ===========================================================================
 
-class ws2801( canvas ):
+class ws2801( neopixels ):
     """
     driver for neopixels with separate clock (ck) and data (si) lines
+    
+    :param clock: ($macro_insert make_pin_out_types )
+        the pin that connects to the clock input of the first pixel
+    
+    :param data: ($macro_insert make_pin_out_types )
+        the pin that connects to the data input of the first pixel
+    
+    $macro_insert neopixels
+    
+    The default order is RBG.
     """
 
     # =======================================================================
@@ -33,19 +44,16 @@ class ws2801( canvas ):
         clock: [ int, pin_out, pin_in_out, pin_oc ],
         data: [ int, pin_out, pin_in_out, pin_oc ],
         n: int, 
-        background = colors.black
+        background = colors.black,
+        order: str = "RBG",
+        brightness: float = 1.0,
+        gamma: float = 1.0
     ):
         self._clock = make_pin_out( clock )
         self._data = make_pin_out( data )
-        self._n = n
-        self._background = background
-        self._pixels = [ self._background for _ in range( self._n ) ]
-        canvas.__init__( self, xy( n, 1 ), self._background )
-
-    # =======================================================================
-    
-    def write_pixel_implementation( self, location: xy, ink ):
-        self._pixels[ location.x ] = ink
+        self._wire = bytearray( 3 * n )
+        neopixels.__init__( 
+            self, n, background, order, brightness, gamma )
 
     # =======================================================================
     
@@ -63,13 +71,13 @@ class ws2801( canvas ):
 
     # =======================================================================
 
-    def flush( self ): 
+    def _flush_implementation( self, forced ): 
+        _neopixels_lookup( 
+            self._pixels, self._wire, self._lut, len( self._wire ) )
         self._clock.write( 0 )
         sleep_us( 500 )
-        for p in self._pixels:
-            self._write_byte( p.red )
-            self._write_byte( p.blue )
-            self._write_byte( p.green )
+        for b in self._wire:
+            self._write_byte( b )
             
 
 # ===========================================================================
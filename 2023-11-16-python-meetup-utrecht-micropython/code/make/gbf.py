@@ -0,0 +1,310 @@
+# ===========================================================================
+#
+# file     : gbf.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This is a host script (run it with a desktop python) that converts
+# a BDF font to a godafoss bitmap font (gbf) file,
+# or to a python module that contains the gbf data as a bytes literal.
+#
+#    python gbf.py font.bdf [ output.gbf | output.py ] [ characters ]
+#    python gbf.py font.gbf output.py
+#    python gbf.py --icons output.gbf | output.py image ...
+#
+# The output defaults to the name of the BDF file with the .gbf
+# extension. When characters is given, only those characters
+# are converted, for instance "0123456789:" for a clock.
+#
+# The glyphs are cells of the height of the font
+# (FONT_ASCENT + FONT_DESCENT) and their DWIDTH,
+# so they can be written next to each other.
+#
+# When the output is a .py file, it is a module that defines
+# data = b"...": the font in gbf format, for gbf_bytes().
+# When that module is frozen into the firmware, the data stays
+# in flash and costs no RAM.
+#
+# With --icons, each image (read with PIL) becomes a glyph.
+# The pixels that are darker than 50% (and not transparent) are set.
+# The icons get the code points 0xE000, 0xE001, etc.
+# (the unicode private use area), in the order of the images.
+# A .py output also defines a string for each icon,
+# named after the image file, so the icon can be written as text.
+#
+# ===========================================================================
+
+import sys
+
+
+# ===========================================================================
+
+def read_bdf(
+    file_name: str,
+    characters: str | None = None
+):
+    """
+    read a BDF font
+
+    This function returns the height of the font, and a sorted list
+    of ( code point, width, rows ) tuples, where rows is a list of
+    the pixel rows of the glyph, each a list of bools.
+    """
+
+    ascent = None
+    descent = None
+    bounding_box = None
+    glyphs = []
+
+    with open( file_name, "r" ) as f:
+        lines = iter( f.read().splitlines() )
+
+    for line in lines:
+        words = line.split()
+        if not words:
+            continue
+
+        if words[ 0 ] == "FONTBOUNDINGBOX":
+            bounding_box = [ int( w ) for w in words[ 1 : 5 ] ]
+        elif words[ 0 ] == "FONT_ASCENT":
+            ascent = int( words[ 1 ] )
+        elif words[ 0 ] == "FONT_DESCENT":
+            descent = int( words[ 1 ] )
+
+        elif words[ 0 ] == "STARTCHAR":
+            code = None
+            width = None
+            box = bounding_box
+            bitmap = []
+            for line in lines:
+                words = line.split()
+                if not words:
+                    continue
+                if words[ 0 ] == "ENCODING":
+                    code = int( words[ 1 ] )
+                elif words[ 0 ] == "DWIDTH":
+                    width = int( words[ 1 ] )
+                elif words[ 0 ] == "BBX":
+                    box = [ int( w ) for w in words[ 1 : 5 ] ]
+                elif words[ 0 ] == "BITMAP":
+                    for line in lines:
+                        if line.strip() == "ENDCHAR":
+                            break
+                        bitmap.append( line.strip() )
+                    break
+            glyphs.append( ( code, width, box, bitmap ) )
+
+    if ascent is None:
+        ascent = bounding_box[ 1 ] + bounding_box[ 3 ]
+    if descent is None:
+        descent = - bounding_box[ 3 ]
+    height = ascent + descent
+
+    result = []
+    for code, width, box, bitmap in glyphs:
+        if ( code is None ) or ( code < 0 ) or ( code > 0xFFFF ):
+            continue
+        if ( characters is not None ) and ( chr( code ) not in characters ):
+            continue
+        if width is None:
+            width = box[ 0 ]
+
+        # place the bitmap in the cell:
+        # the baseline is ascent rows from the top
+        box_width, box_height, x_offset, y_offset = box
+        top = ascent - ( box_height + y_offset )
+        rows = [ [ False ] * width for _ in range( height ) ]
+        for n, hex_row in enumerate( bitmap ):
+            y = top + n
+            if ( y < 0 ) or ( y >= height ):
+                continue
+            bits = int( hex_row, 16 ) if hex_row else 0
+            n_bits = 4 * len( hex_row )
+            for x in range( box_width ):
+                if ( bits >> ( n_bits - 1 - x ) ) & 1:
+                    if 0 <= x_offset + x < width:
+                        rows[ y ][ x_offset + x ] = True
+        result.append( ( code, width, rows ) )
+
+    result.sort( key = lambda glyph: glyph[ 0 ] )
+    return height, result
+
+
+# ===========================================================================
+
+def gbf_bytes(
+    height: int,
+    glyphs
+) -> bytes:
+    """
+    the gbf format of a font
+
+    The glyphs are ( code point, width, rows ) tuples,
+    sorted by code point.
+    """
+
+    widths = set( width for _, width, _ in glyphs )
+    fixed = widths.pop() if len( widths ) == 1 else 0
+
+    header = bytes( [
+        0xA7,
+        0,
+        height >> 8, height & 0xFF,
+        len( glyphs ) >> 8, len( glyphs ) & 0xFF,
+        fixed >> 8, fixed & 0xFF
+    ] )
+
+    index = bytearray()
+    data = bytearray()
+    start = len( header ) + 6 * len( glyphs )
+    for code, width, rows in glyphs:
+        if width > 255:
+            raise ValueError( "glyph %d is %d pixels wide" % ( code, width ) )
+        offset = start + len( data )
+        index += bytes( [
+            code >> 8, code & 0xFF,
+            width,
+            offset >> 16, ( offset >> 8 ) & 0xFF, offset & 0xFF
+        ] )
+        for row in rows:
+            for x in range( 0, width, 8 ):
+                byte = 0
+                for bit in range( 8 ):
+                    if ( x + bit < width ) and row[ x + bit ]:
+                        byte |= 0x80 >> bit
+                data.append( byte )
+
+    return header + bytes( index ) + bytes( data )
+
+
+# ===========================================================================
+
+def read_icons(
+    file_names
+):
+    """
+    read images as icons
+
+    This function returns the height of the icons, and a list
+    of ( code point, width, rows ) tuples, like read_bdf().
+    Icons that are less high than the highest are padded
+    at the bottom.
+    """
+
+    from PIL import Image
+
+    images = [ Image.open( name ).convert( "RGBA" ) for name in file_names ]
+    height = max( image.size[ 1 ] for image in images )
+
+    glyphs = []
+    for n, image in enumerate( images ):
+        width = image.size[ 0 ]
+        rows = [ [ False ] * width for _ in range( height ) ]
+        for y in range( image.size[ 1 ] ):
+            for x in range( width ):
+                r, g, b, a = image.getpixel( ( x, y ) )
+                rows[ y ][ x ] = ( a >= 128 ) and ( r + g + b < 3 * 128 )
+        glyphs.append( ( 0xE000 + n, width, rows ) )
+
+    return height, glyphs
+
+
+# ===========================================================================
+
+def python_module(
+    data: bytes,
+    source: str,
+    names = None
+) -> str:
+    """
+    the text of a python module that holds the gbf data
+
+    The data is written as one bytes literal,
+    split over lines (adjacent literals are joined by the compiler).
+    The names are ( name, code point ) tuples.
+    """
+
+    lines = [
+        "# generated by gbf.py from %s, do not edit" % source,
+        "# %d bytes of gbf font data, for godafoss.gbf_bytes( data )"
+            % len( data ),
+        "",
+    ]
+
+    for name, code in ( names or [] ):
+        lines.append( "%s = \"\\u%04x\"" % ( name, code ) )
+    if names:
+        lines.append( "" )
+
+    lines.append( "data = (" )
+    for i in range( 0, len( data ), 32 ):
+        lines.append( "    b\"" + "".join(
+            "\\x%02x" % b for b in data[ i : i + 32 ] ) + "\"" )
+    lines.append( ")" )
+    return "\n".join( lines ) + "\n"
+
+
+# ===========================================================================
+
+def main( args ):
+    if len( args ) < 1:
+        print( "usage: python gbf.py font.bdf "
+            "[ output.gbf | output.py ] [ characters ]" )
+        print( "       python gbf.py font.gbf output.py" )
+        print( "       python gbf.py --icons "
+            "output.gbf | output.py image ..." )
+        return 1
+
+    names = None
+    if args[ 0 ] == "--icons":
+        output_name = args[ 1 ]
+        source = ", ".join( args[ 2 : ] )
+        height, glyphs = read_icons( args[ 2 : ] )
+        data = gbf_bytes( height, glyphs )
+        names = [
+            ( name.replace( "\\", "/" ).split( "/" )[ -1 ]
+                .rsplit( ".", 1 )[ 0 ].replace( "-", "_" ), code )
+            for name, ( code, _, _ ) in zip( args[ 2 : ], glyphs )
+        ]
+    else:
+        source = args[ 0 ]
+        if len( args ) > 1:
+            output_name = args[ 1 ]
+        else:
+            output_name = source.rsplit( ".", 1 )[ 0 ] + ".gbf"
+        if source.endswith( ".gbf" ):
+            with open( source, "rb" ) as f:
+                data = f.read()
+        else:
+            characters = args[ 2 ] if len( args ) > 2 else None
+            height, glyphs = read_bdf( source, characters )
+            data = gbf_bytes( height, glyphs )
+
+    if output_name.endswith( ".py" ):
+        with open( output_name, "w" ) as f:
+            f.write( python_module( data, source, names ) )
+    else:
+        with open( output_name, "wb" ) as f:
+            f.write( data )
+
+    print( "%s: %d glyphs, %d pixels high, %d bytes" % (
+        output_name,
+        data[ 4 ] * 256 + data[ 5 ],
+        data[ 2 ] * 256 + data[ 3 ],
+        len( data ) ) )
+    for name, code in ( names or [] ):
+        print( "   %s = \\u%04x" % ( name, code ) )
+    return 0
+
+
+# ===========================================================================
+
+if __name__ == "__main__":
+    sys.exit( main( sys.argv[ 1 : ] ) )
+
+
+# ===========================================================================
@@ -0,0 +1,378 @@
+# ===========================================================================
+#
+# file     : hub75_check.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This is a host script (run it with a desktop python) that checks
+# the buffers that the hub75 driver builds for a chain of panels.
+#
+#    python hub75_check.py
+#
+# The MicroPython modules that gf_hub75.py imports (micropython,
+# framebuf, machine, uctypes, rp2) are replaced by fakes:
+# the memory is a dict that records the writes, an address is the
+# id() of the buffer, and viper functions run as plain python
+# (on memoryviews of the buffers).
+#
+# For a number of panel arrangements (single panel, rows, serpentine,
+# two connectors) the script checks
+# - the pixel count and row select words of each row of each plane,
+# - the list of bit plane start addresses that start_dma() builds:
+#   its alignment, and that plane k occurs 2^k times,
+# - the DMA registers that start_dma() writes,
+# - that the converter puts each display pixel at the right place
+#   in the bit planes.
+# It also checks that a second connector without its own clk, lat
+# and oe pins is refused.
+#
+# ===========================================================================
+
+import sys
+import os
+import types
+import struct
+import builtins
+import time
+import gc
+
+
+# ===========================================================================
+#
+# the fake MicroPython layer
+#
+# ===========================================================================
+
+class _fake_memory:
+    """
+    machine.mem32: a dict of the written addresses
+    """
+
+    def __init__( self ):
+        self.written = {}
+
+    def __getitem__( self, address ):
+        # the DMA abort register reads back as 0: nothing is running
+        return self.written.get( address, 0 ) \
+            if address != 0x50000444 else 0
+
+    def __setitem__( self, address, value ):
+        self.written[ address ] = value
+
+
+# ===========================================================================
+
+def _fake_viper( f ):
+    """
+    micropython.viper: the pointer arguments become memoryviews
+    """
+
+    codes = { "ptr8": "B", "ptr16": "H", "ptr32": "I" }
+    annotations = getattr( f, "__annotations__", {} )
+    names = f.__code__.co_varnames[ : f.__code__.co_argcount ]
+
+    def argument( name, value ):
+        code = codes.get( getattr( annotations.get( name ), "__name__", "" ) )
+        if code is None:
+            return value
+        view = memoryview( value ).cast( "B" )
+        if code == "B":
+            return view
+
+        # a viper int is a signed machine word
+        return view.cast( getattr( value, "typecode", code ) )
+
+    def call( *arguments ):
+        return f( *[ argument( name, value )
+            for name, value in zip( names, arguments ) ] )
+
+    call.__name__ = f.__name__
+    return call
+
+
+# ===========================================================================
+
+def _fake_pointer( name ):
+    """
+    the ptr8, ptr16 and ptr32 viper types, used as annotations
+    """
+
+    return type( name, (), {} )
+
+
+# ===========================================================================
+
+def install_fakes():
+    """
+    install the fake micropython, framebuf, machine, uctypes
+    and rp2 modules, and the viper builtins
+    """
+
+    micropython = types.ModuleType( "micropython" )
+    micropython.const = lambda x: x
+    micropython.native = lambda f: f
+    micropython.viper = _fake_viper
+    micropython.mem_info = lambda *args: None
+
+    framebuf = types.ModuleType( "framebuf" )
+    for value, name in enumerate( (
+        "MONO_VLSB", "RGB565", "GS4_HMSB", "MONO_HLSB",
+        "MONO_HMSB", "GS2_HMSB", "GS8"
+    ) ):
+        setattr( framebuf, name, value )
+
+    machine = types.ModuleType( "machine" )
+    machine.mem32 = _fake_memory()
+    machine.Pin = lambda *args, **kwargs: args
+    machine.freq = lambda *args: 125_000_000
+
+    uctypes = types.ModuleType( "uctypes" )
+    uctypes.addressof = lambda buffer: id( buffer ) & 0x0FFFFFFF
+
+    rp2 = types.ModuleType( "rp2" )
+    rp2.PIO = types.SimpleNamespace(
+        OUT_HIGH = 1, OUT_LOW = 0, SHIFT_RIGHT = 1, SHIFT_LEFT = 0 )
+    rp2.asm_pio = lambda *args, **kwargs: ( lambda f: f )
+    rp2.StateMachine = lambda *args, **kwargs: args
+
+    for module in ( micropython, framebuf, machine, uctypes, rp2 ):
+        sys.modules[ module.__name__ ] = module
+
+    builtins.micropython = micropython
+    builtins.const = micropython.const
+    builtins.uint = int
+    for name in ( "ptr8", "ptr16", "ptr32" ):
+        setattr( builtins, name, _fake_pointer( name ) )
+
+    # MicroPython ignores annotations, CPython evaluates them,
+    # and some annotations use color before it is imported
+    builtins.color = _fake_pointer( "color" )
+
+    time.ticks_us = lambda: int( time.perf_counter() * 1_000_000 )
+    time.ticks_ms = lambda: int( time.perf_counter() * 1_000 )
+    time.ticks_diff = lambda a, b: a - b
+    time.sleep_us = lambda us: None
+    time.sleep_ms = lambda ms: None
+    gc.mem_free = lambda: 0
+    gc.mem_alloc = lambda: 0
+
+
+# ===========================================================================
+#
+# the checks
+#
+# ===========================================================================
+
+def build(
+    size,
+    panel,
+    layout: str,
+    parallel: bool,
+    depth: int
+):
+    """
+    a hub75 with its chains built (and started), but not cleared
+
+    The canvas part is not initialized, it needs a real framebuf.
+    """
+
+    from godafoss.gf_hub75 import hub75, _hub75_luts
+
+    display = hub75.__new__( hub75 )
+    display.size = size
+    display._depth = depth
+    display._luts = _hub75_luts( depth, 1.0 )
+    display._framebuffer_buffer = bytearray( 2 * size.x * size.y )
+    display._build( panel, layout, parallel )
+    return display
+
+
+# ===========================================================================
+
+def check_headers( display ) -> None:
+    """
+    the pixel count and row select words of each row of each plane
+    """
+
+    for chain in display._chains:
+        for plane in range( display._depth + 1 ):
+            for y in range( display._rows ):
+                start = plane * chain.plane_bytes + y * chain.row_bytes
+                count, = struct.unpack_from( "<I", chain.buffer, start )
+                select, = struct.unpack_from(
+                    "<I", chain.buffer, start + 4 + chain.length )
+                assert count == chain.length, ( plane, y, count )
+                assert select == 0xE000 | y, ( plane, y, hex( select ) )
+
+
+# ===========================================================================
+
+def check_plane_list( display ) -> None:
+    """
+    the list of bit plane start addresses and the DMA registers
+    """
+
+    import machine
+    import uctypes
+
+    depth = display._depth
+    for sm_id, chain in enumerate( display._chains ):
+        chain.channels = ( 2 * sm_id, 2 * sm_id + 1 )
+        machine.mem32.written = {}
+        chain.start_dma( sm_id )
+
+        list_bytes = 1 << chain.list_bits
+        assert chain.list_address % list_bytes == 0
+        offset = chain.list_address - uctypes.addressof( chain._list_buffer )
+        assert 0 <= offset <= len( chain._list_buffer ) - list_bytes
+
+        base = uctypes.addressof( chain.buffer )
+        planes = []
+        for i in range( 1 << depth ):
+            address, = struct.unpack_from(
+                "<I", chain._list_buffer, offset + 4 * i )
+            assert ( address - base ) % chain.plane_bytes == 0
+            planes.append( ( address - base ) // chain.plane_bytes )
+        assert planes[ 0 ] == depth, planes
+        for plane in range( depth ):
+            assert planes.count( plane ) == 1 << plane, planes
+        # the DMA reads 4 bytes per entry, so the ring covers the list
+        assert list_bytes == 4 * len( planes )
+
+        control, data = chain.channels
+        registers = machine.mem32.written
+        assert registers[ 0x50000000 + data * 0x40 ] == base
+        assert registers[ 0x50000000 + data * 0x40 + 0x08 ] \
+            == chain.plane_bytes // 4
+        assert registers[ 0x50000000 + control * 0x40 ] \
+            == chain.list_address
+
+
+# ===========================================================================
+
+def check_conversion(
+    display,
+    panels
+) -> None:
+    """
+    each display pixel ends up at the right place in the bit planes
+
+    The panels are ( grid column, grid row, upside down ) for each
+    panel, in chain order (for all chains together).
+    The pixels in the upper half of each panel row are red, those in
+    the lower half are blue, and a pattern of pixels is black, so a
+    pixel that ends up in the wrong place (or half) is found.
+    """
+
+    size = display.size
+    panel = display._panel
+    rows = display._rows
+    depth = display._depth
+
+    def expected( x, y ):
+        if ( 7 * x + 3 * y ) % 5 == 0:
+            return 0x0000
+        return 0xF800 if ( y % panel.y ) < rows else 0x001F
+
+    for y in range( size.y ):
+        for x in range( size.x ):
+            struct.pack_into(
+                "<H", display._framebuffer_buffer,
+                2 * ( y * size.x + x ), expected( x, y ) )
+
+    for chain in display._chains:
+        chain.convert( 0, rows )
+
+    per_chain = len( panels ) // len( display._chains )
+    for n, ( column, row, upside_down ) in enumerate( panels ):
+        chain = display._chains[ n // per_chain ]
+        for py in range( panel.y ):
+            for px in range( panel.x ):
+                x = column * panel.x + px
+                y = row * panel.y + py
+                if upside_down:
+                    px = panel.x - 1 - px
+                    py = panel.y - 1 - py
+
+                # r1 g1 b1 in bits 0..2, r2 g2 b2 in bits 3..5
+                shift = 3 if py >= rows else 0
+                value = expected( x, y )
+                wanted = ( 1 if value == 0xF800 else 0 ) \
+                    | ( 4 if value == 0x001F else 0 )
+                p = ( py % rows ) * chain.row_bytes + 4 \
+                    + ( n % per_chain ) * panel.x + px
+                for plane in range( depth ):
+                    byte = chain.buffer[ plane * chain.plane_bytes + p ]
+                    assert ( byte >> shift ) & 7 == wanted, \
+                        ( x, y, plane, byte )
+
+        # the all-dark plane stays dark
+        start = depth * chain.plane_bytes
+        for y in range( rows ):
+            p = start + y * chain.row_bytes + 4
+            assert not any( chain.buffer[ p : p + chain.length ] )
+
+
+# ===========================================================================
+
+def main() -> int:
+    install_fakes()
+    sys.path.insert( 0, os.path.join(
+        os.path.dirname( os.path.abspath( __file__ ) ), ".." ) )
+
+    # importing godafoss prints the table of the loaded modules
+    import io, contextlib
+    with contextlib.redirect_stdout( io.StringIO() ):
+        import godafoss
+    from godafoss.gf_xy import xy
+
+    cases = (
+        # size, panel, layout, parallel, depth
+        ( xy( 64, 32 ), xy( 64, 32 ), "rows", False, 4 ),
+        ( xy( 128, 64 ), xy( 64, 32 ), "rows", False, 3 ),
+        ( xy( 64, 96 ), xy( 32, 32 ), "serpentine", False, 5 ),
+        ( xy( 128, 64 ), xy( 64, 32 ), "rows", True, 6 ),
+        ( xy( 64, 64 ), xy( 32, 16 ), "serpentine", True, 1 ),
+    )
+
+    for size, panel, layout, parallel, depth in cases:
+        display = build( size, panel, layout, parallel, depth )
+        columns = size.x // panel.x
+        panels = []
+        for i in range( columns * ( size.y // panel.y ) ):
+            row = i // columns
+            if ( layout == "serpentine" ) and ( row % 2 ):
+                panels.append( ( columns - 1 - i % columns, row, True ) )
+            else:
+                panels.append( ( i % columns, row, False ) )
+
+        check_headers( display )
+        check_plane_list( display )
+        check_conversion( display, panels )
+        print( "%3d x %2d, panels %2d x %2d, %-10s, %d connector(s), "
+            "depth %d: ok" % (
+            size.x, size.y, panel.x, panel.y, layout,
+            len( display._chains ), depth ) )
+
+    from godafoss.gf_hub75 import hub75
+    try:
+        hub75( xy( 64, 32 ), 0, 6, 11, r1_b2_2 = 16 )
+    except ValueError as error:
+        print( "second connector without clk_lat_oe_2: %s" % error )
+    else:
+        raise AssertionError( "second connector without clk_lat_oe_2" )
+
+    return 0
+
+
+# ===========================================================================
+
+if __name__ == "__main__":
+    sys.exit( main() )
+
+
+# ===========================================================================
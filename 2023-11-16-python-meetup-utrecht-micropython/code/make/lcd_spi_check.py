@@ -0,0 +1,325 @@
+# ===========================================================================
+#
+# file     : lcd_spi_check.py
+# part of  : godafoss micropython library
+# url      : https://www.github.com/wovo/godafoss
+# author   : Wouter van Ooijen (wouter@voti.nl) 2023
+# license  : MIT license, see license variable in the __init__.py
+#
+# This file is part of the Godafoss perhiperal interface library.
+#
+# This is a host script (run it with a desktop python) that checks
+# the spi transactions that the lcd driver uses for a flush.
+#
+#    python lcd_spi_check.py
+#
+# The MicroPython modules that gf_lcd.py imports (micropython,
+# framebuf, machine) are replaced by fakes.
+# The fake SPI and the fake pins append what happens to one trace:
+# ( "cs", level ), ( "dc", level ) and ( "spi", bytes ).
+#
+# The script checks the exact trace of
+# - a full flush (_flush_implementation),
+# - a flush_window() of a part of the lcd,
+# - a flush_window() of full rows (one buffer write),
+# - a flush() after a bounded shape write (which uses flush_window),
+# for an st7789 with an offset: chip select stays low from the
+# CASET command to the last pixel byte, the window (plus offset)
+# is sent as two big-endian words, and the pixel data is the
+# part of the frame buffer that is in the window.
+#
+# ===========================================================================
+
+import sys
+import os
+import types
+import struct
+import builtins
+import time
+import gc
+
+
+# ===========================================================================
+#
+# the fake MicroPython layer
+#
+# ===========================================================================
+
+# the pins of the lcd, and the trace of the pins and the spi
+_pin_names = { 1: "dc", 2: "cs" }
+trace = []
+
+
+# ===========================================================================
+
+class _fake_pin:
+    """
+    machine.Pin: the writes to the dc and cs pins are traced
+    """
+
+    OUT = 1
+    IN = 0
+    OPEN_DRAIN = 2
+    PULL_UP = 1
+
+    def __init__( self, number, *args, **kwargs ):
+        self._name = _pin_names.get( number )
+        self._level = 0
+
+    def init( self, *args, **kwargs ):
+        pass
+
+    def value( self, level = None ):
+        if level is None:
+            return self._level
+        self._level = level
+        if self._name is not None:
+            trace.append( ( self._name, int( level ) ) )
+
+
+# ===========================================================================
+
+class _fake_spi:
+    """
+    machine.SPI: the written bytes are traced
+
+    The data is copied, because the lcd re-uses its buffers.
+    """
+
+    def __init__( self, *args, **kwargs ):
+        pass
+
+    def write( self, data ):
+        trace.append( ( "spi", bytes( data ) ) )
+
+
+# ===========================================================================
+
+class _fake_frame_buffer:
+    """
+    framebuf.FrameBuffer, only the RGB565 format
+    """
+
+    def __init__( self, buffer, width, height, format ):
+        self._buffer = buffer
+        self._width = width
+        self._height = height
+
+    def pixel( self, x, y, value = None ):
+        offset = 2 * ( y * self._width + x )
+        if value is None:
+            return struct.unpack_from( "<H", self._buffer, offset )[ 0 ]
+        struct.pack_into( "<H", self._buffer, offset, value )
+
+    def fill_rect( self, x, y, width, height, value ):
+        for py in range( max( 0, y ), min( self._height, y + height ) ):
+            for px in range( max( 0, x ), min( self._width, x + width ) ):
+                self.pixel( px, py, value )
+
+    def fill( self, value ):
+        self.fill_rect( 0, 0, self._width, self._height, value )
+
+    def hline( self, x, y, width, value ):
+        self.fill_rect( x, y, width, 1, value )
+
+    def vline( self, x, y, height, value ):
+        self.fill_rect( x, y, 1, height, value )
+
+
+# ===========================================================================
+
+def _fake_type( name ):
+    """
+    a type that is used only in annotations
+    """
+
+    return type( name, (), {} )
+
+
+# ===========================================================================
+
+def install_fakes():
+    """
+    install the fake micropython, framebuf and machine modules,
+    and the viper builtins
+    """
+
+    micropython = types.ModuleType( "micropython" )
+    micropython.const = lambda x: x
+    micropython.native = lambda f: f
+    micropython.viper = lambda f: f
+    micropython.mem_info = lambda *args: None
+
+    framebuf = types.ModuleType( "framebuf" )
+    for value, name in enumerate( (
+        "MONO_VLSB", "RGB565", "GS4_HMSB", "MONO_HLSB",
+        "MONO_HMSB", "GS2_HMSB", "GS8"
+    ) ):
+        setattr( framebuf, name, value )
+    framebuf.FrameBuffer = _fake_frame_buffer
+
+    machine = types.ModuleType( "machine" )
+    machine.Pin = _fake_pin
+    machine.SPI = _fake_spi
+    machine.freq = lambda *args: 125_000_000
+
+    for module in ( micropython, framebuf, machine ):
+        sys.modules[ module.__name__ ] = module
+
+    builtins.micropython = micropython
+    builtins.const = micropython.const
+    builtins.uint = int
+    for name in ( "ptr8", "ptr16", "ptr32" ):
+        setattr( builtins, name, _fake_type( name ) )
+
+    # MicroPython ignores annotations, CPython evaluates them,
+    # and some annotations use color before it is imported
+    builtins.color = _fake_type( "color" )
+
+    time.ticks_us = lambda: int( time.perf_counter() * 1_000_000 )
+    time.ticks_ms = lambda: int( time.perf_counter() * 1_000 )
+    time.ticks_diff = lambda a, b: a - b
+    time.sleep_us = lambda us: None
+    time.sleep_ms = lambda ms: None
+    gc.mem_free = lambda: 0
+    gc.mem_alloc = lambda: 0
+
+
+# ===========================================================================
+#
+# the checks
+#
+# ===========================================================================
+
+def words( first, second ) -> tuple:
+    """
+    the trace of a CASET or RASET parameter: two big-endian words
+    """
+
+    return ( "spi", struct.pack( ">HH", first, second ) )
+
+
+# ===========================================================================
+
+def window(
+    display,
+    x0: int,
+    y0: int,
+    x1: int,
+    y1: int
+) -> list:
+    """
+    the trace of the start of a RAM write to a window
+    """
+
+    cmd = display._driver.cmd
+    offset = display._offset
+    return [
+        ( "cs", 0 ),
+        ( "dc", 0 ), ( "spi", bytes( [ cmd.CASET ] ) ),
+        ( "dc", 1 ), words( x0 + offset.x, x1 + offset.x ),
+        ( "dc", 0 ), ( "spi", bytes( [ cmd.RASET ] ) ),
+        ( "dc", 1 ), words( y0 + offset.y, y1 + offset.y ),
+        ( "dc", 0 ), ( "spi", bytes( [ cmd.RAMWR ] ) ),
+    ]
+
+
+# ===========================================================================
+
+def check(
+    name: str,
+    expected: list
+) -> None:
+    """
+    compare the trace to the expected trace, and clear it
+    """
+
+    if trace != expected:
+        for n, ( a, b ) in enumerate( zip( trace, expected ) ):
+            if a != b:
+                print( "%s: entry %d is %s, expected %s" % (
+                    name, n, a, b ) )
+                break
+        else:
+            print( "%s: %d entries, expected %d" % (
+                name, len( trace ), len( expected ) ) )
+        raise AssertionError( name )
+    print( "%-24s: %3d entries ok" % ( name, len( trace ) ) )
+    trace.clear()
+
+
+# ===========================================================================
+
+def main() -> int:
+    install_fakes()
+    sys.path.insert( 0, os.path.join(
+        os.path.dirname( os.path.abspath( __file__ ) ), ".." ) )
+
+    # importing godafoss prints the table of the loaded modules
+    import io, contextlib
+    with contextlib.redirect_stdout( io.StringIO() ):
+        import godafoss
+    from godafoss.gf_xy import xy
+    from godafoss.gf_lcd import lcd
+    from godafoss.gf_rectangle import rectangle
+    import machine
+
+    size = xy( 12, 7 )
+    display = lcd(
+        "st7789",
+        size,
+        machine.SPI( 0 ),
+        data_command = 1,
+        chip_select = 2,
+        offset = xy( 35, 52 )
+    )
+
+    # each pixel gets a different value, so a wrong part
+    # of the buffer is noticed
+    data = display._buffer
+    for i in range( len( data ) ):
+        data[ i ] = ( 7 * i + 3 ) & 0xFF
+    stride = 2 * size.x
+    trace.clear()
+
+    display._flush_implementation( True )
+    check( "full flush",
+        window( display, 0, 0, size.x - 1, size.y - 1 )
+        + [ ( "dc", 1 ), ( "spi", bytes( data ) ), ( "cs", 1 ) ] )
+
+    display.flush_window( xy( 3, 2 ), xy( 4, 3 ) )
+    check( "partial window",
+        window( display, 3, 2, 6, 4 ) + [ ( "dc", 1 ) ]
+        + [ ( "spi", bytes( data[ y * stride + 6 : y * stride + 14 ] ) )
+            for y in range( 2, 5 ) ]
+        + [ ( "cs", 1 ) ] )
+
+    display.flush_window( xy( -5, 5 ), xy( 40, 10 ) )
+    check( "clipped full rows",
+        window( display, 0, 5, size.x - 1, size.y - 1 )
+        + [ ( "dc", 1 ), ( "spi", bytes( data[ 5 * stride : ] ) ),
+            ( "cs", 1 ) ] )
+
+    display.flush_window( xy( size.x, 0 ), xy( 3, 3 ) )
+    check( "window outside the lcd", [] )
+
+    display.flush()
+    display.write( rectangle( xy( 2, 3 ) ), xy( 8, 1 ) )
+    trace.clear()
+    display.flush()
+    check( "flush after a shape",
+        window( display, 8, 1, 9, 3 ) + [ ( "dc", 1 ) ]
+        + [ ( "spi", bytes( data[ y * stride + 16 : y * stride + 20 ] ) )
+            for y in range( 1, 4 ) ]
+        + [ ( "cs", 1 ) ] )
+
+    return 0
+
+
+# ===========================================================================
+
+if __name__ == "__main__":
+    sys.exit( main() )
+
+
+# ===========================================================================